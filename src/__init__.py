@@ -8,6 +8,11 @@
 from dynaconf import Validator
 from omnitils.files import get_project_version
 
+# Fake the Windows modules the Photoshop API imports when rendering without Photoshop
+from src.utils.fake_windows import install_windows_shims, is_fake_backend_enabled
+if is_fake_backend_enabled():
+    install_windows_shims()
+
 # Local Imports
 from .console import TerminalConsole
 from ._config import AppConfig
@@ -28,11 +33,16 @@
         Validator('API_AMAZON', cast=str, default=''),
         Validator('PS_ERROR_DIALOG', cast=bool, default=False),
         Validator('PS_VERSION', cast=AppEnvironment.string_or_none, default=None),
+        Validator('PS_FAKE_BACKEND', cast=bool, default=False),
         Validator('HEADLESS', cast=bool, default=False),
         Validator('DEV_MODE', cast=bool, default=bool(not hasattr(sys, '_MEIPASS'))),
         Validator('TEST_MODE', cast=bool, default=False),
         Validator('VERSION', cast=str, default=get_project_version(PATH.PROJECT_FILE)),
-        Validator('FORCE_RELOAD', cast=bool, default=False)
+        Validator('FORCE_RELOAD', cast=bool, default=False),
+        Validator('TRACE_LAYOUT', cast=bool, default=False),
+        Validator('TRACE_RENDER', cast=bool, default=False),
+        Validator('PROFILE_COM', cast=bool, default=False),
+        Validator('OFFLINE', cast=bool, default=False)
     ],
     apply_default_on_none=True
 )
@@ -2,7 +2,14 @@
 * Global Settings Module
 """
 # Standard Library Imports
-from typing import Optional
+import json
+from configparser import ConfigParser
+from dataclasses import dataclass
+from hashlib import sha1
+from pathlib import Path
+from threading import Lock
+from types import MappingProxyType
+from typing import Iterable, Mapping, Optional
 
 # Third Party Imports
 from omnitils.metaclass import Singleton
@@ -21,15 +28,74 @@
 )
 from src._loader import ConfigManager
 
+# Settings which control the render process but never change the rendered image
+CONFIG_HASH_IGNORED = {
+    ('APP.RENDER', 'skip.failed'),
+    ('APP.RENDER', 'skip.unchanged'),
+    ('APP.RENDER', 'fail.fast'),
+    ('APP.RENDER', 'document.pool.size'),
+    ('APP.RENDER', 'document.pool.memory')
+}
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """Precomputed settings for one configuration, swapped into the app config by reference.
+
+    Notes:
+        The ConfigParser object is shared by every load of this snapshot, and must be treated as read-only.
+    """
+    file: ConfigParser
+    values: Mapping[str, object]
+    stamp: tuple[Optional[int], ...]
+    hash: str
+
+
+def get_config_stamp(files: Iterable[Path]) -> tuple[Optional[int], ...]:
+    """Returns the modification time of each config file, used to tell when a snapshot is out of date.
+
+    Args:
+        files: Config files to check.
+
+    Returns:
+        Modification time in nanoseconds of each file, None for files which don't exist.
+    """
+    stamp = []
+    for f in files:
+        try:
+            stamp.append(f.stat().st_mtime_ns)
+        except OSError:
+            stamp.append(None)
+    return tuple(stamp)
+
+
+def get_config_hash(file: ConfigParser) -> str:
+    """Returns a digest of every loaded setting which affects rendered output, which changes whenever
+    any of those setting values change.
+
+    Args:
+        file: ConfigParser object containing the loaded settings.
+
+    Returns:
+        Hexadecimal digest string.
+    """
+    data = {
+        s: {k: v for k, v in file.items(s) if (s, k.lower()) not in CONFIG_HASH_IGNORED}
+        for s in sorted(file.sections())}
+    return sha1(json.dumps(data, sort_keys=True).encode()).hexdigest()
+
 
 class AppConfig:
     """Stores the current state of app and template settings. Can be changed within a template
     class to affect rendering behavior."""
     __metaclass__ = Singleton
+    _snapshots: dict[tuple[str, ...], ConfigSnapshot] = {}
+    _snapshot_lock = Lock()
 
     def __init__(self, env: AppEnvironment):
         """Load initial settings values."""
         self.ENV = env
+        self.snapshot: Optional[ConfigSnapshot] = None
         self.load()
 
     def update_definitions(self):
@@ -41,6 +107,9 @@ def update_definitions(self):
         self.output_file_name = self.file.get(
             section='APP.FILES', option='Output.File.Name',
             fallback='#name (#frame<, #suffix>) [#set] {#num}')
+        self.fast_export = self.file.getboolean('APP.FILES', 'Fast.Export', fallback=False)
+        self.export_quality = self.file.getint('APP.FILES', 'Export.Quality', fallback=95)
+        self.export_dpi = self.file.getint('APP.FILES', 'Export.DPI', fallback=0)
 
         # APP - DATA
         self.lang = self.file.get('APP.DATA', 'Scryfall.Language', fallback='en')
@@ -54,11 +123,16 @@ def update_definitions(self):
 
         # APP - RENDER
         self.skip_failed = self.file.getboolean('APP.RENDER', 'Skip.Failed', fallback=False)
+        self.skip_unchanged = self.file.getboolean('APP.RENDER', 'Skip.Unchanged', fallback=False)
+        self.fail_fast = self.file.getboolean('APP.RENDER', 'Fail.Fast', fallback=False)
         self.generative_fill = False if self.ENV.TEST_MODE else self.file.getboolean(
             'APP.RENDER', 'Generative.Fill', fallback=False)
         self.select_variation = self.file.getboolean('APP.RENDER', 'Select.Variation', fallback=False)
         self.feathered_fill = self.file.getboolean('APP.RENDER', 'Feathered.Fill', fallback=False)
+        self.edge_fill = self.file.getboolean('APP.RENDER', 'Edge.Fill', fallback=False)
         self.vertical_fullart = self.file.getboolean('APP.RENDER', 'Vertical.Fullart', fallback=False)
+        self.document_pool_size = self.file.getint('APP.RENDER', 'Document.Pool.Size', fallback=3)
+        self.document_pool_memory = self.file.getint('APP.RENDER', 'Document.Pool.Memory', fallback=2048)
 
         # BASE - TEXT
         self.flavor_divider = self.file.getboolean('BASE.TEXT', 'Flavor.Divider', fallback=True)
@@ -107,6 +181,15 @@ def get_option(self, section: str, key: str, enum_class: type[StrConstant], defa
                 return option
         return default
 
+    def get_hash(self) -> str:
+        """Returns a digest of every loaded setting which affects rendered output, which changes whenever
+        any of those setting values change.
+
+        Returns:
+            Hexadecimal digest string.
+        """
+        return self.snapshot.hash if self.snapshot else get_config_hash(self.file)
+
     def get_setting(self, section: str, key: str, default: Optional[str] = None, is_bool: bool = True):
         """Check if the setting exists and return it. Default will be returned if missing.
 
@@ -133,14 +216,55 @@ def get_setting(self, section: str, key: str, default: Optional[str] = None, is_
     def load(self, config: Optional[ConfigManager] = None) -> None:
         """Reload the config file and define new values
 
+        Notes:
+            Settings are swapped in from a snapshot of the configuration, which is only rebuilt when
+                one of its files has changed since the snapshot was taken.
+
         Args:
             config: ConfigManager to load from if provided, otherwise use app-wide configuration.
         """
-        # Invalidate file cache
-        if hasattr(self, 'file'):
-            del self.file
-
-        # Load provided or load fresh
-        config = config or ConfigManager()
-        self.file = config.get_config()
-        self.update_definitions()
+        snapshot = self.get_snapshot(config or ConfigManager())
+        self.__dict__.update(snapshot.values)
+        self.file, self.snapshot = snapshot.file, snapshot
+
+    def get_snapshot(self, config: ConfigManager) -> ConfigSnapshot:
+        """Returns a snapshot of a configuration's settings, building it if the configuration hasn't been
+        loaded before or its files have changed. Safe to call from any thread.
+
+        Args:
+            config: ConfigManager to take the snapshot from.
+
+        Returns:
+            Snapshot of the configuration.
+        """
+        files = config.source_files
+        key = tuple(str(f) for f in files)
+        with self._snapshot_lock:
+            snapshot = self._snapshots.get(key)
+            if snapshot and snapshot.stamp == get_config_stamp(files):
+                return snapshot
+
+            # Validate and parse the configuration, which may update its files
+            file = config.get_config()
+            stamp = get_config_stamp(files)
+
+            # Define settings values on a scratch object, leaving the current values untouched
+            scratch = object.__new__(type(self))
+            scratch.ENV, scratch.file = self.ENV, file
+            scratch.update_definitions()
+            values = {k: v for k, v in vars(scratch).items() if k not in ('ENV', 'file')}
+            self._snapshots[key] = snapshot = ConfigSnapshot(
+                file=file,
+                values=MappingProxyType(values),
+                stamp=stamp,
+                hash=get_config_hash(file))
+            return snapshot
+
+    def prepare(self, configs: Iterable[ConfigManager]) -> None:
+        """Build snapshots ahead of time for configurations which are about to be loaded.
+
+        Args:
+            configs: ConfigManager objects to take snapshots from.
+        """
+        for config in configs:
+            self.get_snapshot(config)
@@ -399,6 +399,15 @@ def has_template_ini(self) -> bool:
         """Returns True if a template has a separate INI file."""
         return bool(self.template_path_ini and self.template_path_ini.is_file())
 
+    @property
+    def source_files(self) -> list[Path]:
+        """list[Path]: Every schema and INI file this configuration is loaded from."""
+        return [p for p in (
+            self.app_path_schema, self.app_path_ini,
+            self.base_path_schema, self.base_path_ini,
+            self.template_path_schema, self.template_path_ini
+        ) if p]
+
     """
     * Utility Methods
     """
@@ -27,6 +27,7 @@
     CardFonts)
 from src.schema.colors import ColorObject, SymbolColorMap
 from src.utils.mtg import get_symbol_colors
+from src.utils.setdb import SetDatabase
 
 
 """
@@ -98,7 +99,9 @@ class PATH(DefinedPaths):
     SRC_DATA_WATERMARKS = SRC_DATA / 'watermarks.yml'
     SRC_DATA_MANIFEST = SRC_DATA / 'manifest.yml'
     SRC_DATA_HEXPROOF_SET = (SRC_DATA_HEXPROOF / 'set').with_suffix('.json')
+    SRC_DATA_HEXPROOF_SET_DB = (SRC_DATA_HEXPROOF / 'set').with_suffix('.db')
     SRC_DATA_HEXPROOF_META = (SRC_DATA_HEXPROOF / 'meta').with_suffix('.json')
+    SRC_DATA_HEXPROOF_ETAGS = (SRC_DATA_HEXPROOF / 'etags').with_suffix('.json')
 
     # Image Level Directories
     SRC_IMG_SYMBOLS = SRC_IMG / 'symbols'
@@ -106,6 +109,7 @@ class PATH(DefinedPaths):
 
     # Image Level Files
     SRC_IMG_SYMBOLS_PACKAGE = (SRC_IMG_SYMBOLS / 'package').with_suffix('.zip')
+    SRC_IMG_SYMBOLS_MANIFEST = (SRC_IMG_SYMBOLS / 'manifest').with_suffix('.json')
     SRC_IMG_OVERLAY = (SRC_IMG / 'overlay').with_suffix('.jpg')
     SRC_IMG_NOTFOUND = (SRC_IMG / 'notfound').with_suffix('.jpg')
 
@@ -117,13 +121,27 @@ class PATH(DefinedPaths):
 
     # Logs Level Files
     LOGS_SCAN = (LOGS / 'scan').with_suffix('.jpg')
+    LOGS_SCANS = LOGS / 'scans'
+    LOGS_ART = LOGS / 'art'
+    LOGS_EXPORT = LOGS / 'export'
     LOGS_ERROR = (LOGS / 'error').with_suffix('.txt')
     LOGS_FAILED = (LOGS / 'failed').with_suffix('.txt')
     LOGS_COOKIES = (LOGS / 'cookies').with_suffix('.json')
+    LOGS_BATCH = (LOGS / 'batch').with_suffix('.json')
+    LOGS_JOURNAL = (LOGS / 'journal').with_suffix('.db')
+    LOGS_TRACE = (LOGS / 'trace').with_suffix('.jsonl')
+    LOGS_TRACE_REPORT = (LOGS / 'trace_report').with_suffix('.json')
+    LOGS_COM_PROFILE = (LOGS / 'com_profile').with_suffix('.json')
+
+    # Output Level Files
+    OUT_INDEX = (OUT / '.render_index').with_suffix('.db')
 
     # Generated user data files
     SRC_DATA_USER = SRC_DATA / 'user.yml'
     SRC_DATA_VERSIONS = SRC_DATA / 'versions.yml'
+    SRC_DATA_LAYOUT_PROFILE = SRC_DATA / 'layout_profile.json'
+    SRC_DATA_RENDER_TIMES = SRC_DATA / 'render_times.json'
+    SRC_DATA_TYPE_IDS = SRC_DATA / 'type_ids.json'
 
 
 """
@@ -182,6 +200,12 @@ def PS_VERSION(self) -> Optional[str]:
             return super().PS_VERSION
         return None
 
+    @cached_property
+    def PS_FAKE_BACKEND(self) -> bool:
+        """bool: Whether to render against an in-process fake Photoshop built from the PSD files, for
+        benchmarking without Photoshop."""
+        return super().PS_FAKE_BACKEND
+
     """
     * Testing
     """
@@ -210,6 +234,26 @@ def FORCE_RELOAD(self) -> bool:
         """bool: Whether to force plugin template modules to be reloaded on each new render sequence."""
         return super().FORCE_RELOAD
 
+    @cached_property
+    def TRACE_LAYOUT(self) -> bool:
+        """bool: Whether to record which layout properties each template reads, used to plan prefetching."""
+        return super().TRACE_LAYOUT
+
+    @cached_property
+    def TRACE_RENDER(self) -> bool:
+        """bool: Whether to record how long each render stage and step takes, written to the logs folder."""
+        return super().TRACE_RENDER
+
+    @cached_property
+    def PROFILE_COM(self) -> bool:
+        """bool: Whether to count and time every Photoshop COM call, written to the logs folder."""
+        return super().PROFILE_COM
+
+    @cached_property
+    def OFFLINE(self) -> bool:
+        """bool: Whether to skip all network data refreshes at launch, using only locally cached data."""
+        return super().OFFLINE
+
     @cached_property
     def VERSION(self) -> str:
         """str: Current app version."""
@@ -396,8 +440,8 @@ def update_version_tracker(self):
     """
 
     @tracked_prop
-    def set_data(self) -> dict[str, dict]:
-        """dict[str, dict]: Returns set data pulled from Hexproof.io mapped to set codes."""
+    def set_data(self) -> SetDatabase:
+        """SetDatabase: Returns set data pulled from Hexproof.io, queried by set code."""
         return self.get_set_data()
 
     @tracked_prop
@@ -442,13 +486,15 @@ def get_user_data(self):
     """
 
     @return_on_exception({})
-    def get_set_data(self) -> dict[str, dict]:
-        """dict: Loaded data from the 'set' data file."""
-        if not PATH.SRC_DATA_HEXPROOF_SET.is_file():
-            dump_data_file({}, PATH.SRC_DATA_HEXPROOF_SET)
+    def get_set_data(self) -> SetDatabase:
+        """SetDatabase: Queryable store of the 'set' data, nothing is parsed until a set code is requested."""
+        db = SetDatabase(PATH.SRC_DATA_HEXPROOF_SET_DB)
 
-        # Import watermark library
-        return load_data_file(PATH.SRC_DATA_HEXPROOF_SET)
+        # Migrate a previously downloaded 'set' data file
+        if not db.path.is_file() and PATH.SRC_DATA_HEXPROOF_SET.is_file():
+            with suppress(Exception):
+                db.build(load_data_file(PATH.SRC_DATA_HEXPROOF_SET))
+        return db
 
     @return_on_exception({})
     def get_meta_data(self) -> dict[str, Hexproof.Meta]:
@@ -459,4 +505,4 @@ def get_meta_data(self) -> dict[str, Hexproof.Meta]:
         # Import watermark library
         return {
             k: Hexproof.Meta(**v) for k, v in
-            load_data_file(PATH.SRC_DATA_HEXPROOF_META)}
+            load_data_file(PATH.SRC_DATA_HEXPROOF_META).items()}
@@ -2,17 +2,267 @@
 * CLI Commands: Rendering
 """
 # Standard Library Imports
+import os
+from datetime import datetime as dt
 from pathlib import Path
+from time import perf_counter
+from typing import Optional
 
 # Third Party Imports
 import click
-from omnitils.files import load_data_file
+from tqdm import tqdm
+from colorama import Fore, Style
+from omnitils.files import load_data_file, dump_data_file
 
 # Local Imports
-from src import CON, TEMPLATE_DEFAULTS
-from src._loader import TemplateDetails
+from src import APP, CFG, CON, CONSOLE, PATH, TEMPLATE_DEFAULTS, TEMPLATE_MAP
+from src._loader import TemplateDetails, TemplateSelectedMap, get_template_map_selected
 from src.cards import CardDetails
-from src.layouts import layout_map
+from src.layouts import CardLayout, layout_map
+from src.pipeline import OutputRecorder, RenderQueue, get_layout_files, get_render_fingerprint
+from src.utils.com_profile import COM_PROFILER
+from src.utils.documents import DOCUMENT_POOL
+from src.utils.export import OUTPUT_ENCODER
+from src.utils.journal import RenderJournal
+from src.utils.layer_cache import LAYER_CACHE
+from src.utils.render_index import RenderIndex
+from src.utils.render_times import RenderTimes, format_eta
+from src.utils.tracing import TRACER
+
+"""
+* Batch Render Utils
+"""
+
+
+def get_art_files(folder: Path) -> list[Path]:
+    """Grab all supported image files within a given directory, skipping files prepended with '!'.
+
+    Args:
+        folder: Directory containing art images.
+
+    Returns:
+        Sorted list of art file paths.
+    """
+    ext = ('.png', '.jpg', '.tif', '.jpeg', '.jpf', *(['.webp'] if APP.supports_webp else []))
+    return sorted([
+        Path(folder, f) for f in os.listdir(folder)
+        if f.lower().endswith(ext) and not f.startswith('!')])
+
+
+def get_template_selections(selections: tuple[str, ...]) -> TemplateSelectedMap:
+    """Resolve template selections given on the command line.
+
+    Args:
+        selections: Template names, optionally prefixed with a card type, e.g. 'Classic' or 'normal=Classic'.
+            A name without a card type is selected for every card type it supports.
+
+    Returns:
+        A mapping of selected templates to card types.
+
+    Raises:
+        click.BadParameter: If a selected template doesn't exist.
+    """
+    selected: TemplateSelectedMap = {}
+    for sel in selections:
+        card_type, _, name = sel.rpartition('=')
+        found = False
+        for category in TEMPLATE_MAP.values():
+            for t, names in category['map'].items():
+                if name in names and (not card_type or t == card_type):
+                    selected[t] = names[name]
+                    found = True
+        if not found:
+            raise click.BadParameter(f"No template named '{name}' found for card type '{card_type or 'any'}'!")
+    return selected
+
+
+def render_batch(
+    files: list[Path],
+    temps: TemplateSelectedMap,
+    journal: Optional[RenderJournal] = None,
+    incremental: bool = False,
+    fail_fast: bool = False
+) -> dict:
+    """Resolve and render a batch of art files without prompting the user.
+
+    Args:
+        files: Art files to render.
+        temps: Template selected for each card type.
+        journal: Journal to record each render job in, if provided.
+        incremental: Whether to skip cards whose output was already rendered from the same inputs,
+            also enabled by the 'Skip Unchanged Cards' setting.
+        fail_fast: Whether to render one card of each template first, skipping the rest of a template's
+            cards if its first card fails.
+
+    Returns:
+        Summary of the batch containing per-card timings and failures.
+    """
+    started, timer = dt.now(), perf_counter()
+    results: list[dict] = []
+
+    # Build settings for each template up front, so switching templates is just a swap
+    CFG.prepare(t['config'] for t in temps.values())
+
+    # Resolve cards on worker threads while earlier cards render
+    history = RenderTimes(PATH.SRC_DATA_RENDER_TIMES)
+    queue = RenderQueue(files, temps, fail_fast=fail_fast, times=history)
+    index = RenderIndex(PATH.OUT_INDEX)
+    recorder = OutputRecorder(index, journal)
+    DOCUMENT_POOL.reset_stats()
+    COM_PROFILER.reset()
+    loaded: dict[str, Optional[type]] = {}
+    current: Optional[tuple[str, str]] = None
+    config_hash: Optional[str] = None
+    pbar = tqdm(
+        total=len(files),
+        bar_format=f'{Fore.BLUE}'
+                   '{l_bar}{bar}{r_bar}'
+                   f'{Style.RESET_ALL}')
+    try:
+        for item in queue:
+
+            # Card couldn't be resolved
+            if isinstance(item, str):
+                results.append({
+                    'file': ', '.join(str(f) for f in queue.files),
+                    'status': 'failed', 'stage': 'layout', 'reason': item})
+                if journal:
+                    journal.start(files=queue.files)
+                    journal.finish(files=queue.files, success=False, error=item)
+                pbar.update(1)
+                continue
+            card, template = item
+
+            # Switching to a different template, failures never prompt
+            if card.card_class not in loaded or queue.current != current:
+                current = queue.current
+                if card.card_class not in loaded:
+                    loaded[card.card_class] = template['object'].get_template_class(template['class_name'])
+                if loaded[card.card_class]:
+                    queue.settle()
+                    CFG.load(template['config'])
+                    CON.reload()
+                    CFG.skip_failed = True
+                    config_hash = CFG.get_hash()
+
+            # Skip cards whose output was already rendered from the same inputs
+            fingerprint = get_render_fingerprint(card, template, config_hash, index) if (
+                loaded[card.card_class]) else None
+            if fingerprint and (incremental or CFG.skip_unchanged) and (output := index.get_output(fingerprint)):
+                results.append({
+                    'file': ', '.join(str(f) for f in get_layout_files(card)),
+                    'name': card.display_name,
+                    'template': template['name'],
+                    'class': template['class_name'],
+                    'status': 'skipped',
+                    'output': str(output)})
+                if journal:
+                    journal.start(
+                        files=get_layout_files(card),
+                        scryfall_id=card.scryfall.get('id'),
+                        template=template['name'],
+                        template_class=template['class_name'],
+                        config_hash=config_hash)
+                    journal.finish(files=get_layout_files(card), success=True, output=output)
+                queue.report(success=True)
+                pbar.update(len(get_layout_files(card)))
+                continue
+
+            # Render the card
+            if loaded[card.card_class]:
+                queue.prefetch(card, loaded[card.card_class])
+                queue.wait(card)
+            if journal:
+                journal.start(
+                    files=get_layout_files(card),
+                    scryfall_id=card.scryfall.get('id'),
+                    template=template['name'],
+                    template_class=template['class_name'],
+                    config_hash=config_hash)
+            results.append(result := render_batch_card(card, template, loaded[card.card_class]))
+            if result['status'] == 'success':
+                recorder.add(Path(result['output']), get_layout_files(card), fingerprint, result['time'])
+            elif journal:
+                journal.finish(
+                    files=get_layout_files(card),
+                    success=False,
+                    time=result.get('time'),
+                    error=result.get('reason'))
+            queue.report(success=result['status'] == 'success')
+            if result['status'] == 'success':
+                history.record(template['class_name'], card.card_class, result['time'])
+            pbar.set_postfix_str(
+                f'ETA {format_eta(history.get_eta(queue.remaining()))}, encoding {OUTPUT_ENCODER.backlog}')
+            pbar.update(len(get_layout_files(card)))
+
+        # Render queue complete, wait for images still encoding in the background
+        DOCUMENT_POOL.close_all()
+        for path, reason in OUTPUT_ENCODER.wait():
+            for r in results:
+                if r.get('output') == str(path):
+                    r.update(status='failed', stage='encode', reason=reason)
+    finally:
+        queue.close()
+        recorder.flush(wait=True)
+        index.close()
+        history.save()
+        pbar.close()
+
+    # Compile the summary
+    return {
+        'started': started.isoformat(timespec='seconds'),
+        'finished': dt.now().isoformat(timespec='seconds'),
+        'duration': round(perf_counter() - timer, 2),
+        'rendered': len([r for r in results if r['status'] == 'success']),
+        'failed': len([r for r in results if r['status'] == 'failed']),
+        'skipped': len([r for r in results if r['status'] == 'skipped']),
+        'documents': DOCUMENT_POOL.stats,
+        **({'com': COM_PROFILER.get_report(top=10)} if COM_PROFILER.enabled else {}),
+        'cards': results}
+
+
+def render_batch_card(card: CardLayout, template: TemplateDetails, loaded_class: Optional[type]) -> dict:
+    """Render a single card in a batch.
+
+    Args:
+        card: Layout object representing the card.
+        template: Details of the template to render with.
+        loaded_class: Template class, or None if the template's class failed to load.
+
+    Returns:
+        Result of the render, including its timing or the reason it failed.
+    """
+    result = {
+        'file': ', '.join(str(f) for f in get_layout_files(card)),
+        'name': card.display_name,
+        'template': template['name'],
+        'class': template['class_name']}
+    if not loaded_class:
+        return {**result, 'status': 'failed', 'stage': 'template', 'reason': 'Unable to load Python class!'}
+
+    timer = perf_counter()
+    try:
+        card.template_file = template['object'].path_psd
+        with (
+            TRACER.trace_render(card.display_name, loaded_class) as trace,
+            COM_PROFILER.profile_render(),
+            LAYER_CACHE.cache_render()
+        ):
+            render = loaded_class(card)
+            success = render.execute()
+            if trace:
+                trace.success = success
+        if success:
+            return {
+                **result, 'status': 'success',
+                'time': round(perf_counter() - timer, 2),
+                'output': str(render.output_file_name)}
+        reason = 'Render failed, check logs/error.txt for details.'
+    except Exception as e:
+        CONSOLE.log_exception(e)
+        reason = str(e)
+    return {**result, 'status': 'failed', 'stage': 'render', 'time': round(perf_counter() - timer, 2), 'reason': reason}
+
 
 """
 * Commands: Render
@@ -74,5 +324,64 @@ def render_target(data_file: str = None):
     template_class(layout).execute()
 
 
+@render_cli.command(
+    name='batch',
+    help='Render every art image in one or more folders, or a list of art files, without the GUI.'
+)
+@click.argument('targets', nargs=-1, type=click.Path(exists=True, path_type=Path))
+@click.option('-t', '--template', 'templates', multiple=True,
+              help="Template to use, e.g. 'Classic' or 'normal=Classic'. Can be used multiple times.")
+@click.option('-s', '--summary', type=click.Path(dir_okay=False, path_type=Path), default=None,
+              help="Path to write the JSON render summary, defaults to 'logs/batch.json'.")
+@click.option('-r', '--resume', is_flag=True, default=False,
+              help="Resume the last run recorded in 'logs/journal.db', skipping completed cards.")
+@click.option('--retries', type=click.IntRange(min=0), default=2, show_default=True,
+              help="Number of times to retry a failed card when resuming.")
+@click.option('-i', '--incremental', is_flag=True, default=False,
+              help="Skip cards whose output was already rendered from the same art, data, template and settings.")
+@click.option('-f', '--fail-fast', is_flag=True, default=False,
+              help="Render one card of each template first, skipping a template's cards if its first card fails.")
+def render_batch_cli(
+    targets: tuple[Path, ...],
+    templates: tuple[str, ...],
+    summary: Optional[Path],
+    resume: bool,
+    retries: int,
+    incremental: bool,
+    fail_fast: bool
+):
+    """Render a batch of art files headlessly, then write a JSON summary."""
+
+    # Collect art files, defaults to the art folder
+    files: list[Path] = []
+    for target in targets or (PATH.ART,):
+        files.extend(get_art_files(target) if target.is_dir() else [target])
+    if not files:
+        raise click.UsageError('No art images found!')
+
+    # Skip completed cards when resuming, otherwise start a fresh journal
+    journal = RenderJournal(PATH.LOGS_JOURNAL)
+    if resume:
+        files, skipped = journal.get_pending(files, retries=retries)
+        click.echo(f"Resuming: skipping {len(skipped)} completed or exhausted cards, {len(files)} remaining.")
+        if not files:
+            return
+    else:
+        journal.reset()
+
+    # Render and write the summary
+    temps = get_template_map_selected(get_template_selections(templates), TEMPLATE_DEFAULTS)
+    try:
+        result = render_batch(files, temps, journal, incremental, fail_fast)
+    finally:
+        journal.close()
+    dump_data_file(result, summary or PATH.LOGS_BATCH)
+    click.echo(f"Rendered {result['rendered']} of {result['rendered'] + result['failed']} "
+               f"cards in {result['duration']} seconds, skipped {result['skipped']} unchanged. "
+               f"Summary: {summary or PATH.LOGS_BATCH}")
+    if result['failed']:
+        raise SystemExit(1)
+
+
 # Export CLI
 __all__ = ['render_cli']
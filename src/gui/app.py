@@ -8,24 +8,23 @@
 from pathlib import Path
 from time import perf_counter
 from concurrent.futures import ThreadPoolExecutor
-from contextlib import suppress
+from contextlib import nullcontext, suppress
 import win32clipboard as clipboard
 from datetime import datetime as dt
 from functools import cached_property
 from threading import Event, Thread, Lock
-from multiprocessing import cpu_count
 from typing import Union, Optional, Callable
 
 # Third-party Imports
 import requests
 from PIL import Image as PImage
 from photoshop.api._document import Document
-from photoshop.api import SaveOptions, PurgeTarget
 from packaging.version import parse
 
 # Kivy Imports
 from kivy.lang import Builder
 from kivy.app import App
+from kivy.clock import mainthread
 from kivy.metrics import dp
 from kivy.uix.button import Button
 from kivy.core.window import Window
@@ -47,6 +46,7 @@
     TemplateDetails,
     TemplateSelectedMap,
     TemplateCategoryMap,
+    check_for_updates,
     get_template_map_selected,
     AppTemplate)
 from src.gui._state import GUI, GlobalAccess
@@ -55,15 +55,22 @@
 from src.gui.tabs.main import TemplateRow, MainPanel
 from src.gui.tabs.tools import ToolsPanel
 from src.gui.test import TestApp
-from src.layouts import (
-    layout_map,
-    assign_layout,
-    join_dual_card_layouts,
-    NormalLayout)
+from src.layouts import layout_map, assign_layout, NormalLayout
+from src.pipeline import OutputRecorder, RenderQueue, get_layout_files, get_render_fingerprint
 from src.templates import BaseTemplate
 from src.utils.adobe import get_photoshop_error_message, PhotoshopHandler, PS_EXCEPTIONS
 from src.utils.hexapi import update_hexproof_cache, get_api_key
-from src.utils.fonts import check_app_fonts
+from src.utils.com_profile import COM_PROFILER
+from src.utils.documents import DOCUMENT_POOL
+from src.utils.export import OUTPUT_ENCODER
+from src.utils.journal import RenderJournal
+from src.utils.layer_cache import LAYER_CACHE
+from src.utils.render_index import RenderIndex
+from src.utils.render_times import RenderTimes, format_eta
+from src.utils.refresh import BackgroundRefresh
+from src.utils.prefetch import trace_layout_access
+from src.utils.tracing import TRACER
+from src.utils.fonts import check_app_fonts, get_font_paths
 
 
 """
@@ -387,15 +394,14 @@ def select_art(self) -> list[Path]:
     """
 
     def close_document(self) -> None:
-        """Close Photoshop document if current document reference exists.."""
-        if isinstance(self.docref, Document):
-            try:
-                self.docref.close(SaveOptions.DoNotSaveChanges)
-                self.app.purge(PurgeTarget.AllCaches)
-            except Exception as e:
-                # Document wasn't available
-                print("Couldn't close corresponding document!")
-                self.console.log_exception(e)
+        """Close Photoshop document if current document reference exists, as well as any template
+        documents kept open between renders."""
+        try:
+            DOCUMENT_POOL.close_all()
+        except Exception as e:
+            # Document wasn't available
+            print("Couldn't close corresponding document!")
+            self.console.log_exception(e)
         self.current_render = None
 
     """
@@ -422,100 +428,144 @@ def render_all(self, target: bool = False, files: Optional[list[Path]] = None) -
             return self.console.update(
                 "No art images found!" if target else "No art images selected!")
 
-        # Run through each file, assigning layout
-        with ThreadPoolExecutor(max_workers=cpu_count()) as pool:
-            cards = pool.map(assign_layout, files)
-
-        # Join dual card layouts
-        cards = join_dual_card_layouts(list(cards))
-
-        # Remove failed strings
-        layouts: dict[str, dict[str, list[NormalLayout]]] = {}
+        # Build settings for each template up front, so switching templates is just a swap
+        self.console.update()
+        self.cfg.prepare(t['config'] for t in temps.values())
+
+        # Resolve cards on worker threads while earlier cards render
+        history = RenderTimes(PATH.SRC_DATA_RENDER_TIMES)
+        queue = RenderQueue(files, temps, fail_fast=self.cfg.fail_fast, times=history)
+        journal = RenderJournal(PATH.LOGS_JOURNAL)
+        journal.reset()
+        index = RenderIndex(PATH.OUT_INDEX)
+        recorder = OutputRecorder(index, journal)
+        DOCUMENT_POOL.reset_stats()
+        COM_PROFILER.reset()
+        current: Optional[tuple[str, str]] = None
+        config_hash: Optional[str] = None
+        loaded: dict[str, Optional[type[BaseTemplate]]] = {}
         failed: list[str] = []
-        for c in cards:
+        skipped: list[str] = []
+        times: list[float] = []
+        try:
+            for item in queue:
+
+                # Card couldn't be resolved, let the user choose to continue the first time
+                if isinstance(item, str):
+                    failed.append(item)
+                    journal.start(files=queue.files)
+                    journal.finish(files=queue.files, success=False, error=item)
+                    if len(failed) == 1 and not self.console.error(
+                        msg=f"\n{msg_error('Unable to render this card:')}\n{item}"
+                    ):
+                        return
+                    if len(failed) > 1:
+                        self.console.update(item)
+                    continue
+                card, template = item
+
+                # Switching to a different template
+                if card.card_class not in loaded or queue.current != current:
+                    current = queue.current
+
+                    # Initialize the template's python class module
+                    if card.card_class not in loaded:
+                        loaded[card.card_class] = template['object'].get_template_class(template['class_name'])
+                        if not loaded[card.card_class]:
+
+                            # Failed to load module or python class, ask to continue
+                            self.console.update(msg_error(
+                                "Unable to load Python class: "
+                                f"{msg_bold(template['class_name'])}"))
+                            if not self.console.error(
+                                msg=msg_error('Cards using this template will be cancelled.')
+                            ):
+                                return
+                            self.console.update()
 
-            # Add failed card
-            if isinstance(c, str):
-                failed.append(c)
-                continue
+                    # Load constants and config for this template
+                    if loaded[card.card_class]:
+                        queue.settle()
+                        self.cfg.load(template['config'])
+                        self.con.reload()
+                        config_hash = self.cfg.get_hash()
+
+                # Template failed to load
+                if not (loaded_class := loaded[card.card_class]):
+                    failed.append(msg_error(card.display_name, reason='Template class failed to load'))
+                    queue.report(success=False)
+                    continue
 
-            # Assign card as failure if template isn't installed
-            if not temps[c.card_class]['object'].is_installed:
-                c = msg_error(
-                    msg=c.display_name,
-                    reason=f"Template '{temps[c.card_class]['name']}' with type "
-                           f"'{c.card_class}' is not installed!")
+                # Skip cards whose output was already rendered from the same inputs
+                fingerprint = get_render_fingerprint(card, template, config_hash, index)
+                if self.cfg.skip_unchanged and (output := index.get_output(fingerprint)):
+                    skipped.append(card.display_name)
+                    journal.start(
+                        files=get_layout_files(card),
+                        scryfall_id=card.scryfall.get('id'),
+                        template=template['name'],
+                        template_class=template['class_name'],
+                        config_hash=config_hash)
+                    journal.finish(files=get_layout_files(card), success=True, output=output)
+                    queue.report(success=True)
+                    continue
 
-            # Map card to its template path and layout type
-            layouts.setdefault(
-                str(temps[c.card_class]['object'].path_psd), {}
-            ).setdefault(c.card_class, []).append(c)
+                # Compute layout data this template is known to read in the background
+                queue.prefetch(card, loaded_class)
+                queue.wait(card)
+
+                # Render the card, recording the job in the journal
+                journal.start(
+                    files=get_layout_files(card),
+                    scryfall_id=card.scryfall.get('id'),
+                    template=template['name'],
+                    template_class=template['class_name'],
+                    config_hash=config_hash)
+                result = self.start_render(card, template, loaded_class)
+                if result is not None:
+                    recorder.add(self.current_render.output_file_name, get_layout_files(card), fingerprint, result)
+                else:
+                    journal.finish(files=get_layout_files(card), success=False)
+                if self.thread_cancelled:
+                    return
+                queue.report(success=result is not None)
+                if result is not None:
+                    history.record(template['class_name'], card.card_class, result)
+                    times.append(result)
+
+                # Estimate the time remaining
+                if remaining := queue.remaining():
+                    self.console.update(
+                        f"[i]{len(remaining)} cards remaining, "
+                        f"estimated time: {format_eta(history.get_eta(remaining))}"
+                        f"{f', {n} images encoding' if (n := OUTPUT_ENCODER.backlog) else ''}[/i]\n")
+
+            # Render queue complete
+            self.close_document()
+        finally:
+            queue.close()
+            recorder.flush(wait=True)
+            journal.close()
+            index.close()
+            history.save()
+
+        # Wait for images still encoding in the background
+        if OUTPUT_ENCODER.backlog:
+            self.console.update(f"Waiting for {OUTPUT_ENCODER.backlog} images to finish encoding...")
+        for path, reason in OUTPUT_ENCODER.wait():
+            failed.append(msg_error(path.name, reason=f'Encoding failed: {reason}'))
+
+        # Were any unchanged cards skipped?
+        if skipped:
+            self.console.update(f"Skipped {len(skipped)} unchanged cards.")
 
         # Did any cards fail to find?
         if failed:
-
-            # If all failed alert the user and cancel
             failure_list = '\n'.join(failed)
-            if not layouts:
-                return self.console.update(
-                    f"\n{msg_bold(msg_error('Failed to render all cards!'))}"
-                    f"\n{failure_list}")
-
-            # Let the user choose to continue if only some failed
-            if not self.console.error(
-                msg=f"\n{msg_error('Unable to render these cards:')}"
-                    f"{failure_list}"
-            ):
-                return
-
-        # Render in batches separated by PSD file
-        self.console.update()
-        times: list[float] = []
-        for (i), (_path, class_map) in enumerate(layouts.items()):
-            for layout, cards in class_map.items():
-
-                # Initialize the template's python class module
-                loaded_class = temps[layout]['object'].get_template_class(
-                    temps[layout]['class_name'])
-                if not loaded_class:
-
-                    # Failed to load module or python class
-                    self.console.update(msg_error(
-                        "Unable to load Python class: "
-                        f"{msg_bold(temps[layout]['class_name'])}"))
-
-                    # If more templates in the queue, ask to continue
-                    if (i + 1) < len(layouts):
-
-                        # Get a list of cards using this template
-                        failed_cards = get_bullet_points(
-                            text=[str(c.display_name) for c in cards],
-                            char='-')
-                        if self.console.error(
-                            msg=f"{msg_error('The following cards have been cancelled:')}"
-                                f"{failed_cards}"
-                        ):
-                            # Continue to next template
-                            self.console.update()
-                            continue
-
-                    # Cancel render process
-                    return
-
-                # Load constants and config for this template
-                self.cfg.load(temps[layout]['config'])
-                self.con.reload()
-
-                # Render each card with this PSD and class
-                for c in cards:
-                    result = self.start_render(c, temps[layout], loaded_class)
-                    if self.thread_cancelled:
-                        return
-                    if result is not None:
-                        times.append(result)
-
-            # Render group complete
-            self.close_document()
+            self.console.update(
+                f"\n{msg_bold(msg_error('Failed to render all cards!'))}" if not times else
+                f"\n{msg_error('Unable to render these cards:')}")
+            self.console.update(failure_list)
 
         # Report the average render time
         self.console.update(msg_success('Renders Completed!'))
@@ -523,6 +573,16 @@ def render_all(self, target: bool = False, files: Optional[list[Path]] = None) -
             avg = round(sum(times) / len(times), 1)
             self.console.update(f'Average time: {avg} seconds')
 
+        # Report how often templates were opened and closed
+        stats = DOCUMENT_POOL.stats
+        self.console.update(
+            f"Templates opened: {stats['opened']} ({stats['open_time']}s), "
+            f"closed: {stats['closed']} ({stats['close_time']}s), reused: {stats['reused']}")
+
+        # Report the chattiest COM members and callers if profiling
+        if COM_PROFILER.enabled:
+            self.console.update(COM_PROFILER.get_summary())
+
     @render_process_wrapper
     def render_custom(self, template: TemplateDetails, scryfall: dict) -> None:
         """Set up custom render job, then execute.
@@ -744,17 +804,28 @@ def start_render(
             # Set the PSD location of the template
             card.template_file = template['object'].path_psd
 
-            # Create the template class object
-            self.current_render = loaded_class(card)
+            # Record layout properties read by the template, time each render stage, profile COM calls, and
+            # cache layer property reads
+            with (
+                trace_layout_access(card, loaded_class) if self.env.TRACE_LAYOUT else nullcontext(),
+                TRACER.trace_render(card.display_name, loaded_class) as trace,
+                COM_PROFILER.profile_render(),
+                LAYER_CACHE.cache_render()
+            ):
+
+                # Create the template class object
+                self.current_render = loaded_class(card)
 
-            # Run a cancellation await in a separate thread using executor
-            with ThreadPoolExecutor() as executor:
-                executor.submit(self.console.start_await_cancel, self.current_render.event)
+                # Run a cancellation await in a separate thread using executor
+                with ThreadPoolExecutor() as executor:
+                    executor.submit(self.console.start_await_cancel, self.current_render.event)
 
-            # Render the card
-            start_time = self.timer
-            result = self.current_render.execute()
-            timed = round(self.timer - start_time, 1)
+                # Render the card
+                start_time = self.timer
+                result = self.current_render.execute()
+                timed = round(self.timer - start_time, 1)
+                if trace:
+                    trace.success = bool(result)
 
             # Return execution time if successful
             if not self.thread.is_set() and result:
@@ -928,34 +999,11 @@ def on_start(self) -> None:
         """Fired after build is fired. Run a diagnostic check to see what works."""
         self.console.update(msg_success("--- STATUS ---"))
 
-        # Check if using latest version
-        self.console.update(
-            f"Proxyshop Version ... {msg_success('Using latest version!')}" if (
-                self.check_app_version()
-            ) else f"Proxyshop Version ... {msg_info('New release available!')}"
-        )
-
-        # Update set data if needed
-        check, error = update_hexproof_cache()
-        if check:
-            self.con.reload()
-        message = msg_error(error) if error else msg_success(
-            'Update was applied!' if check else 'Using latest data!')
-        self.console.update(f"Hexproof API Data ... {message}")
-
-        # Check if API keys are valid
-        if not self.env.API_GOOGLE:
-            self.env.API_GOOGLE = get_api_key('proxyshop.google.drive')
-        if not self.env.API_AMAZON:
-            self.env.API_AMAZON = get_api_key('proxyshop.amazon.s3')
-        keys_missing = [k for k, v in [
-            ('Google Drive', self.env.API_GOOGLE),
-            ('Amazon S3', self.env.API_AMAZON)
-        ] if not v]
-        message = msg_warn(
-            f"Keys disabled: {', '.join(keys_missing)}"
-        ) if keys_missing else msg_success('Keys retrieved!')
-        self.console.update(f"Updater API Keys ... {message}")
+        # Refresh network data in the background, renders use local data until it completes
+        if self.env.OFFLINE:
+            self.console.update(f"Network Data ... {msg_info('Skipped, offline mode enabled.')}")
+        else:
+            self.start_refresh()
 
         # Check Photoshop status
         result = self.app.refresh_app()
@@ -998,6 +1046,71 @@ def on_stop(self) -> None:
         """Called when the app is closed."""
         if self.thread and isinstance(self.thread, Event):
             self.thread.set()
+        self.refresh.shutdown()
+
+    """
+    * Background Refresh
+    """
+
+    @cached_property
+    def refresh(self) -> BackgroundRefresh:
+        """BackgroundRefresh: Service which refreshes network data without blocking the app."""
+        return BackgroundRefresh(max_workers=3, timeout=20)
+
+    def start_refresh(self) -> None:
+        """Queue app version, Hexproof data, API key, and template update checks, reporting each result
+            to the console once it completes. Font files are also mapped, so text measurement doesn't read
+            them on the render thread."""
+        self.refresh.submit('version', self.check_app_version, mainthread(self.on_refresh_version))
+        self.refresh.submit('hexproof', update_hexproof_cache, mainthread(self.on_refresh_hexproof), timeout=60)
+        self.refresh.submit('keys', self.check_api_keys, mainthread(self.on_refresh_keys))
+        self.refresh.submit(
+            'templates', lambda: check_for_updates(self.templates), mainthread(self.on_refresh_templates))
+        self.refresh.submit('fonts', get_font_paths, timeout=120)
+
+    def on_refresh_version(self, result: Optional[bool]) -> None:
+        """Report the app version check result."""
+        message = msg_warn('Update check timed out!') if result is None else msg_success(
+            'Using latest version!') if result else msg_info('New release available!')
+        self.console.update(f"Proxyshop Version ... {message}")
+
+    def on_refresh_hexproof(self, result: Optional[tuple[bool, Optional[str]]]) -> None:
+        """Report the Hexproof data update result, reloading constants if an update was applied."""
+        check, error = result or (False, 'Update check timed out!')
+        if check:
+            self.con.reload()
+        message = msg_error(error) if error else msg_success(
+            'Update was applied!' if check else 'Using latest data!')
+        self.console.update(f"Hexproof API Data ... {message}")
+
+    def on_refresh_keys(self, keys_missing: Optional[list[str]]) -> None:
+        """Report the API key check result."""
+        message = msg_warn(
+            f"Keys disabled: {', '.join(keys_missing)}"
+        ) if keys_missing else msg_success('Keys retrieved!') if (
+            keys_missing is not None
+        ) else msg_warn('Key check timed out!')
+        self.console.update(f"Updater API Keys ... {message}")
+
+    def on_refresh_templates(self, updates: Optional[list[AppTemplate]]) -> None:
+        """Report the template update check result."""
+        if updates:
+            self.console.update(f"Template Updates ... {msg_info(f'{len(updates)} update(s) available!')}")
+
+    def check_api_keys(self) -> list[str]:
+        """Retrieve any API keys not defined in the environment.
+
+        Returns:
+            Names of the keys which couldn't be retrieved.
+        """
+        if not self.env.API_GOOGLE:
+            self.env.API_GOOGLE = get_api_key('proxyshop.google.drive')
+        if not self.env.API_AMAZON:
+            self.env.API_AMAZON = get_api_key('proxyshop.amazon.s3')
+        return [k for k, v in [
+            ('Google Drive', self.env.API_GOOGLE),
+            ('Amazon S3', self.env.API_AMAZON)
+        ] if not v]
 
     """
     * App Updates
@@ -12,6 +12,7 @@
 from src import APP, CON
 from src.enums.layers import LAYERS
 from src.schema.colors import pinlines_color_map, ColorObject
+from src.utils.action_batch import new_descriptor
 
 # QOL Definitions
 sID, cID = APP.stringIDToTypeID, APP.charIDToTypeID
@@ -286,7 +287,7 @@ def apply_rgb_from_list(action: ActionDescriptor, color: list[int], color_type:
         color: List of integers for R, G, B.
         color_type: Color action descriptor type, defaults to 'color'.
     """
-    ad = ActionDescriptor()
+    ad = new_descriptor(action)
     ad.putDouble(sID("red"), color[0])
     ad.putDouble(sID("green"), color[1])
     ad.putDouble(sID("blue"), color[2])
@@ -301,7 +302,7 @@ def apply_cmyk_from_list(action: ActionDescriptor, color: list[int], color_type:
         color: List of integers for R, G, B.
         color_type: Color action descriptor type, defaults to 'color'.
     """
-    ad = ActionDescriptor()
+    ad = new_descriptor(action)
     ad.putDouble(sID("cyan"), color[0])
     ad.putDouble(sID("magenta"), color[1])
     ad.putDouble(sID("yellowColor"), color[2])
@@ -375,7 +376,7 @@ def add_color_to_gradient(
         location: Location of the color along the track.
         midpoint: Percentage midpoint between this color and the next.
     """
-    action = ActionDescriptor()
+    action = new_descriptor(action_list)
     apply_color(action, color)
     action.putEnumerated(sID("type"), sID("colorStopType"), sID("userStop"))
     action.putInteger(sID("location"), location)
@@ -30,6 +30,14 @@
 sID, cID = APP.stringIDToTypeID, APP.charIDToTypeID
 NO_DIALOG = DialogModes.DisplayNoDialogs
 
+# Pixels the art selection is contracted by before filling its edges, when feathered or smoothed
+FILL_EDGES_CONTRACT_FEATHERED = 22
+FILL_EDGES_CONTRACT_SMOOTHED = 10
+
+# Radius in pixels the contracted art selection is feathered or smoothed by
+FILL_EDGES_FEATHER = 8
+FILL_EDGES_SMOOTH = 5
+
 """
 * Filling Space
 """
@@ -84,6 +92,15 @@ def fill_empty_area(reference: ArtLayer, color: Optional[SolidColor] = None) ->
     return layer
 
 
+def get_fill_edges_contract(feather: bool = False) -> int:
+    """Returns the pixels an art layer's edges are trimmed by before filling around it.
+
+    Args:
+        feather: Whether the selection is feathered rather than smoothed.
+    """
+    return FILL_EDGES_CONTRACT_FEATHERED if feather else FILL_EDGES_CONTRACT_SMOOTHED
+
+
 def content_aware_fill_edges(layer: Optional[ArtLayer] = None, feather: bool = False) -> None:
     """Fills pixels outside art layer using content-aware fill.
 
@@ -104,12 +121,11 @@ def content_aware_fill_edges(layer: Optional[ArtLayer] = None, feather: bool = F
     # Guard against no selection made
     try:
         # Create a feathered or smoothed selection, then invert
+        selection.contract(get_fill_edges_contract(feather))
         if feather:
-            selection.contract(22)
-            selection.feather(8)
+            selection.feather(FILL_EDGES_FEATHER)
         else:
-            selection.contract(10)
-            selection.smooth(5)
+            selection.smooth(FILL_EDGES_SMOOTH)
         selection.invert()
         content_aware_fill()
     except PS_EXCEPTIONS:
@@ -165,12 +181,11 @@ def generative_fill_edges(
     # Guard against no selection made
     try:
         # Create a feathered or smoothed selection, then invert
+        selection.contract(get_fill_edges_contract(feather))
         if feather:
-            selection.contract(22)
-            selection.feather(8)
+            selection.feather(FILL_EDGES_FEATHER)
         else:
-            selection.contract(10)
-            selection.smooth(5)
+            selection.smooth(FILL_EDGES_SMOOTH)
         selection.invert()
         try:
             generative_fill()
@@ -15,6 +15,8 @@
     PNGSaveOptions,
     JPEGSaveOptions,
     PhotoshopSaveOptions,
+    TiffSaveOptions,
+    TiffEncodingType,
     ElementPlacement,
     FormatOptionsType
 )
@@ -26,6 +28,7 @@
 from src import APP
 from src.helpers.layers import create_new_layer
 from src.utils.adobe import PS_EXCEPTIONS
+from src.utils.layer_index import LAYER_INDEX
 
 # QOL Definitions
 sID, cID = APP.stringIDToTypeID, APP.charIDToTypeID
@@ -242,10 +245,12 @@ def reset_document(docref: Optional[Document] = None) -> None:
         docref: Reference document to reset state in, use active if not provided.
     """
     docref = docref or APP.activeDocument
+    name = docref.name
     d1, r1 = ActionDescriptor(), ActionReference()
-    r1.putName(sID('snapshotClass'), docref.name)
+    r1.putName(sID('snapshotClass'), name)
     d1.putReference(sID('target'), r1)
     APP.executeAction(sID('select'), d1, NO_DIALOG)
+    LAYER_INDEX.discard(name)
 
 
 """
@@ -393,6 +398,27 @@ def save_document_jpeg(path: Path, optimize: bool = True, docref: Optional[Docum
         raise OSError from e
 
 
+def save_document_tiff(path: Path, docref: Optional[Document] = None) -> None:
+    """Save the current document as a flattened, uncompressed TIFF. Used as a fast intermediate image
+    which is encoded into the final output image outside Photoshop.
+
+    Args:
+        path: Path to save the TIFF file.
+        docref: Current active document. Use active if not provided.
+    """
+    docref = docref or APP.activeDocument
+    options = TiffSaveOptions()
+    options.imageCompression = TiffEncodingType.NoTIFFCompression
+    options.layers = False
+    options.alphaChannels = False
+    options.annotations = False
+    options.transparency = False
+    docref.saveAs(
+        file_path=str(path.with_suffix('.tif')),
+        options=options,
+        asCopy=True)
+
+
 def save_document_psd(path: Path, docref: Optional[Document] = None) -> None:
     """Save the current document as a PSD.
 
@@ -15,6 +15,8 @@
 from src.enums.adobe import Stroke
 from src.schema.adobe import EffectBevel, EffectColorOverlay, EffectDropShadow, EffectGradientOverlay, EffectStroke, \
     LayerEffects
+from src.utils.action_batch import ActionBatch, new_descriptor, new_list, new_reference
+from src.utils.layer_index import LAYER_INDEX
 
 # QOL Definitions
 sID, cID = APP.stringIDToTypeID, APP.charIDToTypeID
@@ -153,20 +155,29 @@ def copy_layer_fx(from_layer: Union[ArtLayer, LayerSet], to_layer: Union[ArtLaye
 """
 
 
-def apply_fx(layer: Union[ArtLayer, LayerSet], effects: list[LayerEffects]) -> None:
+def apply_fx(
+    layer: Union[ArtLayer, LayerSet],
+    effects: list[LayerEffects],
+    batch: Optional[ActionBatch] = None
+) -> None:
     """Apply multiple layer effects to a layer.
 
     Args:
         layer: Layer or Layer Set object.
         effects: List of effects to apply.
+        batch: Batch to record the action to, execute it immediately if not provided. A batched action
+            targets the layer by ID rather than making it the active layer.
     """
     # Set up the main action
-    APP.activeDocument.activeLayer = layer
-    main_action = ActionDescriptor()
-    fx_action = ActionDescriptor()
-    main_ref = ActionReference()
+    main_action = new_descriptor(batch)
+    fx_action = new_descriptor(batch)
+    main_ref = new_reference(batch)
     main_ref.putProperty(sID("property"), sID("layerEffects"))
-    main_ref.putEnumerated(sID("layer"), sID("ordinal"), sID("targetEnum"))
+    if batch is None:
+        APP.activeDocument.activeLayer = layer
+        main_ref.putEnumerated(sID("layer"), sID("ordinal"), sID("targetEnum"))
+    else:
+        main_ref.putIdentifier(sID("layer"), LAYER_INDEX.get_id(layer))
     main_action.putReference(sID("target"), main_ref)
 
     # Add each action from fx dictionary
@@ -184,7 +195,7 @@ def apply_fx(layer: Union[ArtLayer, LayerSet], effects: list[LayerEffects]) -> N
 
     # Apply all fx actions
     main_action.putObject(sID("to"), sID("layerEffects"), fx_action)
-    APP.executeAction(sID("set"), main_action, NO_DIALOG)
+    (batch or APP).executeAction(sID("set"), main_action, NO_DIALOG)
 
 
 def apply_fx_bevel(action: ActionDescriptor, fx: EffectBevel) -> None:
@@ -194,7 +205,7 @@ def apply_fx_bevel(action: ActionDescriptor, fx: EffectBevel) -> None:
         action: Pending layer effects action descriptor.
         fx: Bevel effect properties.
     """
-    d1, d2 = ActionDescriptor(), ActionDescriptor()
+    d1, d2 = new_descriptor(action), new_descriptor(action)
     d1.PutEnumerated(sID("highlightMode"), sID("blendMode"), sID("screen"))
     apply_color(d1, fx.highlight_color, 'highlightColor')
     d1.PutUnitDouble(sID("highlightOpacity"), sID("percentUnit"),  fx.highlight_opacity)
@@ -224,7 +235,7 @@ def apply_fx_color_overlay(action: ActionDescriptor, fx: EffectColorOverlay) ->
         action: Pending layer effects action descriptor.
         fx: Color Overlay effect properties.
     """
-    d = ActionDescriptor()
+    d = new_descriptor(action)
     d.PutEnumerated(sID("mode"), sID("blendMode"), sID("normal"))
     apply_color(d, fx.color)
     d.PutUnitDouble(sID("opacity"), sID("percentUnit"), fx.opacity)
@@ -238,8 +249,8 @@ def apply_fx_drop_shadow(action: ActionDescriptor, fx: EffectDropShadow) -> None
         action: Pending layer effects action descriptor.
         fx: Drop Shadow effect properties.
     """
-    d1 = ActionDescriptor()
-    d2 = ActionDescriptor()
+    d1 = new_descriptor(action)
+    d2 = new_descriptor(action)
     d1.putEnumerated(sID("mode"), sID("blendMode"), sID("multiply"))
     apply_color(d1, fx.color)
     d1.putUnitDouble(sID("opacity"), sID("percentUnit"), fx.opacity)
@@ -263,13 +274,13 @@ def apply_fx_gradient_overlay(action: ActionDescriptor, fx: EffectGradientOverla
         action: Pending layer effects action descriptor.
         fx: Gradient Overlay effect properties.
     """
-    d1 = ActionDescriptor()
-    d2 = ActionDescriptor()
-    d3 = ActionDescriptor()
-    d4 = ActionDescriptor()
-    d5 = ActionDescriptor()
-    color_list = ActionList()
-    transparency_list = ActionList()
+    d1 = new_descriptor(action)
+    d2 = new_descriptor(action)
+    d3 = new_descriptor(action)
+    d4 = new_descriptor(action)
+    d5 = new_descriptor(action)
+    color_list = new_list(action)
+    transparency_list = new_list(action)
     d1.putEnumerated(sID("mode"), sID("blendMode"), sID("normal"))
     d1.putUnitDouble(sID("opacity"), sID("percentUnit"),  fx.opacity)
     d2.putEnumerated(sID("gradientForm"), sID("gradientForm"), sID("customStops"))
@@ -312,7 +323,7 @@ def apply_fx_stroke(action: ActionDescriptor, fx: EffectStroke) -> None:
         action: Pending layer effects action descriptor.
         fx: Stroke effect properties.
     """
-    d = ActionDescriptor()
+    d = new_descriptor(action)
     d.putEnumerated(sID("style"), sID("frameStyle"), Stroke.position(fx.style))
     d.putEnumerated(sID("paintType"), sID("frameFill"), sID("solidColor"))
     d.putEnumerated(sID("mode"), sID("blendMode"), sID("normal"))
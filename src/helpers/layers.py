@@ -14,6 +14,7 @@
 # Local Imports
 from src import APP, ENV
 from src.utils.adobe import LayerContainer, LayerContainerTypes, ReferenceLayer, PS_EXCEPTIONS
+from src.utils.layer_index import LAYER_INDEX
 
 # QOL Definitions
 sID, cID = APP.stringIDToTypeID, APP.charIDToTypeID
@@ -39,6 +40,11 @@ def getLayer(
         Layer object requested
     """
     try:
+        # Use the document's layer index if it contains the layer
+        indexed, layer = LAYER_INDEX.find(name, group)
+        if indexed:
+            return layer
+
         # LayerSet provided?
         if not group:
             # LayerSet not provided
@@ -87,6 +93,11 @@ def getLayerSet(
         Group object requested.
     """
     try:
+        # Use the document's layer index if it contains the layer
+        indexed, layer_set = LAYER_INDEX.find(name, group, is_group=True)
+        if indexed:
+            return layer_set
+
         # Was LayerSet provided?
         if not group:
             # No LayerSet given
@@ -2,7 +2,7 @@
 * Helpers: Masks
 """
 # Standard Library Imports
-from typing import Union
+from typing import Optional, Union
 
 # Third Party Imports
 from photoshop.api import DialogModes, ActionDescriptor, ActionReference
@@ -12,6 +12,8 @@
 # Local Imports
 from src import APP
 from src.helpers.selection import select_canvas
+from src.utils.action_batch import ActionBatch, new_descriptor, new_reference
+from src.utils.layer_index import LAYER_INDEX
 
 # QOL Definitions
 sID, cID = APP.stringIDToTypeID, APP.charIDToTypeID
@@ -24,50 +26,54 @@
 
 def copy_layer_mask(
     layer_from: Union[ArtLayer, LayerSet],
-    layer_to: Union[ArtLayer, LayerSet]
+    layer_to: Union[ArtLayer, LayerSet],
+    batch: Optional[ActionBatch] = None
 ) -> None:
     """Copies mask from one layer to another.
 
     Args:
         layer_from: Layer to copy from.
         layer_to: Layer to copy to.
+        batch: Batch to record the action to, execute it immediately if not provided.
     """
-    desc1 = ActionDescriptor()
-    ref17 = ActionReference()
-    ref18 = ActionReference()
+    desc1 = new_descriptor(batch)
+    ref17 = new_reference(batch)
+    ref18 = new_reference(batch)
     desc1.putClass(sID("new"), sID("channel"))
     ref17.putEnumerated(sID("channel"), sID("channel"), sID("mask"))
-    ref17.putIdentifier(sID("layer"), layer_to.id)
+    ref17.putIdentifier(sID("layer"), LAYER_INDEX.get_id(layer_to))
     desc1.putReference(sID("at"), ref17)
     ref18.putEnumerated(sID("channel"), sID("channel"), sID("mask"))
-    ref18.putIdentifier(sID("layer"), layer_from.id)
+    ref18.putIdentifier(sID("layer"), LAYER_INDEX.get_id(layer_from))
     desc1.putReference(sID("using"), ref18)
-    APP.executeAction(sID("make"), desc1, NO_DIALOG)
+    (batch or APP).executeAction(sID("make"), desc1, NO_DIALOG)
 
 
 def copy_vector_mask(
     layer_from: Union[ArtLayer, LayerSet],
-    layer_to: Union[ArtLayer, LayerSet]
+    layer_to: Union[ArtLayer, LayerSet],
+    batch: Optional[ActionBatch] = None
 ) -> None:
     """Copies vector mask from one layer to another.
 
     Args:
         layer_from: Layer to copy from.
         layer_to: Layer to copy to.
+        batch: Batch to record the action to, execute it immediately if not provided.
     """
-    desc1 = ActionDescriptor()
-    ref1 = ActionReference()
-    ref2 = ActionReference()
-    ref3 = ActionReference()
+    desc1 = new_descriptor(batch)
+    ref1 = new_reference(batch)
+    ref2 = new_reference(batch)
+    ref3 = new_reference(batch)
     ref1.putClass(sID("path"))
     desc1.putReference(sID("target"),  ref1)
     ref2.putEnumerated(sID("path"), sID("path"), sID("vectorMask"))
-    ref2.putIdentifier(sID("layer"),  layer_to.id)
+    ref2.putIdentifier(sID("layer"),  LAYER_INDEX.get_id(layer_to))
     desc1.putReference(sID("at"),  ref2)
     ref3.putEnumerated(sID("path"), sID("path"), sID("vectorMask"))
-    ref3.putIdentifier(sID("layer"), layer_from.id)
+    ref3.putIdentifier(sID("layer"), LAYER_INDEX.get_id(layer_from))
     desc1.putReference(sID("using"),  ref3)
-    APP.executeAction(sID("make"), desc1, NO_DIALOG)
+    (batch or APP).executeAction(sID("make"), desc1, NO_DIALOG)
 
 
 """
@@ -96,33 +102,39 @@ def apply_mask_to_layer_fx(layer: Union[ArtLayer, LayerSet] = None) -> None:
 
 def set_layer_mask(
     layer: Union[ArtLayer, LayerSet, None] = None,
-    visible: bool = True
+    visible: bool = True,
+    batch: Optional[ActionBatch] = None
 ) -> None:
     """Set the visibility of a layer's mask.
 
     Args:
         layer: ArtLayer object.
         visible: Whether to make the layer mask visible.
+        batch: Batch to record the action to, execute it immediately if not provided.
     """
     if not layer:
         layer = APP.activeDocument.activeLayer
-    desc1 = ActionDescriptor()
-    desc2 = ActionDescriptor()
-    ref1 = ActionReference()
-    ref1.putIdentifier(cID("Lyr "), layer.id)
+    desc1 = new_descriptor(batch)
+    desc2 = new_descriptor(batch)
+    ref1 = new_reference(batch)
+    ref1.putIdentifier(cID("Lyr "), LAYER_INDEX.get_id(layer))
     desc1.putReference(sID("target"), ref1)
     desc2.putBoolean(cID("UsrM"), visible)
     desc1.putObject(cID("T   "), cID("Lyr "), desc2)
-    APP.executeAction(cID("setd"), desc1, NO_DIALOG)
+    (batch or APP).executeAction(cID("setd"), desc1, NO_DIALOG)
 
 
-def enable_mask(layer: Union[ArtLayer, LayerSet, None] = None) -> None:
+def enable_mask(
+    layer: Union[ArtLayer, LayerSet, None] = None,
+    batch: Optional[ActionBatch] = None
+) -> None:
     """Enables a given layer's mask.
 
     Args:
         layer: ArtLayer object.
+        batch: Batch to record the action to, execute it immediately if not provided.
     """
-    set_layer_mask(layer, True)
+    set_layer_mask(layer, True, batch)
 
 
 def disable_mask(layer: Union[ArtLayer, LayerSet, None] = None) -> None:
@@ -152,33 +164,39 @@ def apply_mask(layer: Union[ArtLayer, LayerSet, None] = None) -> None:
 
 def set_layer_vector_mask(
     layer: Union[ArtLayer, LayerSet, None] = None,
-    visible: bool = False
+    visible: bool = False,
+    batch: Optional[ActionBatch] = None
 ) -> None:
     """Set the visibility of a layer's vector mask.
 
     Args:
         layer: ArtLayer object.
         visible: Whether to make the vector mask visible.
+        batch: Batch to record the action to, execute it immediately if not provided.
     """
     if not layer:
         layer = APP.activeDocument.activeLayer
-    desc1 = ActionDescriptor()
-    desc2 = ActionDescriptor()
-    ref1 = ActionReference()
-    ref1.putIdentifier(sID("layer"), layer.id)
+    desc1 = new_descriptor(batch)
+    desc2 = new_descriptor(batch)
+    ref1 = new_reference(batch)
+    ref1.putIdentifier(sID("layer"), LAYER_INDEX.get_id(layer))
     desc1.putReference(sID("target"), ref1)
     desc2.putBoolean(sID("vectorMaskEnabled"), visible)
     desc1.putObject(sID("to"), sID("layer"), desc2)
-    APP.executeAction(sID("set"), desc1, NO_DIALOG)
+    (batch or APP).executeAction(sID("set"), desc1, NO_DIALOG)
 
 
-def enable_vector_mask(layer: Union[ArtLayer, LayerSet, None] = None) -> None:
+def enable_vector_mask(
+    layer: Union[ArtLayer, LayerSet, None] = None,
+    batch: Optional[ActionBatch] = None
+) -> None:
     """Enables a given layer's vector mask.
 
     Args:
         layer: ArtLayer object.
+        batch: Batch to record the action to, execute it immediately if not provided.
     """
-    set_layer_vector_mask(layer, True)
+    set_layer_vector_mask(layer, True, batch)
 
 
 def disable_vector_mask(layer: Union[ArtLayer, LayerSet, None] = None) -> None:
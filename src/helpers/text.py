@@ -2,7 +2,8 @@
 * Helpers: Text Items
 """
 # Standard Library Imports
-from typing import Union, Optional, Any
+from math import log
+from typing import Union, Optional, Any, Callable
 
 # Third Party Imports
 from photoshop.api import (
@@ -643,6 +644,116 @@ def scale_text_left_overlap(layer: ArtLayer, reference: ArtLayer, gap: int = 30)
         ref_TI.contents = ''
 
 
+def fit_text_size(
+    font_size: float,
+    current: float,
+    limit: float,
+    apply: Callable[[float], None],
+    measure: Callable[[], float],
+    tolerance: float = 0.2,
+    exponent: float = 1,
+    model: Optional[Callable[[float], float]] = None,
+    max_steps: int = 8
+) -> float:
+    """Find the largest font size at which a measured text dimension fits within a limit.
+
+    Notes:
+        - Sizes are predicted from the last measured dimension and size, assuming the dimension grows with
+            the font size raised to an exponent. The exponent is re-estimated from each pair of measurements.
+        - If a model is provided, e.g. a layout estimated from font metrics, sizes are predicted from the
+            model instead, scaled so it agrees with the last measurement.
+        - Predictions are kept inside the range between the largest size known to fit and the smallest size
+            known to overflow, falling back to bisection if predictions haven't closed that range by the
+            fourth measurement. Most fits settle in two to four measurements.
+        - Measuring stops after `max_steps` sizes once a size which fits is known. Until then, the size
+            keeps being halved, so the returned size only overflows if the text doesn't fit at any size.
+
+    Args:
+        font_size: Starting font size, which overflows the limit.
+        current: Dimension measured at the starting font size.
+        limit: Largest dimension which fits.
+        apply: Applies a font size to the text.
+        measure: Returns the dimension of the text at its current font size.
+        tolerance: Largest gap allowed between the returned size and a size known to overflow.
+        exponent: Starting estimate of how the dimension scales with font size, e.g. 1 for the width of a
+            single line, or 2 for the height of wrapping paragraph text.
+        model: Returns the estimated dimension of the text at a font size.
+        max_steps: Maximum number of sizes to measure once a size which fits is known.
+
+    Returns:
+        The fitted font size, which has been applied to the text.
+    """
+    low, high, step = None, font_size, 0
+    size, last_size, last_dim = font_size, font_size, current
+    while high > tolerance:
+        if low is not None and (high - low <= tolerance or step >= max_steps):
+            break
+
+        # Predict the size which fits exactly, or bisect if predictions aren't converging
+        if low is not None and step >= 3:
+            size = (low + high) / 2
+        elif step >= max_steps:
+            # Nothing fits yet, keep halving the size until something does
+            size = high / 2
+        elif model and (estimate := model(last_size)) > 0:
+            size = get_model_fit_size(
+                model=model,
+                limit=limit * estimate / max(last_dim, 1),
+                low=(low or 0) + tolerance / 2,
+                high=high - tolerance / 2,
+                precision=tolerance / 4)
+        else:
+            size = last_size * (limit / max(last_dim, 1)) ** (1 / exponent)
+        size = round(min(max(size, (low or 0) + tolerance / 2), high - tolerance / 2), 2)
+
+        # Measure the size and update the estimated exponent
+        apply(size)
+        dim, step = measure(), step + 1
+        if 0 < dim != last_dim and 0 < last_dim and size != last_size:
+            exponent = min(max(log(dim / last_dim) / log(size / last_size), 0.5), 3)
+        last_size, last_dim = size, dim
+        if dim <= limit:
+            low = size
+        else:
+            high = size
+
+    # Text doesn't fit at any size
+    if low is None:
+        return size
+
+    # Revert to the largest size which fits
+    if size != low:
+        apply(low)
+    return low
+
+
+def get_model_fit_size(
+    model: Callable[[float], float],
+    limit: float,
+    low: float,
+    high: float,
+    precision: float
+) -> float:
+    """Returns the largest font size within a range at which a model's estimated dimension fits a limit.
+
+    Args:
+        model: Returns the estimated dimension of the text at a font size.
+        limit: Largest estimated dimension which fits.
+        low: Smallest font size to return.
+        high: Largest font size to return.
+        precision: Precision of the returned font size.
+    """
+    if model(high) <= limit:
+        return high
+    while high - low > precision:
+        mid = (low + high) / 2
+        if model(mid) <= limit:
+            low = mid
+        else:
+            high = mid
+    return low
+
+
 def scale_text_to_width(
     layer: ArtLayer,
     width: int,
@@ -656,7 +767,7 @@ def scale_text_to_width(
         layer: Text layer to scale.
         width: Width the text layer must fit (after spacing added).
         spacing: Amount of DPI adjusted spacing to pad the width.
-        step: Amount to step font size down by in each check.
+        step: Precision of the fitted font size, the result is within half a step of the largest size that fits.
         font_size: The starting font size if pre-calculated.
 
     Returns:
@@ -664,30 +775,22 @@ def scale_text_to_width(
     """
     # Cancel if we're already within expected bounds
     width = width - APP.scale_by_dpi(spacing)
-    continue_scaling = bool(width < get_layer_width(layer))
-    if not continue_scaling:
+    current = get_layer_width(layer)
+    if not width < current:
         return
 
-    # Establish starting size and half step
+    # Establish starting size
     if font_size is None:
         font_size = get_font_size(layer)
-    half_step = step / 2
-
-    # Step down font and lead sizes by the step size, and update those sizes in the layer
-    while continue_scaling:
-        font_size -= step
-        set_text_size_and_leading(layer, font_size, font_size)
-        continue_scaling = bool(width < get_layer_width(layer))
 
-    # Increase by a half step
-    font_size += half_step
-    set_text_size_and_leading(layer, font_size, font_size)
-
-    # Revert if half step still exceeds reference
-    if width < get_layer_width(layer):
-        font_size -= half_step
-        set_text_size_and_leading(layer, font_size, font_size)
-    return font_size
+    # Fit font and lead sizes to the width
+    return fit_text_size(
+        font_size=font_size,
+        current=current,
+        limit=width,
+        apply=lambda size: set_text_size_and_leading(layer, size, size),
+        measure=lambda: get_layer_width(layer),
+        tolerance=step / 2)
 
 
 def scale_text_to_height(
@@ -695,46 +798,42 @@ def scale_text_to_height(
     height: int,
     spacing: int = 64,
     step: float = 0.4,
-    font_size: Optional[float] = None
+    font_size: Optional[float] = None,
+    model: Optional[Callable[[float], float]] = None
 ) -> Optional[float]:
-    """Resize a given text layer's font size/leading until it fits inside a reference width.
+    """Resize a given text layer's font size/leading until it fits inside a reference height.
 
     Args:
         layer: Text layer to scale.
-        height: Width the text layer must fit (after spacing added).
+        height: Height the text layer must fit (after spacing added).
         spacing: Amount of DPI adjusted spacing to pad the height.
-        step: Amount to step font size down by in each check.
+        step: Precision of the fitted font size, the result is within half a step of the largest size that fits.
         font_size: The starting font size if pre-calculated.
+        model: Returns the estimated height of the text at a font size, used to predict the fitted size.
 
     Returns:
         Font size if font size is calculated during operation, otherwise None.
     """
     # Cancel if we're already within expected bounds
     height = height - APP.scale_by_dpi(spacing)
-    continue_scaling = bool(height < get_layer_height(layer))
-    if not continue_scaling:
+    current = get_layer_height(layer)
+    if not height < current:
         return
 
-    # Establish starting size and half step
+    # Establish starting size
     if font_size is None:
         font_size = get_font_size(layer)
-    half_step = step / 2
-
-    # Step down font and lead sizes by the step size, and update those sizes in the layer
-    while continue_scaling:
-        font_size -= step
-        set_text_size_and_leading(layer, font_size, font_size)
-        continue_scaling = bool(height < get_layer_height(layer))
-
-    # Increase by a half step
-    font_size += half_step
-    set_text_size_and_leading(layer, font_size, font_size)
 
-    # Revert if half step still exceeds reference
-    if height < get_layer_height(layer):
-        font_size -= half_step
-        set_text_size_and_leading(layer, font_size, font_size)
-    return font_size
+    # Fit font and lead sizes to the height, wrapping text grows in both lines and line height
+    return fit_text_size(
+        font_size=font_size,
+        current=current,
+        limit=height,
+        apply=lambda size: set_text_size_and_leading(layer, size, size),
+        measure=lambda: get_layer_height(layer),
+        tolerance=step / 2,
+        exponent=2,
+        model=model)
 
 
 def scale_text_to_width_textbox(
@@ -747,17 +846,26 @@ def scale_text_to_width_textbox(
     Args:
         layer: ArtLayer with "kind" of TextLayer.
         font_size: Starting font size, calculated if not provided (slower execution time).
-        step: Amount of points to step down each iteration.
+        step: Precision of the fitted font size in points.
     """
+    # Cancel if the text is already within the bounding box
+    ref = get_textbox_width(layer) + 1
+    current = get_width_no_effects(layer)
+    if not current > ref:
+        return
+
     # Get the starting font size
     if font_size is None:
         font_size = get_font_size(layer)
-    ref = get_textbox_width(layer) + 1
 
-    # Continue to reduce the size until within the bounding box
-    while get_width_no_effects(layer) > ref:
-        font_size -= step
-        set_text_size_and_leading(layer, font_size, font_size)
+    # Reduce the size until within the bounding box
+    fit_text_size(
+        font_size=font_size,
+        current=current,
+        limit=ref,
+        apply=lambda size: set_text_size_and_leading(layer, size, size),
+        measure=lambda: get_width_no_effects(layer),
+        tolerance=step)
 
 
 def scale_text_layers_to_height(
@@ -772,7 +880,7 @@ def scale_text_layers_to_height(
         text_layers: List of TextLayers to check.
         ref_height: Height to fit inside.
         font_size: Starting font size of the text layers, calculated if not provided.
-        step: Points to step down the text layers to fit.
+        step: Precision of the fitted font size, the result is within half a step of the largest size that fits.
     """
     # Check initial fit
     total_layer_height = sum([get_layer_height(layer) for layer in text_layers])
@@ -782,26 +890,18 @@ def scale_text_layers_to_height(
     # Establish font size
     if font_size is None:
         font_size = get_font_size(text_layers[0])
-    half_step = step / 2
-
-    # Compare height of all 3 elements vs total reference height
-    while total_layer_height > ref_height:
-        total_layer_height = 0
-        font_size -= step
-        for i, layer in enumerate(text_layers):
-            set_text_size_and_leading(layer, font_size, font_size)
-            total_layer_height += get_layer_height(layer)
-
-    # Increase by a half step
-    font_size += half_step
-    total_layer_height = 0
-    for i, layer in enumerate(text_layers):
-        set_text_size_and_leading(layer, font_size, font_size)
-        total_layer_height += get_layer_height(layer)
-
-    # If out of bounds, revert half step
-    if total_layer_height > ref_height:
-        font_size -= half_step
-        for i, layer in enumerate(text_layers):
-            set_text_size_and_leading(layer, font_size, font_size)
-    return font_size
+
+    def apply(size: float) -> None:
+        """Apply a font size to every layer."""
+        for layer in text_layers:
+            set_text_size_and_leading(layer, size, size)
+
+    # Fit the combined height of every layer to the reference height
+    return fit_text_size(
+        font_size=font_size,
+        current=total_layer_height,
+        limit=ref_height,
+        apply=apply,
+        measure=lambda: sum([get_layer_height(layer) for layer in text_layers]),
+        tolerance=step / 2,
+        exponent=2)
@@ -2,21 +2,29 @@
 * Card Layout Data
 """
 # Standard Library Imports
+from contextlib import suppress
 from datetime import date, datetime
 from typing import Optional, Match, Union, Type, ForwardRef
 from os import path as osp
 from pathlib import Path
 from functools import cached_property
+from hashlib import md5
 
 # Third Party Imports
 from omnitils.strings import get_line, get_lines, normalize_str, strip_lines
 
 # Local Imports
 from src import CFG, CON, CONSOLE, ENV, PATH
-from src.cards import CardDetails, FrameDetails, get_card_data, parse_card_info, process_card_data
+from src.cards import (
+    CardDetails,
+    FrameDetails,
+    get_card_data,
+    parse_card_info,
+    process_card_data,
+    strip_reminder_text)
 from src.console import msg_error, msg_success
 from src.utils.hexapi import get_watermark_svg, get_watermark_svg_from_set
-from src.utils.scryfall import get_cards_oracle
+from src.utils.scryfall import get_card_scan, get_cards_oracle
 from src.enums.layers import LAYERS
 from src.enums.mtg import (
     CardTextPatterns,
@@ -40,11 +48,16 @@
 """
 
 
-def assign_layout(filename: Path) -> str | ForwardRef('CardLayout'):
+def assign_layout(
+    filename: Path,
+    remove_reminder: Optional[dict[str, bool]] = None
+) -> str | ForwardRef('CardLayout'):
     """Assign layout object to a card.
 
     Args:
         filename (Path): Path to the art file, filename supports optional tags.
+        remove_reminder (Optional[dict[str, bool]]): Whether the template rendering each card class strips
+            reminder text, so it's stripped before parsing text. Otherwise, the template strips it.
 
     Filename Tags:
         | Tag        | Description                                                   |
@@ -75,6 +88,9 @@ def assign_layout(filename: Path) -> str | ForwardRef('CardLayout'):
             # Couldn't instantiate layout object
             CONSOLE.log_exception(e)
             return msg_error(name_failed, reason="Layout generation failed")
+        if remove_reminder and remove_reminder.get(layout.card_class):
+            layout.strip_reminder_text()
+        layout.parse_text()
         if not ENV.TEST_MODE:
             CONSOLE.update(f"{msg_success('FOUND:')} {str(layout)}")
         return layout
@@ -134,6 +150,12 @@ class NormalLayout:
     is_transform: bool = False
     is_mdfc: bool = False
 
+    # Whether reminder text has been stripped from the oracle text
+    is_reminder_stripped: bool = False
+
+    # Parsed text structures which can be computed before the template runs
+    text_properties: tuple[str, ...] = ()
+
     def __init__(self, scryfall: dict, file: dict):
 
         # Establish core properties
@@ -150,6 +172,28 @@ def __str__(self):
                 f"{f' [{self.set}]' if self.set else ''}"
                 f"{f' {{{self.collector_number_raw}}}' if self.collector_number else ''}")
 
+    def parse_text(self) -> None:
+        """Computes any parsed text structures ahead of rendering, e.g. during the data stage."""
+        for name in self.text_properties:
+            # Errors are raised again when the template reads the property
+            with suppress(Exception):
+                getattr(self, name)
+
+    def reset_text(self) -> None:
+        """Discards parsed text structures, must be called after the oracle text is modified."""
+        for name in self.text_properties:
+            self.__dict__.pop(name, None)
+
+    def strip_reminder_text(self) -> None:
+        """Strips reminder text from the oracle text, string or list, discarding parsed text structures."""
+        if self.is_reminder_stripped:
+            return
+        self.oracle_text = strip_reminder_text(self.oracle_text) if isinstance(
+            self.oracle_text, str
+        ) else [strip_reminder_text(n) for n in self.oracle_text]
+        self.is_reminder_stripped = True
+        self.reset_text()
+
     """
     * Core Data
     """
@@ -179,6 +223,16 @@ def scryfall_scan(self) -> str:
         """Scryfall large image scan, if available."""
         return self.card.get('image_uris', {}).get('large', '')
 
+    @cached_property
+    def scryfall_scan_file(self) -> Optional[Path]:
+        """Downloaded Scryfall scan, named uniquely so scans for upcoming cards can be fetched in parallel.
+            Scans are kept until the render queue closes, since layouts of the same card share a scan."""
+        if not self.scryfall_scan:
+            return
+        name = md5(self.scryfall_scan.encode()).hexdigest()
+        path = (PATH.LOGS_SCANS / name).with_suffix('.jpg')
+        return path if path.is_file() else get_card_scan(self.scryfall_scan, path=path)
+
     """
     * Set Data
     """
@@ -866,6 +920,9 @@ class PlaneswalkerLayout(NormalLayout):
     """Planeswalker card layout introduced in Lorwyn block."""
     card_class: str = LayoutType.Planeswalker
 
+    # Parsed text structures
+    text_properties = ('pw_abilities', 'pw_size')
+
     """
     * Text Info
     """
@@ -1079,6 +1136,12 @@ class LevelerLayout(NormalLayout):
     """Leveler card layout, introduced in Rise of the Eldrazi."""
     card_class: str = LayoutType.Leveler
 
+    # Parsed text structures
+    text_properties = (
+        'leveler_match', 'level_up_text',
+        'middle_level', 'middle_power_toughness', 'middle_text',
+        'bottom_level', 'bottom_power_toughness', 'bottom_text')
+
     """
     * Leveler Text
     """
@@ -1128,6 +1191,9 @@ class SagaLayout(NormalLayout):
     """Saga card layout, introduced in Dominaria."""
     card_class: str = LayoutType.Saga
 
+    # Parsed text structures
+    text_properties = ('saga_text', 'saga_description', 'saga_lines')
+
     """
     * Bool Properties
     """
@@ -1180,6 +1246,9 @@ class ClassLayout(NormalLayout):
     """Class card layout, introduced in Adventures in the Forgotten Realms."""
     card_class: str = LayoutType.Class
 
+    # Parsed text structures
+    text_properties = ('class_text', 'class_description', 'class_lines')
+
     """
     * Class Properties
     """
@@ -0,0 +1,441 @@
+"""
+* Render Pipeline
+"""
+# Standard Library Imports
+import json
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from contextlib import suppress
+from functools import cached_property
+from hashlib import sha1
+from multiprocessing import cpu_count
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, TypedDict, Union
+
+# Local Imports
+from src import CFG, CONSOLE, PATH
+from src._loader import TemplateDetails, TemplateSelectedMap
+from src.console import msg_error
+from src.enums.mtg import LayoutType
+from src.layouts import CardLayout, assign_layout, join_dual_card_layouts
+from src.utils.art_cache import ART_CACHE
+from src.utils.documents import DOCUMENT_POOL
+from src.utils.export import OUTPUT_ENCODER
+from src.utils.fonts import get_font_paths
+from src.utils.journal import RenderJournal
+from src.utils.prefetch import get_template_key, prefetch_layouts
+from src.utils.render_index import RenderIndex
+from src.utils.render_times import RenderTimes
+
+"""
+* Types
+"""
+
+"""A card ready to render with its selected template, or a message explaining why it can't be rendered."""
+RenderItem = Union[str, tuple[CardLayout, TemplateDetails]]
+
+
+class RenderOutput(TypedDict):
+    """A successful render waiting for its output image to be written."""
+    output: Path
+    files: list[Path]
+    fingerprint: Optional[str]
+    time: Optional[float]
+
+
+# Scryfall fields which change over time without affecting the rendered card
+SCRYFALL_VOLATILE_KEYS = {
+    'prices', 'purchase_uris', 'related_uris', 'edhrec_rank',
+    'penny_rank', 'legalities', 'games', 'image_status', 'highres_image'
+}
+
+"""
+* Render Queue
+"""
+
+
+class RenderQueue:
+    """Producer/consumer queue which resolves card layouts on worker threads while earlier cards render.
+
+    Notes:
+        - At most `lookahead` art files are resolved ahead of the card being rendered, so the first render
+            starts as soon as its own data is ready rather than after every card has been resolved.
+        - Cards are yielded in file order among those resolved, except that cards which can't be rendered
+            are yielded first, then cards which render with the PSD and card class currently in use. When
+            switching templates, the largest group of resolved cards is taken next, favoring templates whose
+            document is still open, so configs are reloaded and templates reopened as rarely as possible.
+        - When failing fast, the first card of each template group is rendered before any other card,
+            cheapest template first. If that card fails, the rest of its group is skipped.
+        - Split cards are yielded last, since both halves must be resolved before they can be joined.
+
+    Args:
+        files: Art files to render.
+        templates: Template selected for each card class.
+        lookahead: Maximum number of art files resolved ahead of rendering, defaults to the CPU count,
+            or every art file when failing fast.
+        fail_fast: Whether to render one card of each template group first.
+        times: Render time history used to estimate the cost of each template.
+    """
+
+    def __init__(
+        self,
+        files: Iterable[Path],
+        templates: TemplateSelectedMap,
+        lookahead: Optional[int] = None,
+        fail_fast: bool = False,
+        times: Optional[RenderTimes] = None
+    ):
+        files = list(files)
+        self._files = iter(files)
+        self._unsubmitted = len(files)
+        self._templates = templates
+        self._remove_reminder = {
+            card_class: CFG.get_snapshot(t['config']).values['remove_reminder']
+            for card_class, t in templates.items() if t}
+        self._lookahead = max(1, lookahead or (len(files) if fail_fast else cpu_count()))
+        self._fail_fast = fail_fast
+        self._times = times
+        self._pending: list[Future] = []
+        self._sources: dict[Future, Path] = {}
+        self._files_yielded: list[Path] = []
+        self._split: list[CardLayout] = []
+        self._current: Optional[tuple[str, str]] = None
+        self._prefetched: dict[int, Future] = {}
+        self._probe: bool = False
+        self._seen: set[tuple[str, str]] = set()
+        self._failed: set[tuple[str, str]] = set()
+
+        # Map font files for text measurement while the first cards resolve
+        self.prefetch_pool.submit(get_font_paths)
+
+    """
+    * Worker Pools
+    """
+
+    @property
+    def current(self) -> Optional[tuple[str, str]]:
+        """Optional[tuple[str, str]]: PSD path and card class of the last card yielded."""
+        return self._current
+
+    @property
+    def files(self) -> list[Path]:
+        """list[Path]: Art files of the last item yielded, including cards which couldn't be resolved."""
+        return self._files_yielded
+
+    @property
+    def probe(self) -> bool:
+        """bool: Whether the last card yielded is the first card of its template group."""
+        return self._probe
+
+    @cached_property
+    def pool(self) -> ThreadPoolExecutor:
+        """ThreadPoolExecutor: Workers which resolve card layouts."""
+        return ThreadPoolExecutor(max_workers=min(self._lookahead, cpu_count()), thread_name_prefix='resolve')
+
+    @cached_property
+    def prefetch_pool(self) -> ThreadPoolExecutor:
+        """ThreadPoolExecutor: Workers which compute layout data for the template currently in use."""
+        return ThreadPoolExecutor(max_workers=cpu_count(), thread_name_prefix='prefetch')
+
+    def close(self) -> None:
+        """Cancel any work which hasn't started yet without waiting on running work, then remove the
+            Scryfall scans downloaded for this queue."""
+        for fut in [*self._pending, *self._prefetched.values()]:
+            fut.cancel()
+        for pool in ('pool', 'prefetch_pool'):
+            if pool in self.__dict__:
+                self.__dict__[pool].shutdown(wait=False, cancel_futures=True)
+        for path in PATH.LOGS_SCANS.glob('*.jpg'):
+            with suppress(OSError):
+                path.unlink(missing_ok=True)
+
+    """
+    * Queue Methods
+    """
+
+    def __iter__(self) -> Iterator[RenderItem]:
+        try:
+            self._fill()
+            while self._pending:
+                fut = self._take()
+                item = fut.result()
+                file = self._sources.pop(fut)
+                self._fill()
+
+                # Split cards are joined once every card is resolved
+                if not isinstance(item, str) and item.card_class == LayoutType.Split:
+                    self._split.append(item)
+                    continue
+                self._files_yielded = [file] if isinstance(item, str) else get_layout_files(item)
+                yield self._check(item)
+
+            # Yield any joined split cards
+            for item in join_dual_card_layouts(self._split):
+                self._files_yielded = [] if isinstance(item, str) else get_layout_files(item)
+                yield self._check(item)
+        finally:
+            self.close()
+
+    def _fill(self) -> None:
+        """Submit art files for resolution until the lookahead window is full."""
+        while len(self._pending) < self._lookahead and (file := next(self._files, None)) is not None:
+            fut = self.pool.submit(resolve_layout, file, self._remove_reminder)
+            self._sources[fut] = file
+            self._pending.append(fut)
+            self._unsubmitted -= 1
+
+    def _take(self) -> Future:
+        """Take the next card to render from the resolved cards, waiting on the earliest card if none are
+        resolved yet."""
+        done = [(i, self._key(fut.result())) for i, fut in enumerate(self._pending) if fut.done()]
+        if not done:
+            return self._pending.pop(0)
+
+        # Report cards which can't be rendered straight away
+        for i, key in done:
+            if key is None or key in self._failed:
+                return self._pending.pop(i)
+
+        # Render the cheapest untested template group first when failing fast
+        if self._fail_fast and (probes := [(i, key) for i, key in done if key not in self._seen]):
+            i, _ = min(probes, key=lambda p: (self._cost(p[1]), p[0]))
+            return self._pending.pop(i)
+
+        # Continue with the current template
+        for i, key in done:
+            if key == self._current:
+                return self._pending.pop(i)
+
+        # Switch to the largest group, favoring templates which are already open
+        groups = Counter(key for _, key in done)
+        i, _ = max(done, key=lambda p: (DOCUMENT_POOL.is_open(p[1][0]), groups[p[1]], -p[0]))
+        return self._pending.pop(i)
+
+    def _key(self, item: Union[str, CardLayout]) -> Optional[tuple[str, str]]:
+        """Returns the PSD path and card class a resolved card renders with, None for failures."""
+        if isinstance(item, str) or not self._templates.get(item.card_class):
+            return None
+        return str(self._templates[item.card_class]['object'].path_psd), item.card_class
+
+    def _cost(self, key: tuple[str, str]) -> float:
+        """Returns the estimated render time of a template group, zero if unknown."""
+        if not self._times:
+            return 0.0
+        return self._times.estimate(self._templates[key[1]]['class_name'], key[1]) or 0.0
+
+    def _check(self, item: Union[str, CardLayout]) -> RenderItem:
+        """Pair a resolved card with its template, or return a failure message if it can't be rendered."""
+        if isinstance(item, str):
+            return item
+        template = self._templates.get(item.card_class)
+        if not template or not template['object'].is_installed:
+            return msg_error(
+                msg=item.display_name,
+                reason=f"Template '{template['name'] if template else 'None'}' with type "
+                       f"'{item.card_class}' is not installed!")
+        if (key := self._key(item)) in self._failed:
+            return msg_error(
+                msg=item.display_name,
+                reason=f"Skipped, the first card rendered with template '{template['name']}' failed!")
+        self._current, self._probe = key, key not in self._seen
+        self._seen.add(key)
+        return item, template
+
+    def report(self, success: bool) -> None:
+        """Report the result of rendering the last card yielded. When failing fast, a failed first card
+        causes the rest of its template group to be skipped.
+
+        Args:
+            success: Whether the card rendered successfully.
+        """
+        if self._fail_fast and self._probe and not success:
+            self._failed.add(self._current)
+
+    def remaining(self) -> list[tuple[Optional[str], Optional[str]]]:
+        """Returns the template class and card class of each card not yet yielded, either is None if the
+        card hasn't been resolved yet."""
+        jobs: list[tuple[Optional[str], Optional[str]]] = []
+        for item in [fut.result() if fut.done() else None for fut in self._pending] + self._split:
+            if isinstance(item, str):
+                continue
+            template = self._templates.get(item.card_class) if item else None
+            jobs.append((template['class_name'], item.card_class) if template else (None, None))
+        return jobs + [(None, None)] * self._unsubmitted
+
+    """
+    * Prefetching
+    """
+
+    def ready(self, card_class: str) -> list[CardLayout]:
+        """Returns resolved cards waiting in the lookahead window which use a given card class.
+
+        Args:
+            card_class: Card class to look for.
+        """
+        return [
+            fut.result() for fut in self._pending
+            if fut.done() and not isinstance(fut.result(), str)
+            and fut.result().card_class == card_class]
+
+    def prefetch(self, card: CardLayout, template: type) -> None:
+        """Compute layout data the template is known to read for a card, and any resolved cards waiting
+            with the same card class. Config and constants must already be loaded for this template.
+
+        Args:
+            card: Card about to be rendered.
+            template: Template class which renders the card.
+        """
+        cards = [c for c in [card, *self.ready(card.card_class)] if id(c) not in self._prefetched]
+        names = ['scryfall_scan_file'] if CFG.import_scryfall_scan else []
+        for c, fut in zip(cards, prefetch_layouts(self.prefetch_pool, cards, template, names)):
+            self._prefetched[id(c)] = fut
+
+        # Pre-size art for cards rendered with this template, once a render has recorded its art size
+        ART_CACHE.prepare_ahead([f for c in cards for f in get_layout_files(c)], get_template_key(template))
+
+    def settle(self) -> None:
+        """Cancel prefetching which hasn't started and wait on prefetching already running. Call before
+            loading a different template's config, since prefetched layout data depends on the config loaded
+            when it was computed. Cancelled cards are prefetched again when their template is next used."""
+        running = [fut for fut in self._prefetched.values() if not fut.cancel()]
+        self._prefetched = {k: fut for k, fut in self._prefetched.items() if not fut.cancelled()}
+        wait(running)
+
+    def wait(self, card: CardLayout) -> None:
+        """Wait for any data being prefetched for a card to finish.
+
+        Args:
+            card: Card about to be rendered.
+        """
+        if fut := self._prefetched.pop(id(card), None):
+            fut.result()
+
+
+"""
+* Output Recorder
+"""
+
+
+class OutputRecorder:
+    """Records successful renders in the journal and render index once their output image is written,
+    since an output encoded in the background can still fail, and must never be treated as rendered
+    before then.
+
+    Args:
+        index: Render index to record outputs in.
+        journal: Journal to record the result of each job in, if any.
+    """
+
+    def __init__(self, index: RenderIndex, journal: Optional[RenderJournal] = None):
+        self._index = index
+        self._journal = journal
+        self._pending: list[tuple[Future, RenderOutput]] = []
+
+    def add(
+        self,
+        output: Path,
+        files: list[Path],
+        fingerprint: Optional[str] = None,
+        time: Optional[float] = None
+    ) -> None:
+        """Record a successful render, straight away unless its output image is still encoding.
+
+        Args:
+            output: Path to the output image.
+            files: Art files which were rendered.
+            fingerprint: Fingerprint of the render, if it can be indexed.
+            time: Seconds the render took.
+        """
+        job = RenderOutput(output=output, files=files, fingerprint=fingerprint, time=time)
+        if future := OUTPUT_ENCODER.get_future(output):
+            self._pending.append((future, job))
+        else:
+            self._record(job, success=True)
+        self.flush()
+
+    def flush(self, wait: bool = False) -> None:
+        """Record renders whose output image has finished encoding.
+
+        Args:
+            wait: Whether to wait for every output image still encoding.
+        """
+        done = [(f, job) for f, job in self._pending if wait or f.done()]
+        self._pending = [p for p in self._pending if p not in done]
+        for future, job in done:
+            self._record(job, success=future.result() is not None)
+
+    def _record(self, job: RenderOutput, success: bool) -> None:
+        """Record the result of a render in the journal, and index its output if it was written."""
+        if self._journal:
+            self._journal.finish(
+                files=job['files'],
+                success=success,
+                output=job['output'] if success else None,
+                time=job['time'],
+                error=None if success else 'Output image failed to encode!')
+        if success and job['fingerprint']:
+            self._index.record(job['fingerprint'], job['output'], job['files'])
+
+
+"""
+* Pipeline Stages
+"""
+
+
+def get_layout_files(card: CardLayout) -> list[Path]:
+    """Returns every art file rendered by a card, split cards are rendered from two art files.
+
+    Args:
+        card: Layout object representing the card.
+
+    Returns:
+        List of art file paths.
+    """
+    return [*card.art_file] if isinstance(card.art_file, list) else [card.art_file]
+
+
+def get_render_fingerprint(
+    card: CardLayout,
+    template: TemplateDetails,
+    config_hash: str,
+    index: RenderIndex
+) -> str:
+    """Returns a fingerprint of every input which determines how a card renders. Config and constants
+        must already be loaded for this template.
+
+    Args:
+        card: Layout object representing the card.
+        template: Details of the template the card renders with.
+        config_hash: Digest of the settings the card is rendered with.
+        index: Render index used to cache art file digests.
+
+    Returns:
+        Hexadecimal digest string.
+    """
+    files = get_layout_files(card)
+    data = {
+        'art': [index.get_digest(f) for f in files],
+        'names': [f.name for f in files],
+        'scryfall': {k: v for k, v in card.scryfall.items() if k not in SCRYFALL_VOLATILE_KEYS},
+        'template': template['name'],
+        'version': template['object'].version,
+        'class': template['class_name'],
+        'config': config_hash}
+    return sha1(json.dumps(data, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def resolve_layout(file: Path, remove_reminder: Optional[dict[str, bool]] = None) -> Union[str, CardLayout]:
+    """Resolve the layout for an art file, ensuring an unexpected error only fails that card.
+
+    Args:
+        file: Art file to resolve.
+        remove_reminder: Whether the template rendering each card class strips reminder text.
+
+    Returns:
+        Layout object for this card, or a failure message.
+    """
+    try:
+        return assign_layout(file, remove_reminder)
+    except Exception as e:
+        CONSOLE.log_exception(e)
+        return msg_error(file.name, reason='Layout generation failed')
@@ -3,11 +3,12 @@
 """
 # Standard Library Imports
 import os.path as osp
-from contextlib import suppress
+from contextlib import nullcontext, suppress
 from functools import cached_property
 from pathlib import Path
 from threading import Event
 from typing import Optional, Callable, Any, Union, Iterable
+from uuid import uuid4
 
 # Third Party Imports
 from pathvalidate import sanitize_filename
@@ -25,8 +26,6 @@
 
 # Local Imports
 from src import APP, CON, CONSOLE, CFG, ENV, PATH
-from src.utils.scryfall import get_card_scan
-from src.cards import strip_reminder_text
 from src.console import msg_error, msg_warn
 from src.enums.mtg import MagicIcons
 from src.enums.adobe import Dimensions
@@ -49,6 +48,7 @@
     FormattedTextArea,
     FormattedTextField,
     FormattedTextLayer)
+from src.utils.action_batch import ActionBatch
 from src.utils.adobe import (
     get_photoshop_error_message,
     LayerContainer,
@@ -56,6 +56,12 @@
     PS_EXCEPTIONS,
     ReferenceLayer,
     try_photoshop)
+from src.utils.art_cache import ART_CACHE, ArtFrame, ArtTarget
+from src.utils.documents import DOCUMENT_POOL
+from src.utils.export import OUTPUT_ENCODER
+from src.utils.prefetch import get_template_key
+from src.utils.symbol_cache import SYMBOL_CACHE, get_symbol_key
+from src.utils.tracing import TRACER
 
 """
 * Template Classes
@@ -254,12 +260,33 @@ def RGB_WHITE(self) -> SolidColor:
     @cached_property
     def save_mode(self) -> Callable:
         """Callable: Function called to save the rendered image."""
-        if CFG.output_file_type == OutputFileType.PNG:
-            return psd.save_document_png
         if CFG.output_file_type == OutputFileType.PSD:
             return psd.save_document_psd
+        if CFG.fast_export:
+            return self.save_fast_export
+        if CFG.output_file_type == OutputFileType.PNG:
+            return psd.save_document_png
         return psd.save_document_jpeg
 
+    def save_fast_export(self, path: Path, docref: Optional[Document] = None) -> None:
+        """Save an uncompressed intermediate image, then encode the final image in the background.
+
+        Args:
+            path: Path to save the output image.
+            docref: Open Photoshop document. Use active if not provided.
+        """
+        intermediate = (PATH.LOGS_EXPORT / uuid4().hex).with_suffix('.tif')
+        psd.save_document_tiff(path=intermediate, docref=docref)
+        OUTPUT_ENCODER.submit(
+            source=intermediate,
+            target=path,
+            quality=max(1, min(CFG.export_quality, 100)),
+            dpi=CFG.export_dpi or None,
+            metadata={
+                'title': self.layout.name_raw,
+                'artist': self.layout.artist,
+                'software': 'Proxyshop'})
+
     @cached_property
     def output_directory(self) -> Path:
         """PathL Directory to save the rendered image."""
@@ -738,13 +765,10 @@ def process_layout_data(self) -> None:
                 self.layout.flavor_text, str
             ) else ['' for _ in self.layout.flavor_text]
 
-        # Strip reminder text, string or list
-        if CFG.remove_reminder:
-            self.layout.oracle_text = strip_reminder_text(
-                self.layout.oracle_text
-            ) if isinstance(
-                self.layout.oracle_text, str
-            ) else [strip_reminder_text(n) for n in self.layout.oracle_text]
+        # Strip reminder text if it wasn't stripped in the data stage, then parse text again
+        if CFG.remove_reminder and not self.layout.is_reminder_stripped:
+            self.layout.strip_reminder_text()
+            self.layout.parse_text()
 
     """
     * Loading Artwork
@@ -787,6 +811,7 @@ def load_artwork(
             art_file = PATH.SRC_IMG / "test-fa.jpg"
 
         # Import art file
+        is_filled = False
         if self.art_action:
             # Use action pipeline
             art_layer = psd.paste_file(
@@ -796,10 +821,30 @@ def load_artwork(
                 action_args=self.art_action_args,
                 docref=self.docref)
         else:
-            # Use traditional pipeline
+            # Use traditional pipeline, placing art pre-sized to fill its reference
+            dims = art_reference if isinstance(art_reference, dict) else psd.get_layer_dimensions(art_reference)
+            target = ArtTarget(
+                width=round(dims['width']),
+                height=round(dims['height']),
+                dpi=round(self.docref.resolution))
+
+            # Extend the art to fill the document ahead of import if needed
+            if self.is_content_aware_enabled and CFG.edge_fill:
+                target['frame'] = ArtFrame(
+                    width=round(self.docref.width),
+                    height=round(self.docref.height),
+                    left=round(dims['left']),
+                    top=round(dims['top']),
+                    trim=psd.get_fill_edges_contract(CFG.feathered_fill))
+            art_path = ART_CACHE.get(file=Path(art_file), target=target, key=get_template_key(type(self)))
+            if 'frame' in target and art_path != Path(art_file):
+                # Extended art is the size of the document
+                art_reference = psd.get_dimensions_from_bounds(
+                    (0, 0, target['frame']['width'], target['frame']['height']))
+                is_filled = True
             art_layer = psd.import_art(
                 layer=art_layer,
-                path=art_file,
+                path=art_path,
                 docref=self.docref)
         self.active_layer = art_layer
 
@@ -809,7 +854,7 @@ def load_artwork(
             ref=art_reference)
 
         # Perform content aware fill if needed
-        if self.is_content_aware_enabled:
+        if self.is_content_aware_enabled and not is_filled:
 
             # Perform a generative fill
             if CFG.generative_fill:
@@ -841,19 +886,17 @@ def paste_scryfall_scan(self, rotate: bool = False, visible: bool = True) -> Opt
         Returns:
             ArtLayer if Scryfall scan was imported, otherwise None.
         """
-        # Try to grab the scan from Scryfall
-        if not self.layout.scryfall_scan:
-            return
-        scryfall_scan = get_card_scan(self.layout.scryfall_scan)
+        # Try to grab the scan from Scryfall, usually downloaded ahead of rendering
+        scryfall_scan = self.layout.scryfall_scan_file
         if not scryfall_scan:
             return
 
         # Paste the scan into a new layer
-        if layer := psd.import_art_into_new_layer(
-                path=scryfall_scan,
-                name="Scryfall Reference",
-                docref=self.docref
-        ):
+        layer = psd.import_art_into_new_layer(
+            path=scryfall_scan,
+            name="Scryfall Reference",
+            docref=self.docref)
+        if layer:
             # Rotate the layer if necessary
             if rotate:
                 layer.rotate(90)
@@ -990,19 +1033,30 @@ def load_expansion_symbol(self) -> None:
         # Try to import the expansion symbol
         try:
 
-            # Import and place the symbol
-            svg = psd.import_svg(
-                path=str(self.layout.symbol_svg),
+            def create_symbol() -> ArtLayer:
+                """Import, place, and frame the symbol."""
+                layer = psd.import_svg(
+                    path=str(self.layout.symbol_svg),
+                    ref=self.expansion_reference,
+                    placement=ElementPlacement.PlaceBefore,
+                    docref=self.docref)
+                psd.frame_layer_by_height(
+                    layer=layer,
+                    ref=self.expansion_reference,
+                    alignments=self.expansion_symbol_alignments)
+                return layer
+
+            # Reuse a symbol prepared for an earlier card if possible
+            svg = SYMBOL_CACHE.get_layer(
+                key=get_symbol_key(
+                    'symbol', self.layout.symbol_svg,
+                    self.expansion_reference.bounds,
+                    self.expansion_symbol_alignments),
+                create=create_symbol,
                 ref=self.expansion_reference,
                 placement=ElementPlacement.PlaceBefore,
                 docref=self.docref)
 
-            # Frame the symbol
-            psd.frame_layer_by_height(
-                layer=svg,
-                ref=self.expansion_reference,
-                alignments=self.expansion_symbol_alignments)
-
             # Rename and reset property
             svg.name = 'Expansion Symbol'
             self.expansion_symbol_layer = svg
@@ -1071,23 +1125,39 @@ def create_watermark(self) -> None:
 
         # Get watermark custom settings if available
         wm_details = CON.watermarks.get(self.layout.watermark, {})
+        scale = wm_details.get('scale', 80)
+        opacity = wm_details.get('opacity', CFG.watermark_opacity)
+
+        def create_watermark() -> ArtLayer:
+            """Import and frame the watermark, then apply opacity, blending, and effects."""
+            layer = psd.import_svg(
+                path=self.layout.watermark_svg,
+                ref=self.text_group,
+                placement=ElementPlacement.PlaceAfter,
+                docref=self.docref)
+            psd.frame_layer(
+                layer=layer,
+                ref=self.textbox_reference.dims,
+                smallest=True,
+                scale=scale)
+            with ActionBatch() as batch:
+                batch.set_layer_properties(
+                    layer=layer,
+                    opacity=opacity,
+                    blend_mode=self.watermark_blend_mode)
+                psd.apply_fx(layer, self.watermark_fx, batch)
+            return layer
 
-        # Import and frame the watermark
-        wm = psd.import_svg(
-            path=self.layout.watermark_svg,
+        # Reuse a watermark prepared for an earlier card if possible
+        SYMBOL_CACHE.get_layer(
+            key=get_symbol_key(
+                'watermark', self.layout.watermark_svg,
+                self.textbox_reference.dims, scale, opacity,
+                self.watermark_blend_mode, self.watermark_fx),
+            create=create_watermark,
             ref=self.text_group,
             placement=ElementPlacement.PlaceAfter,
             docref=self.docref)
-        psd.frame_layer(
-            layer=wm,
-            ref=self.textbox_reference.dims,
-            smallest=True,
-            scale=wm_details.get('scale', 80))
-
-        # Apply opacity, blending, and effects
-        wm.opacity = wm_details.get('opacity', CFG.watermark_opacity)
-        wm.blendMode = self.watermark_blend_mode
-        psd.apply_fx(wm, self.watermark_fx)
 
     """
     * Basic Land Watermark
@@ -1123,19 +1193,30 @@ def basic_watermark_fx(self) -> list[LayerEffects]:
     def create_basic_watermark(self) -> None:
         """Builds a basic land watermark."""
 
-        # Generate the watermark
-        wm = psd.import_svg(
-            path=self.layout.watermark_basic,
+        def create_watermark() -> ArtLayer:
+            """Import and frame the watermark, then add effects."""
+            layer = psd.import_svg(
+                path=self.layout.watermark_basic,
+                ref=self.text_group,
+                placement=ElementPlacement.PlaceAfter,
+                docref=self.docref)
+            psd.frame_layer_by_height(
+                layer=layer,
+                ref=self.textbox_reference.dims,
+                scale=75)
+            with ActionBatch() as batch:
+                psd.apply_fx(layer, self.basic_watermark_fx, batch)
+            return layer
+
+        # Reuse a watermark prepared for an earlier card if possible
+        wm = SYMBOL_CACHE.get_layer(
+            key=get_symbol_key(
+                'basic watermark', self.layout.watermark_basic,
+                self.textbox_reference.dims, self.basic_watermark_fx),
+            create=create_watermark,
             ref=self.text_group,
             placement=ElementPlacement.PlaceAfter,
             docref=self.docref)
-        psd.frame_layer_by_height(
-            layer=wm,
-            ref=self.textbox_reference.dims,
-            scale=75)
-
-        # Add effects
-        psd.apply_fx(wm, self.basic_watermark_fx)
 
         # Add snow effects
         if self.is_snow:
@@ -1247,6 +1328,7 @@ def run_tasks(
             warning: bool = False,
             args: Union[Iterable[Any], None] = None,
             kwargs: Optional[dict] = None,
+            stage: Optional[str] = None
     ) -> bool:
         """Run a list of functions, checking for thread cancellation and exceptions on each.
 
@@ -1256,6 +1338,8 @@ def run_tasks(
             warning: Warn the user if True, otherwise raise error.
             args: Optional arguments to pass to the func. Empty tuple if not provided.
             kwargs: Optional keyword arguments to pass to the func. Empty dict if not provided.
+            stage: Name of the render stage these functions make up, used to time the stage and
+                each function within it.
 
         Returns:
             True if tasks completed, False if exception occurs or thread is cancelled.
@@ -1266,22 +1350,24 @@ def run_tasks(
         kwargs = kwargs or {}
 
         # Execute each function
-        for func in funcs:
-            # Check if thread was cancelled
-            if self.event.is_set():
-                return False
-            try:
-                # Run the task
-                func(*args, **kwargs)
-            except Exception as e:
-                # Raise error or warning
-                if not warning:
-                    self.raise_error(message=message, error=e)
+        with TRACER.span(stage) if stage else nullcontext():
+            for func in funcs:
+                # Check if thread was cancelled
+                if self.event.is_set():
+                    return False
+                try:
+                    # Run the task
+                    with TRACER.span(getattr(func, '__name__', repr(func)), stage) if stage else nullcontext():
+                        func(*args, **kwargs)
+                except Exception as e:
+                    # Raise error or warning
+                    if not warning:
+                        self.raise_error(message=message, error=e)
+                        return False
+                    self.raise_warning(message=message, error=e)
+                # Once again, check if thread was cancelled
+                if self.event.is_set():
                     return False
-                self.raise_warning(message=message, error=e)
-            # Once again, check if thread was cancelled
-            if self.event.is_set():
-                return False
         return True
 
     def raise_error(self, message: str, error: Optional[Exception] = None) -> None:
@@ -1542,29 +1628,33 @@ def execute(self) -> bool:
         # Preliminary Photoshop check
         if not self.run_tasks(
             funcs=[self.check_photoshop],
-            message="Unable to reach Photoshop!"
+            message="Unable to reach Photoshop!",
+            stage='check_photoshop'
         ):
             return False
 
         # Pre-process layout data
         if not self.run_tasks(
             funcs=self.pre_render_methods,
-            message="Pre-processing layout data failed!"
+            message="Pre-processing layout data failed!",
+            stage='pre_render'
         ):
             return False
 
-        # Load in the PSD template
+        # Load in the PSD template, reusing it if it's still open
         if not self.run_tasks(
-            funcs=[self.app.load],
+            funcs=[DOCUMENT_POOL.open],
             message="PSD template failed to load!",
-            args=[str(self.layout.template_file)]
+            args=[str(self.layout.template_file)],
+            stage='load_template'
         ):
             return False
 
         # Load in artwork and frame it
         if not self.run_tasks(
             funcs=[self.load_artwork],
-            message="Unable to load artwork!"
+            message="Unable to load artwork!",
+            stage='load_artwork'
         ):
             return False
 
@@ -1573,34 +1663,39 @@ def execute(self) -> bool:
             self.run_tasks(
                 funcs=[self.paste_scryfall_scan],
                 message="Couldn't import Scryfall scan, continuing without it!",
-                warning=True)
+                warning=True,
+                stage='scryfall_scan')
 
         # Add expansion symbol
         self.run_tasks(
             funcs=[self.load_expansion_symbol],
             message="Unable to generate expansion symbol!",
-            warning=True)
+            warning=True,
+            stage='expansion_symbol')
 
         # Add watermark
         if CFG.enable_basic_watermark and self.is_basic_land:
             # Basic land watermark
             if not self.run_tasks(
                 funcs=[self.create_basic_watermark],
-                message="Unable to generate basic land watermark!"
+                message="Unable to generate basic land watermark!",
+                stage='watermark'
             ):
                 return False
         elif CFG.watermark_mode is not WatermarkMode.Disabled:
             # Normal watermark
             if not self.run_tasks(
                 funcs=[self.create_watermark],
-                message="Unable to generate watermark!"
+                message="Unable to generate watermark!",
+                stage='watermark'
             ):
                 return False
 
         # Enable layers to build our frame
         if not self.run_tasks(
             funcs=self.frame_layer_methods,
-            message="Enabling layers failed!"
+            message="Enabling layers failed!",
+            stage='frame_layers'
         ):
             return False
 
@@ -1611,14 +1706,16 @@ def execute(self) -> bool:
                 self.format_text_layers,
                 *self.post_text_methods
             ],
-            message="Formatting text layers failed!"
+            message="Formatting text layers failed!",
+            stage='text_layers'
         ):
             return False
 
         # Specific hooks
         if not self.run_tasks(
             funcs=self.hooks,
-            message="Encountered an error during triggered hooks step!"
+            message="Encountered an error during triggered hooks step!",
+            stage='hooks'
         ):
             return False
 
@@ -1630,14 +1727,16 @@ def execute(self) -> bool:
         if not self.run_tasks(
             funcs=[self.save_mode],
             message="Error during file save process!",
-            kwargs={'path': self.output_file_name, 'docref': self.docref}
+            kwargs={'path': self.output_file_name, 'docref': self.docref},
+            stage='save'
         ):
             return False
 
         # Post save methods
         if not self.run_tasks(
             funcs=self.post_save_methods,
-            message="Image saved, but an error was encountered during the post-save step!"
+            message="Image saved, but an error was encountered during the post-save step!",
+            stage='post_save'
         ):
             return False
 
@@ -1721,25 +1820,20 @@ def rules_text_and_pt_layers(self) -> None:
     def enable_frame_layers(self) -> None:
         """Enable layers which make-up the frame of the card."""
 
-        # Twins
-        if self.twins_layer:
-            self.twins_layer.visible = True
-
-        # PT Box
-        if self.is_creature and self.pt_layer:
-            self.pt_layer.visible = True
-
-        # Pinlines
-        if self.pinlines_layer:
-            self.pinlines_layer.visible = True
-
-        # Color Indicator
-        if self.is_type_shifted and self.color_indicator_layer:
-            self.color_indicator_layer.visible = True
-
-        # Background
-        if self.background_layer:
-            self.background_layer.visible = True
+        # Show each frame layer with a single action
+        with ActionBatch() as batch:
+            batch.set_visible([
+                # Twins
+                self.twins_layer,
+                # PT Box
+                self.pt_layer if self.is_creature else None,
+                # Pinlines
+                self.pinlines_layer,
+                # Color Indicator
+                self.color_indicator_layer if self.is_type_shifted else None,
+                # Background
+                self.background_layer
+            ])
 
         # Legendary crown
         if self.is_legendary and self.crown_layer:
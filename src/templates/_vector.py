@@ -20,6 +20,7 @@
 import src.helpers as psd
 from src.schema.colors import crown_color_map, indicator_color_map, pinlines_color_map
 from src.templates import NormalTemplate
+from src.utils.action_batch import ActionBatch
 from src.utils.adobe import LayerObject, LayerObjectTypes
 
 """
@@ -345,46 +346,48 @@ def enable_frame_layers(self) -> None:
 
     def enable_shape_layers(self) -> None:
         """Enable required vector shape layers provided by `enabled_shapes`."""
-        def _enable_shape(_shapes: Union[LayerObjectTypes, list[LayerObjectTypes], None]) -> None:
-            for x in _shapes:
-                if not x:
-                    continue
-                if isinstance(x, list):
-                    _enable_shape(x)
-                else:
-                    x.visible = True
-        _enable_shape(self.enabled_shapes)
+        def _get_shapes(_shapes: Union[LayerObjectTypes, list[LayerObjectTypes], None]) -> list[LayerObjectTypes]:
+            return [
+                n for x in _shapes if x
+                for n in (_get_shapes(x) if isinstance(x, list) else [x])]
+
+        # Show every shape with a single action
+        with ActionBatch() as batch:
+            batch.set_visible(_get_shapes(self.enabled_shapes))
 
     def enable_layer_masks(self) -> None:
         """Enable or copy required layer masks provided by `enabled_masks`."""
 
         # For each mask enabled, apply it based on given notation
-        for mask in [m for m in self.enabled_masks if m]:
-
-            # Dict notation, complex mask behavior
-            if isinstance(mask, dict):
-
-                # Copy to a layer?
-                if layer := mask.get('layer'):
-                    # Copy normal or vector mask to layer
-                    func = psd.copy_vector_mask if mask.get('vector') else psd.copy_layer_mask
-                    func(mask.get('mask'), layer)
-                else:
-                    # Enable normal or vector mask
-                    layer = mask.get('mask')
-                    func = psd.enable_vector_mask if mask.get('vector') else psd.enable_mask
-                    func(layer)
-
-                # Apply extra functions
-                [f(layer) for f in mask.get('funcs', [])]
-
-            # List notation, copy from one layer to another
-            elif isinstance(mask, list):
-                psd.copy_layer_mask(*mask)
-
-            # Single layer to enable mask on
-            elif isinstance(mask, LayerObject):
-                psd.enable_mask(mask)
+        with ActionBatch() as batch:
+            for mask in [m for m in self.enabled_masks if m]:
+
+                # Dict notation, complex mask behavior
+                if isinstance(mask, dict):
+
+                    # Copy to a layer?
+                    if layer := mask.get('layer'):
+                        # Copy normal or vector mask to layer
+                        func = psd.copy_vector_mask if mask.get('vector') else psd.copy_layer_mask
+                        func(mask.get('mask'), layer, batch)
+                    else:
+                        # Enable normal or vector mask
+                        layer = mask.get('mask')
+                        func = psd.enable_vector_mask if mask.get('vector') else psd.enable_mask
+                        func(layer, batch)
+
+                    # Apply extra functions once the mask is in place
+                    if funcs := mask.get('funcs', []):
+                        batch.flush()
+                        [f(layer) for f in funcs]
+
+                # List notation, copy from one layer to another
+                elif isinstance(mask, list):
+                    psd.copy_layer_mask(*mask, batch=batch)
+
+                # Single layer to enable mask on
+                elif isinstance(mask, LayerObject):
+                    psd.enable_mask(mask, batch)
 
     def enable_crown(self) -> None:
         """Enable the Legendary crown, only called if card is Legendary."""
@@ -22,7 +22,9 @@
 from src.schema.colors import GradientColor
 from src.templates import BaseTemplate
 from src.text_layers import FormattedTextField, FormattedTextArea, ScaledTextField
+from src.utils.action_batch import ActionBatch
 from src.utils.adobe import ReferenceLayer
+from src.utils.symbol_cache import SYMBOL_CACHE, get_symbol_key
 
 """
 * Template Classes
@@ -384,23 +386,39 @@ def create_watermark(self) -> None:
 
             # Get watermark custom settings if available
             wm_details = CON.watermarks.get(watermark, {})
-
-            # Import and frame the watermark
-            wm = psd.import_svg(
-                path=self.layout.watermark_svg[i],
+            scale = wm_details.get('scale', 80)
+            opacity = wm_details.get('opacity', CFG.watermark_opacity)
+
+            def create_watermark() -> ArtLayer:
+                """Import and frame the watermark, then apply opacity, blending, and effects."""
+                layer = psd.import_svg(
+                    path=self.layout.watermark_svg[i],
+                    ref=self.textbox_reference[i],
+                    placement=ElementPlacement.PlaceAfter,
+                    docref=self.docref)
+                psd.frame_layer(
+                    layer=layer,
+                    ref=self.textbox_reference[i],
+                    smallest=True,
+                    scale=scale)
+                with ActionBatch() as batch:
+                    batch.set_layer_properties(
+                        layer=layer,
+                        opacity=opacity,
+                        blend_mode=BlendMode.ColorBurn)
+                    psd.apply_fx(layer, self.watermark_fx[i], batch)
+                return layer
+
+            # Reuse a watermark prepared for an earlier card if possible
+            SYMBOL_CACHE.get_layer(
+                key=get_symbol_key(
+                    'watermark', self.layout.watermark_svg[i],
+                    self.textbox_reference[i].bounds, scale, opacity,
+                    BlendMode.ColorBurn, self.watermark_fx[i]),
+                create=create_watermark,
                 ref=self.textbox_reference[i],
                 placement=ElementPlacement.PlaceAfter,
                 docref=self.docref)
-            psd.frame_layer(
-                layer=wm,
-                ref=self.textbox_reference[i],
-                smallest=True,
-                scale=wm_details.get('scale', 80))
-
-            # Apply opacity, blending, and effects
-            wm.opacity = wm_details.get('opacity', CFG.watermark_opacity)
-            wm.blendMode = BlendMode.ColorBurn
-            psd.apply_fx(wm, self.watermark_fx[i])
 
     """
     * Loading Files
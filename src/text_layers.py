@@ -42,6 +42,7 @@
     scale_text_right_overlap)
 from src.schema.colors import ColorObject
 from src.utils.adobe import ReferenceLayer
+from src.utils.text_metrics import TextLayoutEstimator
 
 # QOL Definitions
 sID = APP.stringIDToTypeID
@@ -722,6 +723,59 @@ def fix_overflow_height(self) -> bool:
             return fix_overflow_height
         return False
 
+    """
+    * Text Layout Estimation
+    """
+
+    @cached_property
+    def text_estimator(self) -> Optional[TextLayoutEstimator]:
+        """Optional[TextLayoutEstimator]: Estimates the formatted text's layout from font metrics, None
+        if any of its fonts can't be found."""
+        fonts = [self.font] * len(self.input)
+        if self.rules_text and self.bold_rules_text:
+            fonts[self.rules_start:self.rules_end] = [self.font_bold] * (self.rules_end - self.rules_start)
+        for start, end in self.italics_indices:
+            fonts[start:end] = [self.font_italic] * (end - start)
+        if self.is_flavor_text and self.flavor_color:
+            fonts[self.flavor_start:self.flavor_end] = [self.font_italic] * (self.flavor_end - self.flavor_start)
+        for index, colors in self.symbol_indices:
+            fonts[index:index + len(colors)] = [self.font_mana] * len(colors)
+
+        # Paragraph spacing and modal indents match the formatting applied in `format_text`
+        paragraphs = self.input.split('\r')
+        space_before: dict[int, float] = {}
+        if self.is_modal or self.is_flavor_text:
+            space_before = {n: self.line_break_lead for n in range(1, len(paragraphs))}
+        if self.is_flavor_text and self.rules_text:
+            space_before[self.input[:self.flavor_start].count('\r')] = self.flavor_text_lead
+        if self.is_flavor_text and self.is_quote_text:
+            for n in range(self.input[:self.quote_index + 1].count('\r'), len(paragraphs)):
+                space_before[n] = 0
+        indents = {n: CON.modal_indent for n, p in enumerate(paragraphs) if p.startswith('\u2022')}
+
+        estimator = TextLayoutEstimator(self.input, fonts, space_before, indents)
+        return estimator if estimator.is_measurable else None
+
+    @cached_property
+    def text_resolution(self) -> float:
+        """float: Resolution of the document, used to convert estimated text sizes to pixels."""
+        return self.docref.resolution
+
+    def estimate_height(self, font_size: float) -> float:
+        """Estimate the rendered height of the formatted text at a font size, wrapped within the
+        reference width.
+
+        Args:
+            font_size: Font size in points.
+
+        Returns:
+            Estimated height in pixels.
+        """
+        return self.text_estimator.get_height(
+            size=font_size,
+            width=self.reference_dims['width'],
+            dpi=self.text_resolution)
+
     """
     * Methods
     """
@@ -765,7 +819,8 @@ def scale_to_fit(self, font_size: Optional[float] = None) -> None:
             if self.scale_height:
                 font_size = scale_text_to_height(
                     layer=self.layer,
-                    height=self.reference_dims['height'])
+                    height=self.reference_dims['height'],
+                    model=self.estimate_height if self.text_estimator else None)
 
             # Resize the text until it fits the reference horizontally
             if self.scale_width:
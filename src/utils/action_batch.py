@@ -0,0 +1,374 @@
+"""
+* Utils: Batched Action Execution
+"""
+# Standard Library Imports
+import json
+from typing import Any, Optional, Union
+from urllib.parse import unquote
+
+# Third Party Imports
+from photoshop.api import ActionDescriptor, ActionList, ActionReference, BlendMode, DialogModes
+
+# Local Imports
+from src import APP
+from src.utils.adobe import LayerObjectTypes, PS_EXCEPTIONS
+from src.utils.layer_index import LAYER_INDEX
+
+# QOL Definitions
+sID = APP.stringIDToTypeID
+
+"""
+* Types & Definitions
+"""
+
+# Header line returned by a successful batch script
+ACTION_BATCH_HEADER = 'action-batch'
+
+# Runs each batched action in its own try/catch, returning one line per action which is empty if
+# the action succeeded, otherwise its URI encoded error message
+ACTION_BATCH_SCRIPT = """
+var results = ['%s'];
+function run(action) {
+    try {
+        action();
+        results.push('');
+    } catch (e) {
+        results.push(encodeURIComponent(String(e.message || e) || 'Unknown error'));
+    }
+}
+%s
+results.join('\\n');
+"""
+
+# ExtendScript dialog modes mapped to their Photoshop API enum
+ACTION_BATCH_DIALOGS = {
+    DialogModes.DisplayAllDialogs: 'DialogModes.ALL',
+    DialogModes.DisplayErrorDialogs: 'DialogModes.ERROR',
+    DialogModes.DisplayNoDialogs: 'DialogModes.NO'}
+
+# Action Manager string IDs of each blend mode
+ACTION_BATCH_BLEND_MODES = {
+    BlendMode.ColorBlend: 'color', BlendMode.ColorBurn: 'colorBurn', BlendMode.ColorDodge: 'colorDodge',
+    BlendMode.Darken: 'darken', BlendMode.DarkerColor: 'darkerColor', BlendMode.Difference: 'difference',
+    BlendMode.Dissolve: 'dissolve', BlendMode.Divide: 'blendDivide', BlendMode.Exclusion: 'exclusion',
+    BlendMode.HardLight: 'hardLight', BlendMode.HardMix: 'hardMix', BlendMode.Hue: 'hue',
+    BlendMode.Lighten: 'lighten', BlendMode.LighterColor: 'lighterColor', BlendMode.LinearBurn: 'linearBurn',
+    BlendMode.LinearDodge: 'linearDodge', BlendMode.LinearLight: 'linearLight',
+    BlendMode.Luminosity: 'luminosity', BlendMode.Multiply: 'multiply', BlendMode.NormalBlend: 'normal',
+    BlendMode.Overlay: 'overlay', BlendMode.PassThrough: 'passThrough', BlendMode.PinLight: 'pinLight',
+    BlendMode.SaturationBlend: 'saturation', BlendMode.Screen: 'screen', BlendMode.SoftLight: 'softLight',
+    BlendMode.Subtract: 'blendSubtraction', BlendMode.VividLight: 'vividLight'}
+
+"""
+* Recorded Action Objects
+"""
+
+
+class RecordedActionObject:
+    """Records the 'put' methods called on an Action Manager object, so it can be built later either
+    inside Photoshop by a script, or as a COM object.
+
+    Notes:
+        - Method names are accepted in either case, e.g. 'putEnumerated' or 'PutEnumerated'.
+        - Arguments can be numbers, booleans, strings, or other recorded objects.
+    """
+    script_class: str = ''
+    com_class: type = object
+
+    def __init__(self):
+        self.calls: list[tuple[str, tuple]] = []
+
+    def __getattr__(self, name: str):
+        method = name[:1].lower() + name[1:]
+        if not method.startswith('put'):
+            raise AttributeError(f"'{type(self).__name__}' only records 'put' methods, not '{name}'")
+
+        def record(*args) -> None:
+            self.calls.append((method, args))
+        return record
+
+    def get_script(self, lines: list[str]) -> str:
+        """Add the lines which build this object to a script.
+
+        Args:
+            lines: Lines of the script being generated, nested objects are added before they're used.
+
+        Returns:
+            Name of the script variable holding this object.
+        """
+        name = f'v{len(lines)}'
+        lines.append(f'var {name} = new {self.script_class}();')
+        for method, args in self.calls:
+            values = [get_script_value(a, lines) for a in args]
+            if method == 'putPath':
+                values[-1] = f'new File({values[-1]})'
+            lines.append(f"{name}.{method}({', '.join(values)});")
+        return name
+
+    def get_object(self) -> Union[ActionDescriptor, ActionReference, ActionList]:
+        """Returns this object built as a COM object."""
+        obj = self.com_class()
+        for method, args in self.calls:
+            getattr(obj, method)(*[a.get_object() if isinstance(a, RecordedActionObject) else a for a in args])
+        return obj
+
+
+class RecordedDescriptor(RecordedActionObject):
+    """Action descriptor recorded for a batch."""
+    script_class = 'ActionDescriptor'
+    com_class = ActionDescriptor
+
+
+class RecordedReference(RecordedActionObject):
+    """Action reference recorded for a batch."""
+    script_class = 'ActionReference'
+    com_class = ActionReference
+
+
+class RecordedList(RecordedActionObject):
+    """Action list recorded for a batch."""
+    script_class = 'ActionList'
+    com_class = ActionList
+
+
+"""
+* Action Batch
+"""
+
+
+class ActionBatch:
+    """Records actions and layer property writes, then runs them inside Photoshop with a single script call.
+
+    Notes:
+        - Every method called on a COM action descriptor is a round trip to Photoshop. Recorded actions
+            are built in Python instead, and sent as one generated script which builds and executes every
+            action inside Photoshop.
+        - Each action runs in its own try/catch, so one failing doesn't stop the others. Results are
+            returned in the order actions were recorded, matching the position `executeAction` returned.
+        - If the script can't be run, e.g. by a backend without ExtendScript, each action is built as
+            a COM descriptor and executed in turn instead.
+        - Layers are referenced by ID, read from the layer index where possible.
+        - Recorded actions are flushed when leaving the batch's context, or discarded if the context
+            raised an error.
+    """
+
+    def __init__(self):
+        self._actions: list[tuple[int, Optional[RecordedDescriptor], DialogModes]] = []
+
+    def __enter__(self) -> 'ActionBatch':
+        return self
+
+    def __exit__(self, exc_type, *_) -> None:
+        # Don't run a partially recorded batch after the context raised an error
+        if exc_type is None:
+            self.flush()
+        else:
+            self.discard()
+
+    @property
+    def count(self) -> int:
+        """int: Number of actions waiting to be flushed."""
+        return len(self._actions)
+
+    """
+    * Recording Actions
+    """
+
+    def executeAction(
+        self, event_id: int,
+        descriptor: Optional[RecordedDescriptor] = None,
+        dialogs: DialogModes = DialogModes.DisplayNoDialogs
+    ) -> int:
+        """Record an action to execute on the next flush, mirrors `PhotoshopHandler.executeAction`.
+
+        Args:
+            event_id: Action descriptor event ID.
+            descriptor: Recorded action descriptor tree to execute.
+            dialogs: DialogMode which governs whether to display dialogs.
+
+        Returns:
+            Position of the action's result in the results returned by `flush`.
+        """
+        self._actions.append((event_id, descriptor, dialogs))
+        return len(self._actions) - 1
+
+    def set_visible(
+        self, layers: Union[LayerObjectTypes, list[Optional[LayerObjectTypes]]],
+        visible: bool = True
+    ) -> Optional[int]:
+        """Record showing or hiding one or more layers with a single action.
+
+        Args:
+            layers: Layer object, or layer objects to show or hide. Empty entries are skipped.
+            visible: Whether to show the layers, otherwise hide them.
+
+        Returns:
+            Position of the action's result, or None if no layers were given.
+        """
+        refs = new_list(self)
+        for layer in [n for n in (layers if isinstance(layers, (list, tuple)) else [layers]) if n]:
+            ref = new_reference(self)
+            ref.putIdentifier(sID('layer'), LAYER_INDEX.get_id(layer))
+            refs.putReference(ref)
+        if not refs.calls:
+            return None
+        desc = new_descriptor(self)
+        desc.putList(sID('target'), refs)
+        return self.executeAction(sID('show' if visible else 'hide'), desc)
+
+    def set_layer_properties(
+        self, layer: LayerObjectTypes,
+        opacity: Optional[float] = None,
+        blend_mode: Optional[BlendMode] = None
+    ) -> Optional[int]:
+        """Record setting the opacity and blend mode of a layer with a single action.
+
+        Args:
+            layer: Layer object to change.
+            opacity: Opacity percent to set, if provided.
+            blend_mode: Blend mode to set, if provided.
+
+        Returns:
+            Position of the action's result, or None if no properties were given.
+        """
+        props = new_descriptor(self)
+        if opacity is not None:
+            props.putUnitDouble(sID('opacity'), sID('percentUnit'), opacity)
+        if blend_mode is not None:
+            props.putEnumerated(sID('mode'), sID('blendMode'), sID(ACTION_BATCH_BLEND_MODES[blend_mode]))
+        if not props.calls:
+            return None
+        desc, ref = new_descriptor(self), new_reference(self)
+        ref.putIdentifier(sID('layer'), LAYER_INDEX.get_id(layer))
+        desc.putReference(sID('target'), ref)
+        desc.putObject(sID('to'), sID('layer'), props)
+        return self.executeAction(sID('set'), desc)
+
+    """
+    * Executing Actions
+    """
+
+    def get_script(self) -> str:
+        """Returns the script which builds and executes every recorded action."""
+        dialogs = 'DialogModes.ERROR' if APP.is_error_dialog_enabled() else None
+        actions = []
+        for event_id, descriptor, mode in self._actions:
+            lines: list[str] = []
+            name = descriptor.get_script(lines) if descriptor else 'new ActionDescriptor()'
+            lines.append(f'executeAction({event_id}, {name}, {dialogs or ACTION_BATCH_DIALOGS[mode]});')
+            actions.append('run(function () {\n    %s\n});' % '\n    '.join(lines))
+        return ACTION_BATCH_SCRIPT % (ACTION_BATCH_HEADER, '\n'.join(actions))
+
+    def flush(self, raise_errors: bool = True) -> list[Optional[str]]:
+        """Execute every recorded action and clear the batch.
+
+        Args:
+            raise_errors: Whether to raise an OSError for the first action which failed.
+
+        Returns:
+            Error message of each action in the order they were recorded, or None where it succeeded.
+        """
+        if not self._actions:
+            return []
+        try:
+            lines = str(APP.eval_javascript(self.get_script()) or '').split('\n')
+        except PS_EXCEPTIONS:
+            lines = ['']
+
+        # Fall back to executing each action if the script couldn't run
+        actions, self._actions = self._actions, []
+        if lines[0] == ACTION_BATCH_HEADER and len(lines) == len(actions) + 1:
+            results = [unquote(n) or None for n in lines[1:]]
+            for event_id, *_ in actions:
+                APP.notify_action_listeners(event_id)
+        else:
+            results = [execute_recorded_action(*action) for action in actions]
+
+        if raise_errors:
+            for (event_id, *_), error in zip(actions, results):
+                if error:
+                    raise OSError(f"Batched action '{APP.typeIDToStringID(event_id)}' failed: {error}")
+        return results
+
+    def discard(self) -> None:
+        """Clear the batch without executing any recorded actions."""
+        self._actions.clear()
+
+
+"""
+* Batch Utils
+"""
+
+
+def new_descriptor(context: Any = None) -> Union[ActionDescriptor, RecordedDescriptor]:
+    """Returns a new action descriptor, recorded if the context is a batch or another recorded object.
+
+    Args:
+        context: Batch the descriptor is recorded for, or the object it will be added to.
+    """
+    return RecordedDescriptor() if is_recording(context) else ActionDescriptor()
+
+
+def new_reference(context: Any = None) -> Union[ActionReference, RecordedReference]:
+    """Returns a new action reference, recorded if the context is a batch or another recorded object.
+
+    Args:
+        context: Batch the reference is recorded for, or the object it will be added to.
+    """
+    return RecordedReference() if is_recording(context) else ActionReference()
+
+
+def new_list(context: Any = None) -> Union[ActionList, RecordedList]:
+    """Returns a new action list, recorded if the context is a batch or another recorded object.
+
+    Args:
+        context: Batch the list is recorded for, or the object it will be added to.
+    """
+    return RecordedList() if is_recording(context) else ActionList()
+
+
+def is_recording(context: Any) -> bool:
+    """Returns True if the context is a batch or a recorded object."""
+    return isinstance(context, (ActionBatch, RecordedActionObject))
+
+
+def get_script_value(value: Any, lines: list[str]) -> str:
+    """Returns the script representation of a recorded method argument.
+
+    Args:
+        value: Argument passed to a recorded method.
+        lines: Lines of the script being generated, recorded objects are added to it.
+    """
+    if isinstance(value, RecordedActionObject):
+        return value.get_script(lines)
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, int):
+        return str(int(value))
+    if isinstance(value, float):
+        return repr(value)
+    if isinstance(value, str):
+        return json.dumps(value)
+    raise TypeError(f"Can't record argument of type '{type(value).__name__}' in an action batch")
+
+
+def execute_recorded_action(
+    event_id: int,
+    descriptor: Optional[RecordedDescriptor],
+    dialogs: DialogModes
+) -> Optional[str]:
+    """Execute a recorded action through COM.
+
+    Args:
+        event_id: Action descriptor event ID.
+        descriptor: Recorded action descriptor tree to execute.
+        dialogs: DialogMode which governs whether to display dialogs.
+
+    Returns:
+        Error message if the action failed, otherwise None.
+    """
+    try:
+        APP.executeAction(event_id, descriptor.get_object() if descriptor else ActionDescriptor(), dialogs)
+    except PS_EXCEPTIONS as e:
+        return str(e) or 'Unknown error'
+    return None
@@ -2,10 +2,14 @@
 * Utils: Adobe Photoshop
 """
 # Standard Library
+import atexit
+import json
 from _ctypes import COMError, ArgumentError
 from contextlib import suppress
 from ctypes import c_uint32
 from functools import cache, cached_property
+from pathlib import Path
+from threading import Lock
 from typing import Union, Any, Optional, TypedDict, Callable
 
 # Third Party
@@ -22,10 +26,11 @@
 from photoshop.api._core import Photoshop
 from photoshop.api._document import Document
 from photoshop.api._layerSet import LayerSet
+from omnitils.files import dump_data_file, load_data_file
 from win32api import FormatMessage
 
 # Local Imports
-from src._state import AppEnvironment
+from src._state import AppEnvironment, PATH
 
 """
 * Types & Definitions
@@ -101,16 +106,107 @@ class LayerDimensions(TypedDict):
     bottom: int
 
 
+# Verifies a list of string IDs with a single script call, returning their type IDs comma separated
+TYPE_ID_SCRIPT = """
+var names = %s, ids = [];
+for (var i = 0; i < names.length; i++) ids.push(stringIDToTypeID(names[i]));
+ids.join(',');
+"""
+
 """
 * Util Classes
 """
 
 
+class TypeIDTable:
+    """Memo table of string ID to type ID conversions, persisted for each Photoshop version.
+
+    Notes:
+        - Type IDs of string IDs Photoshop doesn't define are assigned as they're first requested, and
+            can differ between sessions. The persisted table is verified against Photoshop with a single
+            script call when it's loaded, replacing any values which changed.
+        - New conversions are written back to the file when the app exits.
+
+    Args:
+        path: Path to the persisted table file.
+    """
+
+    def __init__(self, path: Path):
+        self._path = path
+        self._lock = Lock()
+        self._ids: dict[str, int] = {}
+        self._names: dict[int, str] = {}
+        self._version: Optional[str] = None
+        self._loaded: bool = False
+        self._changed: bool = False
+
+    @property
+    def loaded(self) -> bool:
+        """bool: Whether the persisted table has been loaded."""
+        return self._loaded
+
+    def get_id(self, name: str) -> Optional[int]:
+        """Returns the type ID of a string ID, if known."""
+        return self._ids.get(name)
+
+    def get_name(self, type_id: int) -> Optional[str]:
+        """Returns the string ID of a type ID, if known."""
+        return self._names.get(type_id)
+
+    def add(self, name: str, type_id: int) -> None:
+        """Record a string ID and its type ID.
+
+        Args:
+            name: String ID.
+            type_id: Type ID of the string ID.
+        """
+        with self._lock:
+            if self._ids.get(name) != type_id:
+                self._ids[name], self._names[type_id] = type_id, name
+                self._changed = True
+
+    def load(self, version: str, verify: Callable[[list[str]], Optional[list[int]]]) -> None:
+        """Pre-warm the table from the conversions persisted for a Photoshop version.
+
+        Args:
+            version: Version of the running Photoshop application.
+            verify: Returns the current type ID of each string ID given, or None if they can't be verified.
+        """
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded, self._version = True, version
+            atexit.register(self.save)
+            with suppress(Exception):
+                if not self._path.is_file():
+                    return
+                names = list(load_data_file(self._path).get(version, {}))
+                if names and (ids := verify(names)) and len(ids) == len(names):
+                    for name, type_id in zip(names, ids):
+                        self._ids[name], self._names[type_id] = type_id, name
+
+    def save(self) -> None:
+        """Write the table to its file if new conversions were recorded."""
+        with self._lock:
+            if not self._changed or not self._version:
+                return
+            with suppress(Exception):
+                data = load_data_file(self._path) if self._path.is_file() else {}
+                data[self._version] = dict(sorted(self._ids.items()))
+                dump_data_file(data, self._path)
+                self._changed = False
+
+
 class ApplicationHandler(Application):
     """Wrapper for the Photoshop Application class."""
 
     def __init__(self, env: Optional[AppEnvironment] = None):
         version = env.PS_VERSION if env else None
+
+        # Route Photoshop objects to the fake backend, requires psd-tools
+        if env and env.PS_FAKE_BACKEND:
+            from src.utils.fake_photoshop import install_fake_backend
+            install_fake_backend()
         super().__init__(version=version)
         self._env = env
 
@@ -143,6 +239,8 @@ class PhotoshopHandler(ApplicationHandler):
     DIMS_800 = (2176, 2960)
     DIMS_600 = (1632, 2220)
     _instance = None
+    _type_ids = TypeIDTable(PATH.SRC_DATA_TYPE_IDS)
+    _action_listeners: list[Callable[[int], None]] = []
 
     def __new__(cls, env: Optional[Any] = None) -> 'PhotoshopHandler':
         """Always return the same Photoshop Application instance on successive calls.
@@ -198,7 +296,7 @@ def is_running(cls) -> bool:
 
     @cache
     def charIDToTypeID(self, index: str) -> int:
-        """Caching handler for charIDToTypeID.
+        """Caching handler for charIDToTypeID, a Char ID is its four characters packed into an integer.
 
         Args:
             index: Char ID to convert to Type ID.
@@ -206,6 +304,8 @@ def charIDToTypeID(self, index: str) -> int:
         Returns:
             Type ID converted from Char ID.
         """
+        if (type_id := get_char_type_id(index)) is not None:
+            return type_id
         return super().charIDToTypeID(index)
 
     @cache
@@ -228,6 +328,8 @@ def typeIDToCharID(self, index: int) -> str:
         Returns:
             Character representation of Type ID.
         """
+        if (char_id := get_type_char_id(index)) is not None:
+            return char_id
         return super().typeIDToCharID(index)
 
     @cache
@@ -239,9 +341,30 @@ def t2c(self, index: int) -> str:
     * String ID Conversions
     """
 
+    def load_type_ids(self) -> None:
+        """Pre-warm the string ID table with the conversions persisted for this Photoshop version."""
+        if self._type_ids.loaded:
+            return
+        with suppress(Exception):
+            self._type_ids.load(str(self.version), verify=self._verify_type_ids)
+
+    def _verify_type_ids(self, names: list[str]) -> Optional[list[int]]:
+        """Returns the type ID of each string ID, converted with a single script call.
+
+        Args:
+            names: String IDs to convert.
+
+        Returns:
+            Type ID of each string ID, or None if the script couldn't convert them.
+        """
+        with suppress(Exception):
+            result = str(self.eval_javascript(TYPE_ID_SCRIPT % json.dumps(names)))
+            return [int(n) for n in result.split(',')]
+        return None
+
     @cache
     def stringIDToTypeID(self, index: str) -> int:
-        """Caching handler for stringIDToTypeID.
+        """Caching handler for stringIDToTypeID, backed by the persisted string ID table.
 
         Args:
             index: String ID to convert to Type ID.
@@ -249,7 +372,12 @@ def stringIDToTypeID(self, index: str) -> int:
         Returns:
             Type ID converted from string ID.
         """
-        return super().stringIDToTypeID(index)
+        self.load_type_ids()
+        if (type_id := self._type_ids.get_id(index)) is not None:
+            return type_id
+        type_id = super().stringIDToTypeID(index)
+        self._type_ids.add(index, type_id)
+        return type_id
 
     @cache
     def StringIDToTypeID(self, index: str) -> int:
@@ -263,7 +391,7 @@ def sID(self, index: str) -> int:
 
     @cache
     def typeIDToStringID(self, index: int) -> str:
-        """Caching handler for typeIDToStringID.
+        """Caching handler for typeIDToStringID, backed by the persisted string ID table.
 
         Args:
             index: Type ID to convert to String ID.
@@ -271,7 +399,13 @@ def typeIDToStringID(self, index: int) -> str:
         Returns:
             str: String representation of Type ID.
         """
-        return super().typeIDToStringID(index)
+        self.load_type_ids()
+        if (name := self._type_ids.get_name(index)) is not None:
+            return name
+        name = super().typeIDToStringID(index)
+        if name:
+            self._type_ids.add(name, index)
+        return name
 
     @cache
     def t2s(self, index: int) -> str:
@@ -327,10 +461,31 @@ def executeAction(
         Returns:
             Result of the action descriptor execution.
         """
-        if self.is_error_dialog_enabled():
-            # Allow error dialogs if enabled in the app environment
-            return super().executeAction(event_id, descriptor, DialogModes.DisplayErrorDialogs)
-        return super().executeAction(event_id, descriptor, dialogs)
+        try:
+            if self.is_error_dialog_enabled():
+                # Allow error dialogs if enabled in the app environment
+                return super().executeAction(event_id, descriptor, DialogModes.DisplayErrorDialogs)
+            return super().executeAction(event_id, descriptor, dialogs)
+        finally:
+            self.notify_action_listeners(event_id)
+
+    def add_action_listener(self, func: Callable[[int], None]) -> None:
+        """Register a function to call with the event ID of each action executed through `executeAction`.
+
+        Args:
+            func: Function to call after each action, even if the action fails.
+        """
+        if func not in self._action_listeners:
+            self._action_listeners.append(func)
+
+    def notify_action_listeners(self, event_id: int) -> None:
+        """Call each registered action listener, e.g. for an action executed inside a script.
+
+        Args:
+            event_id: Action descriptor event ID.
+        """
+        for func in self._action_listeners:
+            func(event_id)
 
     def ExecuteAction(
             self, event_id: int,
@@ -581,3 +736,32 @@ def get_com_error(signed_int: int) -> str:
         except Exception as e:
             err = e.args[2]
     return err
+
+
+"""
+* Type ID Utils
+"""
+
+
+def get_char_type_id(char_id: str) -> Optional[int]:
+    """Returns the Type ID of a Char ID without asking Photoshop, or None if it isn't four ASCII characters.
+
+    Args:
+        char_id: Char ID, e.g. 'Lyr '.
+    """
+    with suppress(UnicodeEncodeError):
+        if len(data := char_id.encode('ascii')) == 4:
+            return int.from_bytes(data, 'big')
+    return None
+
+
+def get_type_char_id(type_id: int) -> Optional[str]:
+    """Returns the Char ID of a Type ID without asking Photoshop, or None if its bytes aren't printable.
+
+    Args:
+        type_id: Type ID to convert.
+    """
+    if not 0 <= type_id < 2 ** 32:
+        return None
+    data = type_id.to_bytes(4, 'big')
+    return data.decode('ascii') if all(32 <= n < 127 for n in data) else None
@@ -0,0 +1,433 @@
+"""
+* Utils: Prepared Art Cache
+"""
+# Standard Library Imports
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import suppress
+from hashlib import sha1
+from io import BytesIO
+from math import ceil, hypot
+from pathlib import Path
+from threading import Lock
+from typing import Iterable, NotRequired, Optional, TypedDict
+
+# Third Party Imports
+from PIL import Image, ImageFilter, ImageOps
+
+# Local Imports
+from src import CONSOLE, PATH
+
+"""
+* Types
+"""
+
+
+class ArtFrame(TypedDict):
+    """Size in pixels of a document to fill with art, and the position of the art's reference within it."""
+    width: int
+    height: int
+    left: int
+    top: int
+    trim: int
+
+
+class ArtTarget(TypedDict):
+    """Size in pixels of the reference an art file is framed to, and the resolution of its document."""
+    width: int
+    height: int
+    dpi: int
+    frame: NotRequired[ArtFrame]
+
+
+# Art is only pre-sized if it would be scaled below this factor to fill its reference
+ART_CACHE_MAX_SCALE = 0.8
+
+# Maximum number of prepared art files kept in the cache folder
+ART_CACHE_MAX_FILES = 256
+
+# Suffixes prepared art files are saved with
+ART_CACHE_SUFFIXES = ('.jpg', '.png')
+
+# Distance in inches over which mirrored art fades into blurred art when extending art
+ART_FILL_FADE = 0.25
+
+# Blur radius in inches of the art filling space further from its edges
+ART_FILL_BLUR = 0.1
+
+# Factor by which blurring and fading is scaled down when extending art
+ART_FILL_REDUCE = 8
+
+# EXIF orientation tag, and the orientations which swap width and height
+EXIF_TAG_ORIENTATION = 0x0112
+EXIF_ORIENTATIONS_ROTATED = (5, 6, 7, 8)
+
+"""
+* Pre-sizing Art
+"""
+
+
+def get_oriented_size(img: Image.Image) -> tuple[int, int]:
+    """Returns the size of an image once its EXIF orientation is applied."""
+    if img.getexif().get(EXIF_TAG_ORIENTATION, 1) in EXIF_ORIENTATIONS_ROTATED:
+        return img.height, img.width
+    return img.width, img.height
+
+
+def get_art_scale(size: tuple[int, int], target: ArtTarget) -> float:
+    """Returns the factor art must be scaled by to fill its target, matching `frame_layer`.
+
+    Args:
+        size: Width and height of the art.
+        target: Size the art is framed to.
+    """
+    return max(target['width'] / size[0], target['height'] / size[1])
+
+
+def get_target_name(target: ArtTarget) -> str:
+    """Returns a name identifying an art target, used to name art prepared for it.
+
+    Args:
+        target: Size the art is framed to.
+    """
+    name = f"{target['width']}x{target['height']}_{target['dpi']}"
+    if frame := target.get('frame'):
+        name += f"_fill_{frame['width']}x{frame['height']}_{frame['left']}_{frame['top']}_{frame['trim']}"
+    return name
+
+
+def load_art(source: Path, target: ArtTarget) -> tuple[Image.Image, Optional[bytes], bool]:
+    """Load an art file scaled to fill its target, with its EXIF orientation applied and converted to RGB.
+
+    Notes:
+        - JPEG art is decoded at a reduced scale where possible, which is much faster for large images.
+        - CMYK art with an embedded profile is converted to sRGB.
+
+    Args:
+        source: Original art file.
+        target: Size the art is framed to.
+
+    Returns:
+        Tuple of the scaled image, its ICC profile if it should be kept, and whether it was a JPEG.
+    """
+    with Image.open(source) as img:
+        is_jpeg = img.format == 'JPEG'
+        size = get_oriented_size(img)
+        scale = get_art_scale(size, target)
+        width, height = ceil(size[0] * scale), ceil(size[1] * scale)
+        rotated = size != img.size
+        img.draft(None, (height, width) if rotated else (width, height))
+        icc = img.info.get('icc_profile')
+        img = ImageOps.exif_transpose(img)
+
+    # Convert to RGB, keeping any transparency
+    has_alpha = img.mode in ('RGBA', 'LA', 'PA') or (img.mode == 'P' and 'transparency' in img.info)
+    if img.mode == 'CMYK' and icc:
+        from PIL import ImageCms
+        img = ImageCms.profileToProfile(
+            img, ImageCms.ImageCmsProfile(BytesIO(icc)), ImageCms.createProfile('sRGB'), outputMode='RGB')
+        icc = None
+    elif img.mode not in ('RGB', 'RGBA') or (img.mode == 'RGBA') != has_alpha:
+        img = img.convert('RGBA' if has_alpha else 'RGB')
+    return img.resize((width, height), Image.Resampling.LANCZOS, reducing_gap=3.0), icc, is_jpeg
+
+
+def save_art(img: Image.Image, path: Path, dpi: int, icc: Optional[bytes], is_jpeg: bool) -> Path:
+    """Save prepared art for Photoshop to place.
+
+    Notes:
+        - Art with transparency, and art which wasn't a JPEG, is saved as a fast compressed PNG.
+            Otherwise art is saved as a high quality JPEG.
+        - The image is saved at the document's resolution, so Photoshop places it at its pixel size.
+        - The image is saved to a temporary file first, so a partial file is never used.
+
+    Args:
+        img: Prepared art image.
+        path: Path to save the art to, without a suffix.
+        dpi: Resolution of the document the art is placed in.
+        icc: ICC profile to embed, if any.
+        is_jpeg: Whether the original art was a JPEG.
+
+    Returns:
+        Path to the saved art.
+    """
+    kwargs = {'dpi': (dpi, dpi), **({'icc_profile': icc} if icc else {})}
+    path = path.with_suffix('.jpg' if is_jpeg and img.mode == 'RGB' else '.png')
+    temp = path.with_name(f'{path.name}.tmp')
+    if path.suffix == '.jpg':
+        img.save(temp, format='JPEG', quality=95, subsampling=0, **kwargs)
+    else:
+        img.save(temp, format='PNG', compress_level=1, **kwargs)
+    temp.replace(path)
+    return path
+
+
+def presize_art(source: Path, target: ArtTarget, path: Path) -> Path:
+    """Scale an art file down to fill its target, and encode it for Photoshop to place.
+
+    Args:
+        source: Original art file.
+        target: Size the art is framed to.
+        path: Path to save the pre-sized art to, without a suffix.
+
+    Returns:
+        Path to the pre-sized art.
+    """
+    img, icc, is_jpeg = load_art(source, target)
+    return save_art(img, path, target['dpi'], icc, is_jpeg)
+
+
+"""
+* Extending Art
+"""
+
+
+def get_mirrored_tile(img: Image.Image) -> Image.Image:
+    """Returns an image twice the size of an image, holding it and its copies mirrored horizontally,
+    vertically, and both. Tiling it mirrors the image across each of its edges.
+
+    Args:
+        img: Image to mirror.
+    """
+    tile = Image.new(img.mode, (img.width * 2, img.height * 2))
+    flipped = ImageOps.flip(img)
+    tile.paste(img, (0, 0))
+    tile.paste(ImageOps.mirror(img), (img.width, 0))
+    tile.paste(flipped, (0, img.height))
+    tile.paste(ImageOps.mirror(flipped), (img.width, img.height))
+    return tile
+
+
+def extend_art(source: Path, target: ArtTarget, path: Path) -> Path:
+    """Frame an art file within its document, and fill the empty space around it by extending its edges.
+
+    Notes:
+        - The art is scaled to fill its reference and centered on it, matching `frame_layer`.
+        - Edges of the art inside the document are trimmed first, matching the contracted selection
+            used by content aware fill, since art often has a faded or bordered edge.
+        - Empty space is filled by mirroring the art across its edges, fading into a heavily blurred
+            copy of the mirrored art further from its edges, which hides the mirrored detail.
+        - The result is the size of the entire document, and should be framed to the document.
+
+    Args:
+        source: Original art file.
+        target: Size the art is framed to, including the document frame to fill.
+        path: Path to save the extended art to, without a suffix.
+
+    Returns:
+        Path to the extended art.
+    """
+    frame, dpi = target['frame'], target['dpi']
+    img, icc, is_jpeg = load_art(source, target)
+    if img.mode != 'RGB':
+        img = img.convert('RGB')
+    width, height = frame['width'], frame['height']
+
+    # Crop the art to the document, trimming edges which fall inside it
+    left = frame['left'] + (target['width'] - img.width) // 2
+    top = frame['top'] + (target['height'] - img.height) // 2
+    box = [max(left, 0), max(top, 0), min(left + img.width, width), min(top + img.height, height)]
+    box = [
+        box[0] + frame['trim'] if box[0] > 0 else 0,
+        box[1] + frame['trim'] if box[1] > 0 else 0,
+        box[2] - frame['trim'] if box[2] < width else width,
+        box[3] - frame['trim'] if box[3] < height else height]
+    art = img.crop((box[0] - left, box[1] - top, box[2] - left, box[3] - top))
+
+    # Mirror the art across its edges to fill the document
+    mirrored = Image.new('RGB', (width, height))
+    tile = get_mirrored_tile(art)
+    x0 = box[0] - ceil(box[0] / tile.width) * tile.width
+    y0 = box[1] - ceil(box[1] / tile.height) * tile.height
+    for y in range(y0, height, tile.height):
+        for x in range(x0, width, tile.width):
+            mirrored.paste(tile, (x, y))
+
+    # Blur and fade are computed at a reduced scale, then upscaled
+    factor = ART_FILL_REDUCE
+    small = (max(width // factor, 1), max(height // factor, 1))
+    blurred = mirrored.resize(small, Image.Resampling.BOX).filter(
+        ImageFilter.GaussianBlur(dpi * ART_FILL_BLUR / factor)
+    ).resize((width, height), Image.Resampling.BILINEAR)
+
+    # Mask fading from the mirrored art at its edges to the blurred art
+    radius = dpi * ART_FILL_FADE
+    dx = [max(box[0] - x * factor, x * factor - box[2], 0) for x in range(small[0])]
+    dy = [max(box[1] - y * factor, y * factor - box[3], 0) for y in range(small[1])]
+    mask = Image.new('L', small)
+    mask.putdata([int(max(1 - hypot(x, y) / radius, 0) * 255) for y in dy for x in dx])
+    mask = mask.resize((width, height), Image.Resampling.BILINEAR)
+
+    # Art itself is kept exactly as mirrored, since its mask is always opaque
+    return save_art(Image.composite(mirrored, blurred, mask), path, dpi, icc, is_jpeg)
+
+
+"""
+* Art Cache
+"""
+
+
+class ArtCache:
+    """Pre-sizes art files to the size they're framed at in a template, so Photoshop places an image which
+    is already close to its final size instead of decoding and transforming a huge image. Can also extend
+    art to fill its document, in place of filling it in Photoshop.
+
+    Notes:
+        - Prepared art is cached by the digest of the art file and the target size, so re-rendering a
+            card, or rendering it with another template of the same size, reuses it.
+        - Art files already close to their target size are placed as they are, unless the target has a
+            document frame to fill, in which case the art is extended to fill the document.
+        - The target of each template is remembered from its last render, so art for cards waiting to
+            render with the same template can be prepared in the background.
+        - Uses threads rather than processes, since Pillow releases the GIL while decoding, resizing,
+            and encoding, and a spawned process would have to import the entire app.
+
+    Args:
+        path: Folder to cache prepared art in.
+        max_workers: Maximum number of art files to prepare at once.
+    """
+
+    def __init__(self, path: Path, max_workers: int = 2):
+        self._path = path
+        self._max_workers = max_workers
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = Lock()
+        self._digests: dict[tuple[str, int, int], str] = {}
+        self._futures: dict[tuple[str, int, str], Future] = {}
+        self._targets: dict[str, ArtTarget] = {}
+
+    def get(self, file: Path, target: ArtTarget, key: Optional[str] = None) -> Path:
+        """Returns an art file prepared for a target, waiting for it if it's being prepared.
+
+        Args:
+            file: Original art file.
+            target: Size the art is framed to.
+            key: Key of the template the art is framed in, to prepare art for its later renders.
+
+        Returns:
+            Path to the prepared art, or the original art file if it doesn't need preparing or
+                preparing failed.
+        """
+        if key:
+            with self._lock:
+                self._targets[key] = target
+        try:
+            # Prepare the art again if its cached file was pruned since
+            if (path := self.submit(file, target).result()) == file or path.is_file():
+                return path
+            self.forget(file, target)
+            return self.submit(file, target).result()
+        except Exception as e:
+            CONSOLE.log_exception(e)
+            return file
+
+    def submit(self, file: Path, target: ArtTarget) -> Future:
+        """Schedule an art file to be prepared for a target, reusing any job already scheduled.
+
+        Args:
+            file: Original art file.
+            target: Size the art is framed to.
+
+        Returns:
+            Future resolving to the path of the art to place.
+        """
+        key = self._get_key(file, target)
+        with self._lock:
+            if (future := self._futures.get(key)) is None:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix='art')
+                if len(self._futures) >= ART_CACHE_MAX_FILES:
+                    self._drop_futures()
+                future = self._futures[key] = self._pool.submit(self._prepare, file, target)
+            return future
+
+    def forget(self, file: Path, target: ArtTarget) -> None:
+        """Drop the job preparing an art file for a target, so the next request prepares it again.
+
+        Args:
+            file: Original art file.
+            target: Size the art is framed to.
+        """
+        with self._lock:
+            self._futures.pop(self._get_key(file, target), None)
+
+    def prepare_ahead(self, files: Iterable[Path], key: str) -> None:
+        """Prepare art files in the background for a template whose target is known from an earlier render.
+
+        Args:
+            files: Art files which will be rendered with the template.
+            key: Key of the template.
+        """
+        with self._lock:
+            target = self._targets.get(key)
+        if not target:
+            return
+        for file in files:
+            with suppress(OSError):
+                self.submit(file, target)
+
+    def get_digest(self, file: Path) -> str:
+        """Returns a digest of an art file's contents, reusing it while the file is unmodified.
+
+        Args:
+            file: Art file to hash.
+        """
+        stat = file.stat()
+        key = (str(file), stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            if digest := self._digests.get(key):
+                return digest
+        digest = sha1()
+        with open(file, 'rb') as f:
+            while chunk := f.read(1024 * 1024):
+                digest.update(chunk)
+        with self._lock:
+            self._digests[key] = digest.hexdigest()
+        return self._digests[key]
+
+    @staticmethod
+    def _get_key(file: Path, target: ArtTarget) -> tuple[str, int, str]:
+        """Returns the key of the job preparing an art file for a target, changes if the file is modified."""
+        return str(file), file.stat().st_mtime_ns, get_target_name(target)
+
+    def _drop_futures(self) -> None:
+        """Drop finished jobs, except those whose prepared art is still cached. Lock must be held."""
+        self._futures = {
+            k: fut for k, fut in self._futures.items()
+            if not fut.done() or (not fut.exception() and fut.result().parent == self._path
+                                  and fut.result().is_file())}
+
+    def _prepare(self, file: Path, target: ArtTarget) -> Path:
+        """Returns the art to place for a target, pre-sizing or extending and caching it if required."""
+        if 'frame' not in target:
+            with Image.open(file) as img:
+                if get_art_scale(get_oriented_size(img), target) >= ART_CACHE_MAX_SCALE:
+                    return file
+
+        # Reuse art prepared by an earlier render
+        stem = self._path / f'{self.get_digest(file)}_{get_target_name(target)}'
+        for suffix in ART_CACHE_SUFFIXES:
+            if (path := stem.with_suffix(suffix)).is_file():
+                with suppress(OSError):
+                    path.touch()
+                return path
+
+        path = extend_art(file, target, stem) if 'frame' in target else presize_art(file, target, stem)
+        self.prune()
+        return path
+
+    def prune(self) -> None:
+        """Remove the least recently used prepared art files beyond the cache limit."""
+        with suppress(OSError):
+            files = sorted(
+                [f for f in self._path.iterdir() if f.suffix in ART_CACHE_SUFFIXES],
+                key=lambda f: f.stat().st_mtime, reverse=True)
+            for f in files[ART_CACHE_MAX_FILES:]:
+                f.unlink(missing_ok=True)
+
+        # Jobs for pruned art would return files which no longer exist
+        with self._lock:
+            self._drop_futures()
+
+
+# Global prepared art cache
+ART_CACHE = ArtCache(PATH.LOGS_ART)
@@ -0,0 +1,270 @@
+"""
+* Utils: Photoshop COM Call Profiling
+"""
+# Standard Library Imports
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+from threading import Lock
+from time import perf_counter
+from typing import Callable, Iterator, Optional, TypedDict
+
+# Third Party Imports
+from omnitils.files import dump_data_file
+
+# Local Imports
+from src import CONSOLE, ENV, PATH
+from src.utils.tracing import TRACER
+
+"""
+* Types
+"""
+
+
+class ComCallStats(TypedDict):
+    """Aggregated count and timing of COM calls sharing a key."""
+    count: int
+    total: float
+    max: float
+
+
+# Modules whose frames are skipped when attributing a COM call to the code which made it
+COM_PROFILE_SKIPPED_MODULES = ('comtypes', 'photoshop', __name__)
+
+# Number of entries listed in each section of a report
+COM_PROFILE_TOP_N = 25
+
+"""
+* COM Profiler
+"""
+
+
+class ComProfiler:
+    """Counts and times every COM dispatch made to Photoshop while enabled.
+
+    Notes:
+        - Photoshop doesn't expose type information, so every object is a fully dynamic comtypes dispatch.
+            Property gets, property puts, and method calls on those dispatch objects are wrapped while
+            the profiler is installed, and restored once it's removed.
+        - Each call is attributed to the member accessed, the first function outside comtypes and the
+            Photoshop API which made it, and the render stage and step running at the time.
+        - The report is rewritten after each profiled render, sorted by total time.
+
+    Args:
+        path: Path to the report file.
+    """
+
+    def __init__(self, path: Path):
+        self._path = path
+        self._lock = Lock()
+        self._originals: dict[tuple[type, str], Callable] = {}
+        self._renders: int = 0
+        self._stats: dict[str, dict[str, ComCallStats]] = {
+            'members': {}, 'callers': {}, 'stages': {}, 'steps': {}}
+
+    @property
+    def enabled(self) -> bool:
+        """bool: Whether COM calls are profiled during renders."""
+        return ENV.PROFILE_COM
+
+    @property
+    def installed(self) -> bool:
+        """bool: Whether COM dispatch is currently wrapped."""
+        return bool(self._originals)
+
+    @property
+    def calls(self) -> int:
+        """int: Number of COM calls recorded so far."""
+        with self._lock:
+            return sum(s['count'] for s in self._stats['stages'].values())
+
+    def reset(self) -> None:
+        """Clear every recorded call."""
+        with self._lock:
+            self._renders = 0
+            for group in self._stats.values():
+                group.clear()
+
+    """
+    * Installing
+    """
+
+    def install(self) -> None:
+        """Wrap comtypes dynamic dispatch so each COM call is recorded."""
+        if self.installed:
+            return
+        try:
+            from comtypes.client.dynamic import _Dispatch, MethodCaller
+        except ImportError:
+            return
+
+        def get_method_name(caller: MethodCaller) -> str:
+            """Returns the member name a method caller invokes."""
+            for name, dispid in caller._obj._ids.items():
+                if dispid == caller._id:
+                    return name
+            return str(caller._id)
+
+        self._wrap(_Dispatch, '__getattr__', lambda obj, name, *_: (
+            None if name in obj._methods or name.startswith('__') else f'{name} (get)'))
+        self._wrap(_Dispatch, '__setattr__', lambda obj, name, *_: f'{name} (set)')
+        self._wrap(_Dispatch, '__getitem__', lambda *_: '[item]')
+        self._wrap(_Dispatch, '__iter__', lambda *_: '[iter]')
+        self._wrap(MethodCaller, '__call__', lambda obj, *_: f'{get_method_name(obj)}()')
+        self._wrap(MethodCaller, '__getitem__', lambda obj, *_: f'{get_method_name(obj)}[]')
+        self._wrap(MethodCaller, '__setitem__', lambda obj, *_: f'{get_method_name(obj)}[]=')
+
+    def uninstall(self) -> None:
+        """Restore the original comtypes dynamic dispatch."""
+        for (cls, attr), func in self._originals.items():
+            setattr(cls, attr, func)
+        self._originals.clear()
+
+    def _wrap(self, cls: type, attr: str, get_key: Callable[..., Optional[str]]) -> None:
+        """Replace a dispatch method with one that records each call.
+
+        Args:
+            cls: Class defining the method.
+            attr: Name of the method.
+            get_key: Returns the member key recorded for a call from its arguments, or None to skip it.
+        """
+        func = self._originals[(cls, attr)] = getattr(cls, attr)
+        profiler = self
+
+        def wrapper(*args, **kwargs):
+            if (key := get_key(*args)) is None:
+                return func(*args, **kwargs)
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profiler.add(key, perf_counter() - start)
+
+        wrapper.__name__ = getattr(func, '__name__', attr)
+        wrapper.__doc__ = func.__doc__
+        setattr(cls, attr, wrapper)
+
+    """
+    * Recording
+    """
+
+    @contextmanager
+    def profile_render(self) -> Iterator[None]:
+        """Profile every COM call made while inside this context, if profiling is enabled."""
+        if not self.enabled:
+            yield
+            return
+        self.install()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._renders += 1
+            self.save()
+
+    def add(self, member: str, duration: float) -> None:
+        """Record a COM call.
+
+        Args:
+            member: Key of the member accessed, e.g. 'executeAction()' or 'visible (set)'.
+            duration: Duration of the call in seconds.
+        """
+        stage, step = TRACER.context
+        caller = get_caller()
+        with self._lock:
+            add_com_stats(self._stats['members'], member, duration)
+            add_com_stats(self._stats['callers'], caller, duration)
+            add_com_stats(self._stats['stages'], stage or 'none', duration)
+            if step:
+                add_com_stats(self._stats['steps'], f'{stage}.{step}', duration)
+
+    """
+    * Reporting
+    """
+
+    def get_report(self, top: int = COM_PROFILE_TOP_N) -> dict:
+        """Returns the recorded calls with each section sorted by total time.
+
+        Args:
+            top: Maximum number of entries in each section.
+
+        Returns:
+            JSON serializable report.
+        """
+        with self._lock:
+            stages = self._stats['stages']
+            calls = sum(s['count'] for s in stages.values())
+            return {
+                'renders': self._renders,
+                'calls': calls,
+                'time': round(sum(s['total'] for s in stages.values()), 4),
+                'calls_per_render': round(calls / self._renders, 1) if self._renders else None,
+                **{group: get_top_com_stats(stats, top) for group, stats in self._stats.items()}}
+
+    def get_summary(self, top: int = 5) -> str:
+        """Returns a short console summary of the chattiest members and callers.
+
+        Args:
+            top: Number of members and callers to list.
+        """
+        report = self.get_report(top)
+        lines = [f"COM calls: {report['calls']} in {report['time']:.1f}s"
+                 + (f" ({report['calls_per_render']} per render)" if report['calls_per_render'] else '')]
+        for group in ('members', 'callers'):
+            lines.append(f"Top {group}: " + ', '.join(
+                f"{key} ({s['count']}, {s['total']:.2f}s)" for key, s in report[group].items()))
+        return '\n'.join(lines)
+
+    def save(self) -> None:
+        """Write the report to its file."""
+        try:
+            dump_data_file(self.get_report(), self._path)
+        except Exception as e:
+            CONSOLE.log_exception(e)
+
+
+"""
+* Profiling Utils
+"""
+
+
+def get_caller() -> str:
+    """Returns the qualified name of the innermost function outside comtypes and the Photoshop API on
+    the current call stack."""
+    frame = sys._getframe(1)
+    while frame is not None:
+        module = frame.f_globals.get('__name__', '')
+        if not module.startswith(COM_PROFILE_SKIPPED_MODULES):
+            code = frame.f_code
+            return f"{module}.{getattr(code, 'co_qualname', code.co_name)}"
+        frame = frame.f_back
+    return 'unknown'
+
+
+def add_com_stats(stats: dict[str, ComCallStats], key: str, duration: float) -> None:
+    """Add a COM call to its aggregated statistics.
+
+    Args:
+        stats: Aggregated statistics, mapped to their key.
+        key: Key the call is attributed to.
+        duration: Duration of the call in seconds.
+    """
+    s = stats.setdefault(key, {'count': 0, 'total': 0.0, 'max': 0.0})
+    s['count'] += 1
+    s['total'] += duration
+    s['max'] = max(s['max'], duration)
+
+
+def get_top_com_stats(stats: dict[str, ComCallStats], top: int) -> dict[str, ComCallStats]:
+    """Returns the entries with the highest total time, rounded for reporting.
+
+    Args:
+        stats: Aggregated statistics, mapped to their key.
+        top: Maximum number of entries to return.
+    """
+    ranked = sorted(stats.items(), key=lambda x: x[1]['total'], reverse=True)[:top]
+    return {k: {'count': s['count'], 'total': round(s['total'], 4), 'max': round(s['max'], 4)} for k, s in ranked}
+
+
+# Global COM profiler
+COM_PROFILER = ComProfiler(PATH.LOGS_COM_PROFILE)
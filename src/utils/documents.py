@@ -0,0 +1,163 @@
+"""
+* Utils: Template Document Pool
+"""
+# Standard Library Imports
+from collections import OrderedDict
+from contextlib import suppress
+from os import PathLike
+from pathlib import Path
+from time import perf_counter
+from typing import Optional, TypedDict, Union
+
+# Third Party Imports
+from photoshop.api import PurgeTarget
+from photoshop.api._document import Document
+
+# Local Imports
+from src import APP, CFG, CONSOLE
+from src.helpers.document import close_document, get_document
+from src.utils.adobe import PS_EXCEPTIONS
+from src.utils.layer_index import LAYER_INDEX
+from src.utils.symbol_cache import SYMBOL_CACHE
+
+"""
+* Types
+"""
+
+
+class DocumentPoolStats(TypedDict):
+    """Open and close counts and timings recorded by a document pool."""
+    opened: int
+    closed: int
+    reused: int
+    open_time: float
+    close_time: float
+
+
+"""
+* Document Pool
+"""
+
+
+class DocumentPool:
+    """Keeps recently used template documents open in Photoshop, closing the least recently used
+    document once the pool exceeds its document count or memory budget.
+
+    Notes:
+        - Size and memory budget are read from the 'Render' settings each time a document is opened.
+        - The memory used by a document is estimated from the size of its PSD file.
+        - A pooled document closed outside the pool is simply opened again when next requested.
+        - Closing a document also closes the companion document holding its prepared symbol layers.
+    """
+
+    def __init__(self):
+        self._docs: OrderedDict[str, int] = OrderedDict()
+        self._stats: DocumentPoolStats = {
+            'opened': 0, 'closed': 0, 'reused': 0, 'open_time': 0.0, 'close_time': 0.0}
+
+    @property
+    def size(self) -> int:
+        """int: Maximum number of template documents kept open."""
+        return max(1, CFG.document_pool_size)
+
+    @property
+    def budget(self) -> Optional[int]:
+        """Optional[int]: Maximum combined PSD size in bytes of the template documents kept open, None if
+        memory isn't limited."""
+        return CFG.document_pool_memory * 1024 * 1024 if CFG.document_pool_memory > 0 else None
+
+    @property
+    def stats(self) -> DocumentPoolStats:
+        """DocumentPoolStats: Document open and close counts and timings recorded so far."""
+        return {**self._stats,
+                'open_time': round(self._stats['open_time'], 2),
+                'close_time': round(self._stats['close_time'], 2)}
+
+    def is_open(self, path: Union[str, PathLike]) -> bool:
+        """Returns True if a template document is held open by the pool.
+
+        Args:
+            path: Path to the template's PSD file.
+        """
+        return Path(path).name in self._docs
+
+    def reset_stats(self) -> None:
+        """Clear the recorded document open and close counts and timings."""
+        self._stats.update(opened=0, closed=0, reused=0, open_time=0.0, close_time=0.0)
+
+    """
+    * Opening and Closing
+    """
+
+    def open(self, path: Union[str, PathLike]) -> Document:
+        """Activate a template document, opening it if it isn't already open.
+
+        Args:
+            path: Path to the template's PSD file.
+
+        Returns:
+            The opened template document.
+        """
+        path = Path(path)
+        if path.name in self._docs and (doc := get_document(path.name)):
+            self._docs.move_to_end(path.name)
+            self._stats['reused'] += 1
+            return doc
+
+        # Make room for the document before opening it
+        self._docs.pop(path.name, None)
+        cost = path.stat().st_size if path.is_file() else 0
+        self._evict(count=self.size - 1, budget=None if self.budget is None else self.budget - cost)
+
+        # Open the document, any index of a document by this name is outdated
+        LAYER_INDEX.discard(path.name)
+        timer = perf_counter()
+        doc = APP.load(str(path))
+        self._stats['open_time'] += perf_counter() - timer
+        self._stats['opened'] += 1
+        self._docs[path.name] = cost
+        return doc
+
+    def close(self, path: Union[str, PathLike]) -> None:
+        """Close a template document if it's open.
+
+        Args:
+            path: Path to the template's PSD file.
+        """
+        name = Path(path).name
+        self._docs.pop(name, None)
+        SYMBOL_CACHE.close(name)
+        timer = perf_counter()
+        with suppress(*PS_EXCEPTIONS):
+            if doc := get_document(name):
+                close_document(docref=doc, purge=False)
+                self._stats['close_time'] += perf_counter() - timer
+                self._stats['closed'] += 1
+
+    def close_all(self) -> None:
+        """Close every template document held open by the pool, then purge Photoshop's caches."""
+        SYMBOL_CACHE.close_all()
+        if not self._docs:
+            return
+        self._evict(count=0)
+        try:
+            APP.purge(PurgeTarget.AllCaches)
+        except PS_EXCEPTIONS as e:
+            CONSOLE.log_exception(e)
+
+    def _evict(self, count: int, budget: Optional[int] = None) -> None:
+        """Close the least recently used documents until the pool is within a document count and budget.
+
+        Args:
+            count: Maximum number of documents to keep open.
+            budget: Maximum combined PSD size in bytes to keep open, not enforced if None.
+        """
+        while self._docs and (
+            len(self._docs) > count
+            or (budget is not None and sum(self._docs.values()) > budget)
+        ):
+            self.close(next(iter(self._docs)))
+
+
+# Global template document pool
+DOCUMENT_POOL = DocumentPool()
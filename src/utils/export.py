@@ -0,0 +1,208 @@
+"""
+* Utils: Background Output Encoding
+"""
+# Standard Library Imports
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import suppress
+from pathlib import Path
+from threading import Lock
+from typing import Optional, TypedDict
+
+# Third Party Imports
+from PIL import Image
+from PIL.PngImagePlugin import PngInfo
+
+# Local Imports
+from src import CONSOLE
+
+"""
+* Types
+"""
+
+
+class ExportMetadata(TypedDict, total=False):
+    """Metadata written to an encoded output image."""
+    title: str
+    artist: str
+    software: str
+
+
+# EXIF tags used for JPEG metadata
+EXIF_TAG_DESCRIPTION = 0x010E
+EXIF_TAG_SOFTWARE = 0x0131
+EXIF_TAG_ARTIST = 0x013B
+
+"""
+* Encoding
+"""
+
+
+def encode_output(
+    source: Path,
+    target: Path,
+    quality: int = 95,
+    dpi: Optional[int] = None,
+    metadata: Optional[ExportMetadata] = None
+) -> Path:
+    """Encode an intermediate image saved by Photoshop into the final output image, then remove the
+    intermediate image. The output image is written to a temporary file first, so a failed encode never
+    leaves a truncated output image behind.
+
+    Args:
+        source: Uncompressed intermediate image.
+        target: Path to save the output image, its suffix determines the format.
+        quality: JPEG quality from 1 to 100, ignored for PNG.
+        dpi: Resolution to downscale the image to, keeps the original resolution if not provided.
+        metadata: Metadata to embed in the output image.
+
+    Returns:
+        Path to the output image.
+    """
+    metadata = metadata or {}
+    temp = target.with_name(f'{target.name}.tmp')
+    try:
+        with Image.open(source) as img:
+            img.load()
+            src_dpi = round(img.info.get('dpi', (0, 0))[0]) or None
+            icc_profile = img.info.get('icc_profile')
+
+            # Downscale to the requested resolution
+            if dpi and src_dpi and dpi < src_dpi:
+                img = img.resize(
+                    size=(round(img.width * dpi / src_dpi), round(img.height * dpi / src_dpi)),
+                    resample=Image.Resampling.LANCZOS)
+            out_dpi = dpi if dpi and src_dpi and dpi < src_dpi else src_dpi
+
+            # Encode the image, keeping its color profile
+            kwargs = {'dpi': (out_dpi, out_dpi)} if out_dpi else {}
+            if icc_profile:
+                kwargs['icc_profile'] = icc_profile
+            if target.suffix.lower() == '.png':
+                info = PngInfo()
+                for key, value in metadata.items():
+                    if value:
+                        info.add_text(key.title(), str(value))
+                img.save(temp, format='PNG', pnginfo=info, **kwargs)
+            else:
+                exif = Image.Exif()
+                for tag, key in [
+                    (EXIF_TAG_DESCRIPTION, 'title'),
+                    (EXIF_TAG_ARTIST, 'artist'),
+                    (EXIF_TAG_SOFTWARE, 'software')
+                ]:
+                    if metadata.get(key):
+                        exif[tag] = str(metadata[key])
+                img.convert('RGB').save(
+                    temp, format='JPEG', quality=quality, optimize=True,
+                    subsampling=0, exif=exif.tobytes(), **kwargs)
+        temp.replace(target)
+    finally:
+        with suppress(OSError):
+            source.unlink()
+        with suppress(OSError):
+            temp.unlink(missing_ok=True)
+    return target
+
+
+"""
+* Output Encoder
+"""
+
+
+class OutputEncoder:
+    """Encodes rendered images in the background, so Photoshop can move on to the next card as soon as
+    an intermediate image is saved.
+
+    Notes:
+        Uses threads rather than processes, since Pillow releases the GIL while resizing and encoding, and
+            a spawned process would have to import the entire app.
+
+    Args:
+        max_workers: Maximum number of images to encode at once.
+    """
+
+    def __init__(self, max_workers: int = 2):
+        self._max_workers = max_workers
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = Lock()
+        self._pending: set[Path] = set()
+        self._futures: list[Future] = []
+        self._targets: dict[Path, Future] = {}
+        self._failed: list[tuple[Path, str]] = []
+
+    @property
+    def backlog(self) -> int:
+        """int: Number of images waiting to be encoded or being encoded."""
+        with self._lock:
+            return len(self._pending)
+
+    def submit(
+        self,
+        source: Path,
+        target: Path,
+        quality: int = 95,
+        dpi: Optional[int] = None,
+        metadata: Optional[ExportMetadata] = None
+    ) -> Future:
+        """Queue an intermediate image to be encoded into an output image.
+
+        Args:
+            source: Uncompressed intermediate image.
+            target: Path to save the output image, its suffix determines the format.
+            quality: JPEG quality from 1 to 100, ignored for PNG.
+            dpi: Resolution to downscale the image to, keeps the original resolution if not provided.
+            metadata: Metadata to embed in the output image.
+
+        Returns:
+            Future tracking the encoding job.
+        """
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix='encode')
+            self._pending.add(target)
+            future = self._pool.submit(self._encode, source, target, quality, dpi, metadata)
+            self._futures = [f for f in self._futures if not f.done()] + [future]
+            self._targets[target] = future
+            return future
+
+    def get_future(self, target: Path) -> Optional[Future]:
+        """Returns the job encoding an output image, if one was queued since the last wait.
+
+        Args:
+            target: Path of the output image.
+
+        Returns:
+            Future resolving to the output path, or None if encoding failed.
+        """
+        with self._lock:
+            return self._targets.get(target)
+
+    def wait(self) -> list[tuple[Path, str]]:
+        """Wait for every queued image to finish encoding.
+
+        Returns:
+            Output path and reason for each image which failed to encode since the last wait.
+        """
+        with self._lock:
+            futures, self._futures, self._targets = self._futures, [], {}
+        for future in futures:
+            future.result()
+        with self._lock:
+            failed, self._failed = self._failed, []
+        return failed
+
+    def _encode(self, source: Path, target: Path, *args) -> Optional[Path]:
+        """Encode an image, recording the target as failed if an error occurs."""
+        try:
+            return encode_output(source, target, *args)
+        except Exception as e:
+            CONSOLE.log_exception(e)
+            with self._lock:
+                self._failed.append((target, str(e)))
+        finally:
+            with self._lock:
+                self._pending.discard(target)
+
+
+# Global output encoder
+OUTPUT_ENCODER = OutputEncoder()
@@ -0,0 +1,1301 @@
+"""
+* Utils: Fake Photoshop Backend
+* Only local imports should be `enums` or `utils`.
+"""
+# Standard Library Imports
+import logging
+import sys
+import warnings
+from collections import Counter
+from contextlib import suppress
+from functools import cache
+from pathlib import Path
+from shutil import copyfile
+from threading import Lock
+from typing import Any, Callable, Iterable, Iterator, Optional, Union
+
+# Third Party Imports
+from PIL import Image
+from photoshop.api._core import Photoshop
+from psd_tools import PSDImage
+from psd_tools.api.layers import Layer as PSDLayer
+from psd_tools.constants import Resource
+
+"""
+* Types
+"""
+
+# String IDs mapped to the char ID Photoshop resolves them to, so both conversions return the same type ID
+FAKE_STRING_CHAR_IDS: dict[str, str] = {
+    'application': 'capp', 'document': 'Dcmn', 'layer': 'Lyr ', 'layerSection': 'layerSection',
+    'property': 'Prpr', 'ordinal': 'Ordn', 'targetEnum': 'Trgt', 'target': 'null', 'to': 'T   ',
+    'make': 'Mk  ', 'set': 'setd', 'select': 'slct', 'delete': 'Dlt ', 'show': 'Shw ', 'hide': 'Hd  ',
+    'name': 'Nm  ', 'visible': 'Vsbl', 'opacity': 'Opct', 'bounds': 'bnds', 'left': 'Left', 'top': 'Top ',
+    'right': 'Rght', 'bottom': 'Btom', 'width': 'Wdth', 'height': 'Hght', 'pixelsUnit': '#Pxl',
+    'textKey': 'Txt ', 'textLayer': 'TxLr', 'textStyle': 'TxtS', 'textStyleRange': 'Txtt', 'size': 'Sz  ',
+    'from': 'From', 'layerID': 'LyrI', 'itemIndex': 'ItmI', 'resolution': 'Rslt', 'title': 'Ttl ',
+    'color': 'Clr ', 'red': 'Rd  ', 'green': 'Grn ', 'blue': 'Bl  ', 'RGBColor': 'RGBC'}
+
+# Layer kinds reported by psd-tools mapped to Photoshop's LayerKind values
+FAKE_LAYER_KINDS: dict[str, int] = {
+    'pixel': 1, 'type': 2, 'shape': 3, 'solidcolorfill': 3, 'gradientfill': 4, 'patternfill': 5,
+    'levels': 6, 'curves': 7, 'colorbalance': 8, 'brightnesscontrast': 9, 'huesaturation': 10,
+    'selectivecolor': 11, 'channelmixer': 12, 'gradientmap': 13, 'invert': 14, 'threshold': 15,
+    'posterize': 16, 'smartobject': 17, 'photofilter': 18, 'exposure': 19, 'blackandwhite': 22,
+    'vibrance': 23, 'colorlookup': 24}
+
+# Members which record their own calls in more detail
+FAKE_DETAILED_MEMBERS = {'executeAction'}
+
+# First type ID handed out to string IDs without a char ID
+FAKE_TYPE_ID_START = 3000
+
+# Version reported by the fake application
+FAKE_PHOTOSHOP_VERSION = '25.0.0'
+
+"""
+* Call Log
+"""
+
+
+class FakeCallLog:
+    """Counts every member accessed on a fake Photoshop object.
+
+    Notes:
+        Calls are also reported to the COM profiler when it's loaded and enabled, so templates can be
+            profiled the same way with either backend.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self.calls: Counter[str] = Counter()
+
+    @property
+    def total(self) -> int:
+        """int: Number of calls recorded so far."""
+        return sum(self.calls.values())
+
+    def record(self, member: str) -> None:
+        """Record a member access.
+
+        Args:
+            member: Key of the member accessed, e.g. 'ArtLayer.visible' or 'Application.executeAction(set)'.
+        """
+        with self._lock:
+            self.calls[member] += 1
+        profiler = getattr(sys.modules.get('src.utils.com_profile'), 'COM_PROFILER', None)
+        if profiler is not None and profiler.enabled:
+            profiler.add(member, 0.0)
+
+    def reset(self) -> None:
+        """Clear every recorded call."""
+        with self._lock:
+            self.calls.clear()
+
+    def get_report(self, top: int = 25) -> dict:
+        """Returns the total call count and the most accessed members.
+
+        Args:
+            top: Maximum number of members to list.
+        """
+        with self._lock:
+            return {'calls': sum(self.calls.values()), 'members': dict(self.calls.most_common(top))}
+
+
+# Global fake Photoshop call log
+FAKE_CALL_LOG = FakeCallLog()
+
+"""
+* Base Objects
+"""
+
+
+class FakeMember:
+    """Stand-in for a member the fake backend doesn't implement, does nothing when called."""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __call__(self, *args, **kwargs) -> None:
+        return None
+
+    def __bool__(self) -> bool:
+        return False
+
+
+class FakeDispatch:
+    """Base of every fake Photoshop object, records each public member accessed.
+
+    Notes:
+        - Members not implemented by a subclass are stored on set and returned on get, or stand in as
+            a no-op method if never set.
+        - Photoshop API wrapper objects passed in are unwrapped to the fake object they wrap.
+
+    Args:
+        app: Fake application this object belongs to.
+        props: Initial member values.
+    """
+    typename = 'Object'
+
+    def __init__(self, app: Optional['FakeApplication'] = None, **props):
+        object.__setattr__(self, '_app', app)
+        object.__setattr__(self, '_props', props)
+        if 'typename' in props:
+            object.__setattr__(self, 'typename', props.pop('typename'))
+
+    def __getattribute__(self, name: str) -> Any:
+        if name[0] != '_' and name not in FAKE_DETAILED_MEMBERS:
+            FAKE_CALL_LOG.record(f"{object.__getattribute__(self, 'typename')}.{get_member_name(type(self), name)}")
+        return object.__getattribute__(self, name)
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith('_'):
+            raise AttributeError(name)
+        props = object.__getattribute__(self, '_props')
+        if name in props:
+            return props[name]
+
+        # COM member names are case-insensitive
+        if (member := get_member_name(type(self), name)) != name:
+            return object.__getattribute__(self, member)
+        for key in props:
+            if key.lower() == name.lower():
+                return props[key]
+        return FakeMember(name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name[0] == '_':
+            return object.__setattr__(self, name, value)
+        FAKE_CALL_LOG.record(f'{type(self).typename}.{name} (set)')
+        name = get_member_name(type(self), name)
+        if isinstance(getattr(type(self), name, None), property):
+            return object.__setattr__(self, name, unwrap(value))
+        self._props[next((k for k in self._props if k.lower() == name.lower()), name)] = unwrap(value)
+
+    def __repr__(self) -> str:
+        return f"<{type(self).typename} {self._props.get('name', '')}>"
+
+
+class FakeCollection(FakeDispatch):
+    """Collection of fake objects, indexed by name or position.
+
+    Args:
+        app: Fake application this collection belongs to.
+        typename: Photoshop type name of the collection.
+        items: Returns the items currently in the collection.
+        add: Creates and returns a new item, if the collection supports adding.
+    """
+
+    def __init__(
+        self,
+        app: 'FakeApplication',
+        typename: str,
+        items: Callable[[], list],
+        add: Optional[Callable[[], Any]] = None
+    ):
+        super().__init__(app)
+        object.__setattr__(self, 'typename', typename)
+        object.__setattr__(self, '_items', items)
+        object.__setattr__(self, '_add', add)
+
+    def __iter__(self) -> Iterator:
+        return iter(self._items())
+
+    def __len__(self) -> int:
+        return len(self._items())
+
+    def __bool__(self) -> bool:
+        # Empty collections are still valid objects
+        return True
+
+    def __getitem__(self, key: Union[str, int]) -> Any:
+        items = self._items()
+        if isinstance(key, str):
+            for item in items:
+                if item._props.get('name') == key:
+                    return item
+            raise KeyError(f'No {self.typename} item named "{key}"')
+        return items[key]
+
+    @property
+    def length(self) -> int:
+        return len(self._items())
+
+    @property
+    def Count(self) -> int:
+        return len(self._items())
+
+    def item(self, index: int) -> Any:
+        """Returns an item by its 1-based index, like a COM collection."""
+        return self._items()[index - 1]
+
+    def getByName(self, name: str) -> Any:
+        return self[name]
+
+    def add(self, *args) -> Any:
+        if self._add is None:
+            raise TypeError(f'Items cannot be added to {self.typename}')
+        return self._add(*args)
+
+    def removeAll(self) -> None:
+        for item in list(self._items()):
+            item._delete()
+
+
+"""
+* Colors and Text
+"""
+
+
+class FakeRGBColor(FakeDispatch):
+    """Fake RGB color values."""
+    typename = 'RGBColor'
+
+    def __init__(self, app: Optional['FakeApplication'] = None, red: float = 0, green: float = 0, blue: float = 0):
+        super().__init__(app, red=red, green=green, blue=blue)
+
+    @property
+    def hexValue(self) -> str:
+        return ''.join(f"{round(self._props[c]):02X}" for c in ('red', 'green', 'blue'))
+
+
+class FakeSolidColor(FakeDispatch):
+    """Fake solid color, only the RGB model is tracked."""
+    typename = 'SolidColor'
+
+    def __init__(self, app: Optional['FakeApplication'] = None, rgb: Optional[FakeRGBColor] = None):
+        super().__init__(app, rgb=rgb or FakeRGBColor(app), model=2)
+
+    def isEqual(self, color: Any) -> bool:
+        color = unwrap(color)
+        return all(
+            self._props['rgb']._props[c] == color._props['rgb']._props[c]
+            for c in ('red', 'green', 'blue'))
+
+
+class FakeTextFont(FakeDispatch):
+    """Fake installed font, every requested font is treated as installed."""
+    typename = 'TextFont'
+
+    def __init__(self, app: 'FakeApplication', name: str):
+        super().__init__(app, name=name, postScriptName=name, family=name, style='Regular')
+
+
+class FakeTextItem(FakeDispatch):
+    """Fake text item of a text layer.
+
+    Args:
+        app: Fake application this text item belongs to.
+        layer: Text layer this text item belongs to.
+        props: Text item values read from the PSD.
+    """
+    typename = 'TextItem'
+
+    def __init__(self, app: 'FakeApplication', layer: 'FakeArtLayer', **props):
+        super().__init__(app, **{
+            'contents': '', 'font': '', 'size': 12.0, 'color': FakeSolidColor(app), 'position': [0, 0],
+            'justification': 1, 'kind': 1, 'leading': 0.0, 'tracking': 0, 'useAutoLeading': True,
+            'width': 0.0, 'height': 0.0, **props})
+        object.__setattr__(self, '_layer', layer)
+
+    @property
+    def parent(self) -> 'FakeArtLayer':
+        return self._layer
+
+
+"""
+* Layers
+"""
+
+
+class FakeArtLayer(FakeDispatch):
+    """Fake art layer.
+
+    Args:
+        app: Fake application this layer belongs to.
+        parent: Document or layer group containing this layer.
+        layer_id: Unique ID of the layer within its document.
+        props: Layer values read from the PSD.
+    """
+    typename = 'ArtLayer'
+
+    def __init__(self, app: 'FakeApplication', parent: 'FakeContainer', layer_id: int, **props):
+        super().__init__(app, **{
+            'name': 'Layer', 'visible': True, 'opacity': 100.0, 'fillOpacity': 100.0, 'blendMode': 2,
+            'kind': 1, 'bounds': [0, 0, 0, 0], 'allLocked': False, 'pixelsLocked': False,
+            'positionLocked': False, 'transparentPixelsLocked': False, 'grouped': False,
+            'isBackgroundLayer': False, **props})
+        object.__setattr__(self, '_parent', parent)
+        object.__setattr__(self, '_id', layer_id)
+        object.__setattr__(self, '_text', None)
+
+    def _copy(self, parent: 'FakeContainer') -> 'FakeArtLayer':
+        """Returns a copy of this layer with a new ID, belonging to a given container."""
+        layer = type(self)(self._app, parent, self._document._next_id(), **dict(self._props))
+        if self._text is not None:
+            object.__setattr__(layer, '_text', FakeTextItem(self._app, layer, **dict(self._text._props)))
+        return layer
+
+    @property
+    def _document(self) -> 'FakeDocument':
+        """FakeDocument: Document containing this layer."""
+        parent = self._parent
+        while not isinstance(parent, FakeDocument):
+            parent = parent._parent
+        return parent
+
+    """
+    * Properties
+    """
+
+    @property
+    def id(self) -> int:
+        return self._id
+
+    @property
+    def parent(self) -> 'FakeContainer':
+        return self._parent
+
+    @property
+    def itemIndex(self) -> int:
+        return self._document._get_item_index(self)
+
+    @property
+    def textItem(self) -> FakeTextItem:
+        if self._text is None:
+            raise TypeError(f'Layer "{self._props["name"]}" is not a text layer')
+        return self._text
+
+    @property
+    def _bounds(self) -> list[float]:
+        """list[float]: Bounds of this layer, without recording the access."""
+        return self._props['bounds']
+
+    """
+    * Methods
+    """
+
+    def delete(self) -> None:
+        self._delete()
+
+    def duplicate(self, relativeObject: Any = None, insertionLocation: Any = None) -> 'FakeArtLayer':
+        layer = self._copy(self._parent)
+        layer._props['name'] = f"{self._props['name']} copy"
+        self._parent._children.insert(self._parent._children.index(self), layer)
+        if relativeObject is not None:
+            layer._move(relativeObject, insertionLocation)
+
+            # Layers duplicated into another document are given IDs from that document
+            if (doc := layer._document) is not self._document:
+                for node in [layer, *(layer._walk() if isinstance(layer, FakeLayerSet) else [])]:
+                    object.__setattr__(node, '_id', doc._next_id())
+        return layer
+
+    def move(self, relativeObject: Any, insertionLocation: int) -> None:
+        self._move(relativeObject, insertionLocation)
+
+    def translate(self, deltaX: float = 0, deltaY: float = 0) -> None:
+        self._translate(deltaX, deltaY)
+
+    def resize(self, horizontal: float = 100, vertical: float = 100, anchor: Any = None) -> None:
+        self._resize(horizontal, vertical)
+
+    def rasterize(self, *_args) -> None:
+        self._props['kind'] = 1
+        object.__setattr__(self, '_text', None)
+
+    def merge(self) -> 'FakeArtLayer':
+        return self
+
+    """
+    * Implementation
+    """
+
+    def _delete(self) -> None:
+        """Remove this layer from its container."""
+        self._parent._children.remove(self)
+        doc = self._document
+        if doc._active is self:
+            object.__setattr__(doc, '_active', None)
+
+    def _move(self, relativeObject: Any, insertionLocation: int) -> None:
+        """Move this layer relative to another layer, or into a container."""
+        relative = unwrap(relativeObject)
+        self._parent._children.remove(self)
+        if isinstance(relative, FakeContainer) and insertionLocation in (0, 1):
+            # PlaceInside or PlaceAtBeginning
+            object.__setattr__(self, '_parent', relative)
+            relative._children.insert(0, self)
+        elif isinstance(relative, FakeContainer) and insertionLocation == 2:
+            # PlaceAtEnd
+            object.__setattr__(self, '_parent', relative)
+            relative._children.append(self)
+        else:
+            # PlaceBefore or PlaceAfter
+            object.__setattr__(self, '_parent', relative._parent)
+            index = relative._parent._children.index(relative)
+            relative._parent._children.insert(index + (1 if insertionLocation == 4 else 0), self)
+
+    def _translate(self, deltaX: float, deltaY: float) -> None:
+        """Offset the bounds of this layer."""
+        left, top, right, bottom = self._props['bounds']
+        self._props['bounds'] = [left + deltaX, top + deltaY, right + deltaX, bottom + deltaY]
+
+    def _resize(self, horizontal: float, vertical: float) -> None:
+        """Scale the bounds of this layer around its center by a percentage."""
+        left, top, right, bottom = self._props['bounds']
+        cx, cy = (left + right) / 2, (top + bottom) / 2
+        w, h = (right - left) * horizontal / 200, (bottom - top) * vertical / 200
+        self._props['bounds'] = [cx - w, cy - h, cx + w, cy + h]
+
+
+class FakeContainer(FakeDispatch):
+    """Base of fake documents and layer groups, which contain child layers ordered top to bottom."""
+
+    def __init__(self, app: Optional['FakeApplication'] = None, **props):
+        super().__init__(app, **props)
+        object.__setattr__(self, '_children', [])
+
+    @property
+    def layers(self) -> FakeCollection:
+        return FakeCollection(self._app, 'Layers', lambda: list(self._children))
+
+    @property
+    def artLayers(self) -> FakeCollection:
+        return FakeCollection(
+            self._app, 'ArtLayers', add=self._add_layer,
+            items=lambda: [n for n in self._children if not isinstance(n, FakeLayerSet)])
+
+    @property
+    def layerSets(self) -> FakeCollection:
+        return FakeCollection(
+            self._app, 'LayerSets', add=self._add_group,
+            items=lambda: [n for n in self._children if isinstance(n, FakeLayerSet)])
+
+    def _walk(self) -> Iterator[FakeArtLayer]:
+        """Yields every layer nested within this container, top to bottom."""
+        for child in self._children:
+            yield child
+            if isinstance(child, FakeLayerSet):
+                yield from child._walk()
+
+    def _add_layer(self) -> FakeArtLayer:
+        """Adds a new empty art layer at the top of this container."""
+        doc = self if isinstance(self, FakeDocument) else self._document
+        layer = FakeArtLayer(self._app, self, doc._next_id(), name=f'Layer {doc._last_id}')
+        self._children.insert(0, layer)
+        object.__setattr__(doc, '_active', layer)
+        return layer
+
+    def _add_group(self) -> 'FakeLayerSet':
+        """Adds a new empty layer group at the top of this container."""
+        doc = self if isinstance(self, FakeDocument) else self._document
+        group = FakeLayerSet(self._app, self, doc._next_id(), name=f'Group {doc._last_id}')
+        self._children.insert(0, group)
+        object.__setattr__(doc, '_active', group)
+        return group
+
+
+class FakeLayerSet(FakeContainer, FakeArtLayer):
+    """Fake layer group, its bounds are the combined bounds of its visible children."""
+    typename = 'LayerSet'
+
+    def __init__(self, app: 'FakeApplication', parent: FakeContainer, layer_id: int, **props):
+        FakeArtLayer.__init__(self, app, parent, layer_id, **{'kind': 0, **props})
+        object.__setattr__(self, '_children', [])
+
+    def _copy(self, parent: FakeContainer) -> 'FakeLayerSet':
+        group = FakeArtLayer._copy(self, parent)
+        object.__setattr__(group, '_children', [n._copy(group) for n in self._children])
+        return group
+
+    @property
+    def bounds(self) -> list[float]:
+        return self._bounds
+
+    @property
+    def _bounds(self) -> list[float]:
+        """list[float]: Bounds of this group, without recording the access."""
+        bounds = [n._bounds for n in self._children if n._props['visible']]
+        bounds = [b for b in bounds if b[2] > b[0] and b[3] > b[1]]
+        if not bounds:
+            return [0, 0, 0, 0]
+        return [min(b[0] for b in bounds), min(b[1] for b in bounds),
+                max(b[2] for b in bounds), max(b[3] for b in bounds)]
+
+    def _translate(self, deltaX: float, deltaY: float) -> None:
+        for child in self._children:
+            child._translate(deltaX, deltaY)
+
+    def _resize(self, horizontal: float, vertical: float) -> None:
+        for child in self._children:
+            child._resize(horizontal, vertical)
+
+"""
+* Documents
+"""
+
+
+class FakeDocument(FakeContainer):
+    """Fake document whose layer tree is loaded from a PSD file.
+
+    Args:
+        app: Fake application this document belongs to.
+        path: Path to the PSD file.
+        width: Width of the document in pixels.
+        height: Height of the document in pixels.
+        resolution: Resolution of the document in pixels per inch.
+        composite: Returns the document's composite image, if available.
+    """
+    typename = 'Document'
+
+    def __init__(
+        self,
+        app: 'FakeApplication',
+        path: Path,
+        width: int,
+        height: int,
+        resolution: float = 72.0,
+        composite: Optional[Callable[[], Optional[Image.Image]]] = None
+    ):
+        super().__init__(
+            app, name=path.name, fullName=str(path), path=str(path.parent), width=width,
+            height=height, resolution=resolution, mode=3, bitsPerChannel=8, saved=True)
+        object.__setattr__(self, '_source', path)
+        object.__setattr__(self, '_composite', composite)
+        object.__setattr__(self, '_active', None)
+        object.__setattr__(self, '_last_id', 0)
+        object.__setattr__(self, '_parent', None)
+
+    def _next_id(self) -> int:
+        """Returns a new unique layer ID."""
+        object.__setattr__(self, '_last_id', self._last_id + 1)
+        return self._last_id
+
+    def _get_layer(self, layer_id: Optional[int] = None, name: Optional[str] = None) -> Optional[FakeArtLayer]:
+        """Returns the first layer matching an ID or name."""
+        for layer in self._walk():
+            if (layer_id is not None and layer._id == layer_id) or (name is not None and layer._props['name'] == name):
+                return layer
+        return None
+
+    def _get_item_index(self, layer: FakeArtLayer) -> int:
+        """Returns the 1-based index of a layer counted from the bottom of the document."""
+        layers = list(self._walk())
+        return len(layers) - layers.index(layer)
+
+    """
+    * Properties
+    """
+
+    @property
+    def id(self) -> int:
+        return id(self)
+
+    @property
+    def activeLayer(self) -> FakeArtLayer:
+        if self._active is None and self._children:
+            object.__setattr__(self, '_active', self._children[0])
+        return self._active
+
+    @activeLayer.setter
+    def activeLayer(self, layer: Any) -> None:
+        object.__setattr__(self, '_active', unwrap(layer))
+
+    @property
+    def selection(self) -> FakeDispatch:
+        return FakeDispatch(self._app, typename='Selection', bounds=[0, 0, self._props['width'], self._props['height']])
+
+    """
+    * Methods
+    """
+
+    def saveAs(self, file_path: str, options: Any = None, asCopy: bool = True, extensionType: Any = None) -> None:
+        path = Path(file_path)
+        if path.suffix.lower() in ('.psd', '.psb'):
+            copyfile(self._source, path)
+            return
+        image = None
+        with suppress(Exception):
+            image = self._composite() if self._composite else None
+        image = image or Image.new('RGB', (self._props['width'], self._props['height']))
+        if image.mode not in ('RGB', 'RGBA') or path.suffix.lower() in ('.jpg', '.jpeg'):
+            image = image.convert('RGB')
+        dpi = round(self._props['resolution'])
+        image.save(path, dpi=(dpi, dpi))
+
+    def save(self) -> None:
+        self._props['saved'] = True
+
+    def close(self, saving: Any = None) -> None:
+        with suppress(ValueError):
+            self._app._docs.remove(self)
+
+    def duplicate(self, name: Optional[str] = None, merge_layers_only: bool = False) -> 'FakeDocument':
+        doc = FakeDocument(
+            self._app, self._source.with_name(name or f'{self._source.stem} copy{self._source.suffix}'),
+            self._props['width'], self._props['height'], self._props['resolution'], self._composite)
+        object.__setattr__(doc, '_last_id', self._last_id)
+        object.__setattr__(doc, '_children', [n._copy(doc) for n in self._children])
+        self._app._docs.append(doc)
+        self._app._active = doc
+        return doc
+
+    def resizeImage(self, width: Optional[float] = None, height: Optional[float] = None,
+                    resolution: Optional[float] = None, automatic: Any = None) -> None:
+        if resolution:
+            ratio = resolution / self._props['resolution']
+            self._props.update(
+                width=round(self._props['width'] * ratio),
+                height=round(self._props['height'] * ratio),
+                resolution=resolution)
+        self._props['width'] = round(width or self._props['width'])
+        self._props['height'] = round(height or self._props['height'])
+
+    def crop(self, bounds: Iterable[float], *_args) -> None:
+        left, top, right, bottom = bounds
+        self._props.update(width=round(right - left), height=round(bottom - top))
+        for layer in self._children:
+            layer._translate(-left, -top)
+
+
+"""
+* Action Manager
+"""
+
+
+class FakeActionValues(FakeDispatch):
+    """Base of fake action descriptors and lists, storing typed values.
+
+    Notes:
+        Getting a missing value raises a KeyError, like the COMError Photoshop raises.
+    """
+
+    def __init__(self, app: Optional['FakeApplication'] = None):
+        super().__init__(app)
+        object.__setattr__(self, '_values', {})
+
+    def _put(self, key: Any, kind: str, value: Any) -> None:
+        """Store a typed value."""
+        self._values[key] = (kind, unwrap(value))
+
+    def _get(self, key: Any, index: int = 1) -> Any:
+        """Returns a stored value, or a part of a multipart value."""
+        kind, value = self._values[key]
+        return value[index] if isinstance(value, tuple) else value
+
+    def clear(self) -> None:
+        self._values.clear()
+
+    @property
+    def count(self) -> int:
+        return len(self._values)
+
+    def getType(self, key: Any) -> str:
+        return self._values[key][0]
+
+    def getBoolean(self, key: Any) -> bool:
+        return bool(self._get(key))
+
+    def getInteger(self, key: Any) -> int:
+        return int(self._get(key))
+
+    def getLargeInteger(self, key: Any) -> int:
+        return int(self._get(key))
+
+    def getDouble(self, key: Any) -> float:
+        return float(self._get(key))
+
+    def getString(self, key: Any) -> str:
+        return str(self._get(key))
+
+    def getPath(self, key: Any) -> str:
+        return str(self._get(key))
+
+    def getClass(self, key: Any) -> int:
+        return self._get(key)
+
+    def getEnumerationType(self, key: Any) -> int:
+        return self._get(key, 0)
+
+    def getEnumerationValue(self, key: Any) -> int:
+        return self._get(key, 1)
+
+    def getUnitDoubleType(self, key: Any) -> int:
+        return self._get(key, 0)
+
+    def getUnitDoubleValue(self, key: Any) -> float:
+        return float(self._get(key, 1))
+
+    def getObjectType(self, key: Any) -> int:
+        return self._get(key, 0)
+
+    def getObjectValue(self, key: Any) -> 'FakeActionDescriptor':
+        return self._get(key, 1)
+
+    def getList(self, key: Any) -> 'FakeActionList':
+        return self._get(key)
+
+    def getReference(self, key: Any) -> 'FakeActionReference':
+        return self._get(key)
+
+    def getData(self, key: Any) -> bytes:
+        return self._get(key)
+
+
+class FakeActionDescriptor(FakeActionValues):
+    """Fake action descriptor, values are mapped to their type ID."""
+    typename = 'ActionDescriptor'
+
+    def hasKey(self, key: int) -> bool:
+        return key in self._values
+
+    def getKey(self, index: int) -> int:
+        return list(self._values)[index]
+
+    def erase(self, key: int) -> None:
+        self._values.pop(key, None)
+
+    def isEqual(self, other: Any) -> bool:
+        return self._values == unwrap(other)._values
+
+    def putBoolean(self, key: int, value: bool) -> None:
+        self._put(key, 'boolean', value)
+
+    def putInteger(self, key: int, value: int) -> None:
+        self._put(key, 'integer', value)
+
+    def putLargeInteger(self, key: int, value: int) -> None:
+        self._put(key, 'largeInteger', value)
+
+    def putDouble(self, key: int, value: float) -> None:
+        self._put(key, 'double', value)
+
+    def putString(self, key: int, value: str) -> None:
+        self._put(key, 'string', value)
+
+    def putPath(self, key: int, value: Any) -> None:
+        self._put(key, 'alias', str(value))
+
+    def putClass(self, key: int, value: int) -> None:
+        self._put(key, 'class', value)
+
+    def putEnumerated(self, key: int, enum_type: int, value: int) -> None:
+        self._put(key, 'enumerated', (enum_type, value))
+
+    def putUnitDouble(self, key: int, unit: int, value: float) -> None:
+        self._put(key, 'unitDouble', (unit, value))
+
+    def putObject(self, key: int, class_id: int, value: Any) -> None:
+        self._put(key, 'object', (class_id, unwrap(value)))
+
+    def putList(self, key: int, value: Any) -> None:
+        self._put(key, 'list', value)
+
+    def putReference(self, key: int, value: Any) -> None:
+        self._put(key, 'reference', value)
+
+    def putData(self, key: int, value: bytes) -> None:
+        self._put(key, 'rawData', value)
+
+
+class FakeActionList(FakeActionValues):
+    """Fake action list, values are mapped to their index."""
+    typename = 'ActionList'
+
+    def _append(self, kind: str, value: Any) -> None:
+        """Append a typed value."""
+        self._put(len(self._values), kind, value)
+
+    def putBoolean(self, value: bool) -> None:
+        self._append('boolean', value)
+
+    def putInteger(self, value: int) -> None:
+        self._append('integer', value)
+
+    def putLargeInteger(self, value: int) -> None:
+        self._append('largeInteger', value)
+
+    def putDouble(self, value: float) -> None:
+        self._append('double', value)
+
+    def putString(self, value: str) -> None:
+        self._append('string', value)
+
+    def putPath(self, value: Any) -> None:
+        self._append('alias', str(value))
+
+    def putClass(self, value: int) -> None:
+        self._append('class', value)
+
+    def putEnumerated(self, enum_type: int, value: int) -> None:
+        self._append('enumerated', (enum_type, value))
+
+    def putUnitDouble(self, unit: int, value: float) -> None:
+        self._append('unitDouble', (unit, value))
+
+    def putObject(self, class_id: int, value: Any) -> None:
+        self._append('object', (class_id, unwrap(value)))
+
+    def putList(self, value: Any) -> None:
+        self._append('list', value)
+
+    def putReference(self, value: Any) -> None:
+        self._append('reference', value)
+
+    def putData(self, value: bytes) -> None:
+        self._append('rawData', value)
+
+
+class FakeActionReference(FakeDispatch):
+    """Fake action reference, a chain of (form, class ID, value) entries from the innermost outwards."""
+    typename = 'ActionReference'
+
+    def __init__(self, app: Optional['FakeApplication'] = None, entries: Optional[list] = None):
+        super().__init__(app)
+        object.__setattr__(self, '_entries', entries or [])
+
+    def putClass(self, class_id: int) -> None:
+        self._entries.append(('class', class_id, None))
+
+    def putEnumerated(self, class_id: int, enum_type: int, value: int) -> None:
+        self._entries.append(('enumerated', class_id, (enum_type, value)))
+
+    def putIdentifier(self, class_id: int, value: int) -> None:
+        self._entries.append(('identifier', class_id, value))
+
+    def putIndex(self, class_id: int, value: int) -> None:
+        self._entries.append(('index', class_id, value))
+
+    def putName(self, class_id: int, value: str) -> None:
+        self._entries.append(('name', class_id, value))
+
+    def putOffset(self, class_id: int, value: int) -> None:
+        self._entries.append(('offset', class_id, value))
+
+    def putProperty(self, class_id: int, value: int) -> None:
+        self._entries.append(('property', class_id, value))
+
+    def getForm(self) -> str:
+        return self._entries[0][0]
+
+    def getDesiredClass(self) -> int:
+        return self._entries[0][1]
+
+    def getIdentifier(self) -> int:
+        return self._entries[0][2]
+
+    def getIndex(self) -> int:
+        return self._entries[0][2]
+
+    def getName(self) -> str:
+        return self._entries[0][2]
+
+    def getProperty(self) -> int:
+        return self._entries[0][2]
+
+    def getEnumeratedType(self) -> int:
+        return self._entries[0][2][0]
+
+    def getEnumeratedValue(self) -> int:
+        return self._entries[0][2][1]
+
+    def getContainer(self) -> 'FakeActionReference':
+        return FakeActionReference(self._app, self._entries[1:])
+
+
+"""
+* Application
+"""
+
+
+class FakeApplication(FakeDispatch):
+    """Fake Photoshop application, holding the open documents and the type ID table."""
+    typename = 'Application'
+
+    def __init__(self):
+        super().__init__(
+            None, name='Adobe Photoshop', version=FAKE_PHOTOSHOP_VERSION, displayDialogs=3,
+            preferences=FakeDispatch(None, rulerUnits=1, typeUnits=5),
+            foregroundColor=FakeSolidColor(None), backgroundColor=FakeSolidColor(
+                None, FakeRGBColor(None, 255, 255, 255)))
+        object.__setattr__(self, '_app', self)
+        object.__setattr__(self, '_docs', [])
+        object.__setattr__(self, '_active', None)
+        object.__setattr__(self, '_fonts', {})
+        object.__setattr__(self, '_type_ids', {})
+        object.__setattr__(self, '_type_names', {})
+
+    """
+    * Documents
+    """
+
+    @property
+    def documents(self) -> FakeCollection:
+        return FakeCollection(self, 'Documents', lambda: list(self._docs), add=self._add_document)
+
+    @property
+    def activeDocument(self) -> FakeDocument:
+        if self._active not in self._docs:
+            if not self._docs:
+                raise IndexError('No document is open')
+            object.__setattr__(self, '_active', self._docs[-1])
+        return self._active
+
+    @activeDocument.setter
+    def activeDocument(self, document: Any) -> None:
+        object.__setattr__(self, '_active', unwrap(document))
+
+    @property
+    def fonts(self) -> FakeCollection:
+        return FakeFonts(self)
+
+    def load(self, path: str) -> None:
+        self.open(path)
+
+    def open(self, path: str, *_args) -> FakeDocument:
+        doc = load_psd_document(self, Path(path))
+        self._docs.append(doc)
+        object.__setattr__(self, '_active', doc)
+        return doc
+
+    def purge(self, *_args) -> None:
+        return None
+
+    def _add_document(
+        self, width: float = 960, height: float = 540, resolution: float = 72.0, name: Optional[str] = None, *_args
+    ) -> FakeDocument:
+        """Adds a new empty document and makes it active."""
+        doc = FakeDocument(
+            self, Path(name or f'Untitled-{len(self._docs) + 1}'), round(width), round(height), resolution)
+        self._docs.append(doc)
+        object.__setattr__(self, '_active', doc)
+        return doc
+
+    def refresh(self) -> None:
+        return None
+
+    def doJavaScript(self, javascript: str, Arguments: Any = None, ExecutionMode: Any = None) -> str:
+        """Evaluates simple property chains such as 'app.activeDocument.activeLayer.typename', and the
+        layer kind script used by the Photoshop API."""
+        obj = self
+        if 'layerKind' in javascript:
+            with suppress(Exception):
+                return str(self.activeDocument.activeLayer._props['kind'])
+        if javascript.startswith('app.') and javascript.replace('.', '').isalnum():
+            with suppress(Exception):
+                for name in javascript.split('.')[1:]:
+                    obj = getattr(obj, name)
+                return str(obj)
+        return ''
+
+    """
+    * Type IDs
+    """
+
+    def charIDToTypeID(self, char_id: str) -> int:
+        return get_char_type_id(char_id)
+
+    def typeIDToCharID(self, type_id: int) -> str:
+        return type_id.to_bytes(4, 'big').decode('latin-1') if type_id >= 0x01000000 else ''
+
+    def stringIDToTypeID(self, string_id: str) -> int:
+        return self._type_id(string_id)
+
+    def typeIDToStringID(self, type_id: int) -> str:
+        return self._type_names.get(type_id, '')
+
+    def _type_id(self, string_id: str) -> int:
+        """Returns the type ID of a string ID, without recording the call."""
+        if string_id in self._type_ids:
+            return self._type_ids[string_id]
+        char_id = FAKE_STRING_CHAR_IDS.get(string_id, '')
+        type_id = get_char_type_id(char_id) if len(char_id) == 4 else FAKE_TYPE_ID_START + len(self._type_ids)
+        self._type_ids[string_id] = type_id
+        self._type_names.setdefault(type_id, string_id)
+        return type_id
+
+    def _is(self, type_id: int, string_id: str) -> bool:
+        """Returns True if a type ID was converted from a string ID or its equivalent char ID."""
+        return type_id == self._type_id(string_id)
+
+    """
+    * Action Manager
+    """
+
+    def executeAction(self, event_id: int, descriptor: Any = None, display_dialogs: Any = None) -> FakeActionDescriptor:
+        event = self._type_names.get(event_id) or event_id.to_bytes(4, 'big').decode('latin-1')
+        FAKE_CALL_LOG.record(f'Application.executeAction({event})')
+        kind, value = getattr(unwrap(descriptor), '_values', {}).get(self._type_id('target'), (None, None))
+        references = [value] if kind == 'reference' else [
+            v for k, v in value._values.values() if k == 'reference'] if kind == 'list' else []
+
+        # Apply the few events which change the layer tree
+        for target in [self._resolve(r) for r in references]:
+            if not isinstance(target, FakeArtLayer):
+                continue
+            if event == 'select':
+                object.__setattr__(target._document, '_active', target)
+            elif event == 'delete':
+                target._delete()
+            elif event in ('show', 'hide'):
+                target._props['visible'] = event == 'show'
+        return FakeActionDescriptor(self)
+
+    def executeActionGet(self, reference: Any) -> FakeActionDescriptor:
+        target = self._resolve(unwrap(reference))
+        if isinstance(target, FakeArtLayer):
+            return get_layer_descriptor(self, target)
+        if isinstance(target, FakeDocument):
+            return get_document_descriptor(self, target)
+        return FakeActionDescriptor(self)
+
+    def _resolve(self, reference: FakeActionReference) -> Union[FakeArtLayer, FakeDocument, None]:
+        """Returns the layer or document an action reference points to."""
+        for form, class_id, value in reference._entries:
+            if form in ('property', 'class'):
+                continue
+            if self._is(class_id, 'layer'):
+                with suppress(IndexError):
+                    doc = self.activeDocument
+                    if form == 'identifier':
+                        return doc._get_layer(layer_id=value)
+                    if form == 'name':
+                        return doc._get_layer(name=value)
+                    if form == 'index':
+                        layers = list(doc._walk())
+                        return layers[len(layers) - value] if 0 < value <= len(layers) else None
+                    return doc.activeLayer
+            if self._is(class_id, 'document'):
+                with suppress(IndexError):
+                    return self.activeDocument
+            return None
+        return None
+
+
+class FakeFonts(FakeCollection):
+    """Fake installed fonts, every requested font is treated as installed."""
+
+    def __init__(self, app: FakeApplication):
+        super().__init__(app, 'TextFonts', lambda: list(app._fonts.values()))
+
+    def __getitem__(self, key: Union[str, int]) -> FakeTextFont:
+        if isinstance(key, str):
+            return self._app._fonts.setdefault(key, FakeTextFont(self._app, key))
+        return super().__getitem__(key)
+
+
+"""
+* Descriptors
+"""
+
+
+def get_descriptor(app: FakeApplication, values: dict[str, tuple[str, Any]]) -> FakeActionDescriptor:
+    """Returns a descriptor holding typed values, without recording the calls.
+
+    Args:
+        app: Fake application the descriptor belongs to.
+        values: Value type and value, mapped to their string ID.
+    """
+    desc = FakeActionDescriptor(app)
+    for key, (kind, value) in values.items():
+        desc._put(app._type_id(key), kind, value)
+    return desc
+
+
+def get_bounds_descriptor(app: FakeApplication, bounds: list[float]) -> FakeActionDescriptor:
+    """Returns a rectangle descriptor in pixels."""
+    px, (left, top, right, bottom) = app._type_id('pixelsUnit'), bounds
+    return get_descriptor(app, {
+        key: ('unitDouble', (px, value)) for key, value in (
+            ('left', left), ('top', top), ('right', right), ('bottom', bottom),
+            ('width', right - left), ('height', bottom - top))})
+
+
+def get_layer_descriptor(app: FakeApplication, layer: FakeArtLayer) -> FakeActionDescriptor:
+    """Returns the descriptor Photoshop reports for a layer."""
+    sID, props = app._type_id, layer._props
+    bounds = ('object', (sID('rectangle'), get_bounds_descriptor(app, layer._bounds)))
+    values = {
+        'name': ('string', props['name']),
+        'layerID': ('integer', layer._id),
+        'itemIndex': ('integer', layer._document._get_item_index(layer)),
+        'visible': ('boolean', props['visible']),
+        'opacity': ('unitDouble', (sID('percentUnit'), props['opacity'])),
+        'layerKind': ('integer', props['kind']),
+        'bounds': bounds,
+        'boundsNoEffects': bounds,
+        'layerEffects': ('object', (sID('layerEffects'), FakeActionDescriptor(app)))}
+    if layer._text is not None:
+        text = layer._text._props
+        style = get_descriptor(app, {
+            'fontPostScriptName': ('string', text['font']),
+            'size': ('unitDouble', (sID('pointsUnit'), text['size']))})
+        style_range = get_descriptor(app, {
+            'from': ('integer', 0),
+            'to': ('integer', len(text['contents'])),
+            'textStyle': ('object', (sID('textStyle'), style))})
+        ranges = FakeActionList(app)
+        ranges._put(0, 'object', (sID('textStyleRange'), style_range))
+        values['textKey'] = ('object', (sID('textLayer'), get_descriptor(app, {
+            'textKey': ('string', text['contents']),
+            'textStyleRange': ('list', ranges)})))
+    return get_descriptor(app, values)
+
+
+def get_document_descriptor(app: FakeApplication, doc: FakeDocument) -> FakeActionDescriptor:
+    """Returns the descriptor Photoshop reports for a document."""
+    px, props = app._type_id('pixelsUnit'), doc._props
+    return get_descriptor(app, {
+        'title': ('string', props['name']),
+        'width': ('unitDouble', (px, props['width'])),
+        'height': ('unitDouble', (px, props['height'])),
+        'resolution': ('double', props['resolution']),
+        'numberOfLayers': ('integer', len(list(doc._walk())))})
+
+
+"""
+* Loading PSD Files
+"""
+
+
+def load_psd_document(app: FakeApplication, path: Path) -> FakeDocument:
+    """Builds a fake document from the layer tree of a PSD file.
+
+    Args:
+        app: Fake application the document belongs to.
+        path: Path to the PSD file.
+
+    Returns:
+        Fake document mirroring the PSD's layers, bounds, and text.
+    """
+    logging.getLogger('psd_tools').setLevel(logging.FATAL)
+    with warnings.catch_warnings():
+        warnings.filterwarnings('ignore', module='psd_tools')
+        psd = PSDImage.open(path)
+
+    # Resolution is stored as 16.16 fixed point
+    resolution = 72.0
+    with suppress(Exception):
+        resolution = psd.image_resources.get_data(Resource.RESOLUTION_INFO).horizontal / 65536
+
+    doc = FakeDocument(app, path, psd.width, psd.height, resolution, composite=psd.topil)
+    add_psd_layers(app, doc, psd)
+    object.__setattr__(doc, '_last_id', max((n._id for n in doc._walk()), default=0))
+    return doc
+
+
+def add_psd_layers(app: FakeApplication, container: FakeContainer, group: Iterable[PSDLayer]) -> None:
+    """Adds the layers of a PSD group to a fake container, psd-tools lists layers bottom to top.
+
+    Args:
+        app: Fake application the layers belong to.
+        container: Fake document or layer group to add the layers to.
+        group: PSD document or group containing the layers.
+    """
+    for psd_layer in reversed(list(group)):
+        props = {
+            'name': psd_layer.name,
+            'visible': psd_layer.visible,
+            'opacity': round(psd_layer.opacity / 2.55, 1),
+            'kind': FAKE_LAYER_KINDS.get(psd_layer.kind, 1),
+            'bounds': list(psd_layer.bbox)}
+        if psd_layer.is_group():
+            layer = FakeLayerSet(app, container, psd_layer.layer_id, **{**props, 'kind': 0})
+            add_psd_layers(app, layer, psd_layer)
+        else:
+            layer = FakeArtLayer(app, container, psd_layer.layer_id, **props)
+            if psd_layer.kind == 'type':
+                object.__setattr__(layer, '_text', get_psd_text_item(app, layer, psd_layer))
+        container._children.append(layer)
+
+
+def get_psd_text_item(app: FakeApplication, layer: FakeArtLayer, psd_layer: PSDLayer) -> FakeTextItem:
+    """Builds a fake text item from the text and first style run of a PSD type layer.
+
+    Args:
+        app: Fake application the text item belongs to.
+        layer: Fake layer the text item belongs to.
+        psd_layer: PSD type layer.
+
+    Returns:
+        Fake text item with the layer's contents, font, size, color, and position.
+    """
+    props: dict[str, Any] = {'contents': psd_layer.text.replace('\r', '\n').rstrip('\n')}
+    with suppress(Exception):
+        props['position'] = [psd_layer.transform[4], psd_layer.transform[5]]
+    with suppress(Exception):
+        style = psd_layer.engine_dict['StyleRun']['RunArray'][0]['StyleSheet']['StyleSheetData']
+        props['size'] = float(style['FontSize'])
+        props['font'] = str(psd_layer.resource_dict['FontSet'][style['Font']]['Name'])
+        app._fonts.setdefault(props['font'], FakeTextFont(app, props['font']))
+        if 'FillColor' in style:
+            _, r, g, b = [float(n) * 255 for n in style['FillColor']['Values']]
+            props['color'] = FakeSolidColor(app, FakeRGBColor(app, r, g, b))
+    with suppress(Exception):
+        # Paragraph text has a bounding box
+        if psd_layer.engine_dict['Rendered']['Shapes']['Children'][0]['ShapeType'] == 1:
+            left, top, right, bottom = psd_layer.bbox
+            props.update(kind=2, width=float(right - left), height=float(bottom - top))
+    return FakeTextItem(app, layer, **props)
+
+
+"""
+* Installing
+"""
+
+
+def get_char_type_id(char_id: str) -> int:
+    """Returns the type ID of a char ID, its four characters read as a big-endian integer like Photoshop."""
+    return int.from_bytes(char_id.ljust(4)[:4].encode('latin-1'), 'big')
+
+
+@cache
+def get_member_name(cls: type, name: str) -> str:
+    """Returns the name of a member defined on a fake class matching a name regardless of case, or the
+    name itself if no member matches."""
+    for member in dir(cls):
+        if member.lower() == name.lower() and not member.startswith('_'):
+            return member
+    return name
+
+
+def unwrap(value: Any) -> Any:
+    """Returns the fake object wrapped by a Photoshop API object, or the value itself."""
+    return object.__getattribute__(value, 'app') if isinstance(value, Photoshop) else value
+
+
+def get_fake_object(api_object: Photoshop, *_args) -> FakeDispatch:
+    """Replacement for `Photoshop._get_application_object`, returns a fake object for the API object type.
+
+    Args:
+        api_object: Photoshop API object being created.
+    """
+    if (name := api_object.object_name) == 'Application':
+        return FAKE_APP
+    if name in FAKE_OBJECT_TYPES:
+        return FAKE_OBJECT_TYPES[name](FAKE_APP)
+    return FakeDispatch(FAKE_APP, typename=name)
+
+
+def install_fake_backend() -> FakeApplication:
+    """Route every Photoshop API object to the fake backend instead of Photoshop's COM server.
+
+    Returns:
+        The fake application object.
+    """
+    Photoshop._get_application_object = get_fake_object
+    Photoshop._get_photoshop_versions = lambda *_args: ['']
+    return FAKE_APP
+
+
+# Fake object types created by the Photoshop API, mapped to their object name
+FAKE_OBJECT_TYPES: dict[str, type[FakeDispatch]] = {
+    'ActionDescriptor': FakeActionDescriptor,
+    'ActionList': FakeActionList,
+    'ActionReference': FakeActionReference,
+    'SolidColor': FakeSolidColor,
+    'RGBColor': FakeRGBColor}
+
+# Global fake application
+FAKE_APP = FakeApplication()
@@ -0,0 +1,127 @@
+"""
+* Utils: Fake Windows Modules
+* Only standard library imports, this module is loaded before the Photoshop API.
+"""
+# Standard Library Imports
+import sys
+from importlib.util import find_spec
+from os import environ
+from types import ModuleType
+from typing import Any, Callable
+
+"""
+* Types
+"""
+
+# Environment variable which enables the fake Photoshop backend, read before the app environment is loaded
+FAKE_BACKEND_ENVVAR = 'PROXYSHOP_PS_FAKE_BACKEND'
+
+# Values of the environment variable which enable the fake backend
+FAKE_BACKEND_ENABLED = {'1', 'true', 'yes', 'on'}
+
+
+class FakeCOMError(Exception):
+    """Stands in for `comtypes.COMError` where comtypes can't be imported."""
+
+    def __init__(self, hresult: int = 0, text: str = '', details: Any = None):
+        super().__init__(hresult, text, details)
+        self.hresult, self.text, self.details = hresult, text, details
+
+
+class FakeDispatch:
+    """Stands in for the comtypes dispatch classes, no object is ever created from it."""
+
+
+"""
+* Fake Modules
+"""
+
+
+def get_fake_winreg() -> ModuleType:
+    """Returns a `winreg` module with no registry keys, so Photoshop is never found installed."""
+
+    def open_key(*_args, **_kwargs) -> None:
+        raise FileNotFoundError('No registry on this platform!')
+
+    return get_fake_module(
+        'winreg',
+        HKEYType=object,
+        HKEY_LOCAL_MACHINE=0x80000002,
+        KEY_READ=0x20019,
+        KEY_WOW64_32KEY=0x0200,
+        KEY_WOW64_64KEY=0x0100,
+        OpenKey=open_key,
+        QueryInfoKey=open_key,
+        EnumKey=open_key,
+        QueryValueEx=open_key)
+
+
+def get_fake_comtypes() -> list[ModuleType]:
+    """Returns `comtypes` and the submodules imported by the Photoshop API, creating objects always fails."""
+
+    def create_object(*_args, **_kwargs) -> None:
+        raise OSError('No COM server on this platform!')
+
+    return [
+        get_fake_module('comtypes', COMError=FakeCOMError, ArgumentError=TypeError),
+        get_fake_module('comtypes.client', CreateObject=create_object),
+        get_fake_module('comtypes.client.dynamic', _Dispatch=FakeDispatch, MethodCaller=FakeDispatch),
+        get_fake_module('comtypes.client.lazybind', Dispatch=FakeDispatch)]
+
+
+def get_fake_win32api() -> ModuleType:
+    """Returns a `win32api` module, error messages are never looked up."""
+    return get_fake_module('win32api', FormatMessage=lambda *_args: '')
+
+
+def get_fake_module(name: str, **attrs: Any) -> ModuleType:
+    """Returns a module object with the given attributes.
+
+    Args:
+        name: Fully qualified module name.
+        attrs: Attributes of the module.
+    """
+    module = ModuleType(name)
+    module.__dict__.update(attrs)
+    return module
+
+
+"""
+* Installing
+"""
+
+
+def is_fake_backend_enabled() -> bool:
+    """bool: Whether the fake Photoshop backend is enabled in the environment."""
+    return environ.get(FAKE_BACKEND_ENVVAR, '').strip().lower() in FAKE_BACKEND_ENABLED
+
+
+def install_windows_shims() -> list[str]:
+    """Install fake versions of the Windows modules the Photoshop API imports, so it can be imported on
+    platforms without them. Modules which can be imported are left alone.
+
+    Notes:
+        - Must run before `photoshop` is imported, which happens as soon as the `src` package loads.
+        - The Photoshop API imports `COMError` from `_ctypes`, which only defines it on Windows.
+
+    Returns:
+        Names of the modules which were faked.
+    """
+    faked: list[str] = []
+    factories: dict[str, Callable[[], Any]] = {
+        'winreg': get_fake_winreg,
+        'comtypes': get_fake_comtypes,
+        'win32api': get_fake_win32api}
+    for name, factory in factories.items():
+        if name in sys.modules or find_spec(name) is not None:
+            continue
+        modules = factory()
+        for module in modules if isinstance(modules, list) else [modules]:
+            sys.modules[module.__name__] = module
+            faked.append(module.__name__)
+
+    # Photoshop API and comtypes share a single COM error type
+    import _ctypes
+    if not hasattr(_ctypes, 'COMError'):
+        _ctypes.COMError = sys.modules['comtypes'].COMError
+    return faked
@@ -8,6 +8,9 @@
 from ctypes import wintypes
 import os.path as osp
 import re
+from functools import cache
+from pathlib import Path
+from threading import Lock
 from typing import Optional, TypedDict
 
 # Third Party Imports
@@ -16,11 +19,15 @@
 from packaging.version import parse
 
 # Local Imports
+from src import PATH
 from src.utils.adobe import LayerContainer, PhotoshopHandler, PS_EXCEPTIONS
 
 # Precompile font version pattern
 REG_FONT_VER: re.Pattern = re.compile(r"\b(\d+\.\d+)\b")
 
+# Held while font files are mapped, so concurrent callers wait on a single read
+FONT_PATHS_LOCK = Lock()
+
 """
 * Types
 """
@@ -180,6 +187,21 @@ def get_font_details(path: str) -> Optional[tuple[str, FontDetails]]:
     return
 
 
+def get_font_files(folder: str) -> list[str]:
+    """Return the paths of the font files contained in a target directory.
+
+    Args:
+        folder: Directory containing font files (supports TTF and OTF fonts).
+
+    Returns:
+        List of font file paths, sorted by name.
+    """
+    with suppress(Exception):
+        ext = (".otf", ".ttf", ".OTF", ".TTF")
+        return [osp.join(folder, f) for f in sorted(os.listdir(folder)) if f.endswith(ext)]
+    return []
+
+
 def get_fonts_from_folder(folder: str) -> dict[str, FontDetails]:
     """Return a dictionary of font details for the fonts contained in a target directory.
 
@@ -189,28 +211,65 @@ def get_fonts_from_folder(folder: str) -> dict[str, FontDetails]:
     Returns:
         Dictionary of FontDetails.
     """
-    # Get a list of the font names in your `fonts` folder
     with suppress(Exception):
-        ext = (".otf", ".ttf", ".OTF", ".TTF")
-        local_fonts = [osp.join(folder, f) for f in os.listdir(folder) if f.endswith(ext)]
-        return {n[0]: n[1] for n in [get_font_details(f) for f in local_fonts] if n}
+        return {n[0]: n[1] for n in [get_font_details(f) for f in get_font_files(folder)] if n}
     return {}
 
 
+def get_installed_font_folders() -> list[str]:
+    """Gets the user and system font directories.
+
+    Returns:
+        List of font directories, empty if they can't be located.
+    """
+    with suppress(Exception):
+        return [
+            os.path.expandvars(r'%userprofile%\AppData\Local\Microsoft\Windows\Fonts'),
+            os.path.join(os.path.join(os.environ['WINDIR']), 'Fonts')]
+    return []
+
+
 def get_installed_fonts_dict() -> dict[str, FontDetails]:
     """Gets a dictionary of every font installed by the user.
 
     Returns:
         Dictionary with postScriptName as key, and tuple of display name and version as value.
     """
-    with suppress(Exception):
-        installed_fonts_dir = os.path.expandvars(r'%userprofile%\AppData\Local\Microsoft\Windows\Fonts')
-        system_fonts_dir = os.path.join(os.path.join(os.environ['WINDIR']), 'Fonts')
-        return {
-            **get_fonts_from_folder(installed_fonts_dir),
-            **get_fonts_from_folder(system_fonts_dir)
-        }
-    return {}
+    fonts: dict[str, FontDetails] = {}
+    for folder in get_installed_font_folders():
+        fonts.update(get_fonts_from_folder(folder))
+    return fonts
+
+
+def get_font_paths() -> dict[str, Path]:
+    """Gets the path of every font file in the app's fonts folder or installed by the user, read once.
+
+    Notes:
+        - Reading every font file is slow, warm this mapping off the render thread at startup.
+        - Concurrent callers wait on the first read rather than repeating it.
+
+    Returns:
+        Dictionary with postScriptName as key, and font file path as value. Fonts in the app's
+            fonts folder take priority.
+    """
+    with FONT_PATHS_LOCK:
+        return read_font_paths()
+
+
+@cache
+def read_font_paths() -> dict[str, Path]:
+    """Reads the path of every font file in the app's fonts folder or installed by the user.
+
+    Returns:
+        Dictionary with postScriptName as key, and font file path as value.
+    """
+    paths: dict[str, Path] = {}
+    for folder in [str(PATH.FONTS), *get_installed_font_folders()]:
+        for f in get_font_files(folder):
+            with suppress(Exception):
+                if details := get_font_details(f):
+                    paths.setdefault(details[0], Path(f))
+    return paths
 
 
 """
@@ -2,10 +2,12 @@
 * Handles Requests to the hexproof.io API
 """
 # Standard Library Imports
+import sqlite3
 from contextlib import suppress
 from functools import cache
 from pathlib import Path
 from typing import Any, Callable, Optional
+from zipfile import ZipFile, BadZipFile
 
 # Third Party Imports
 import requests
@@ -13,9 +15,7 @@
 from ratelimit import RateLimitDecorator, sleep_and_retry
 from backoff import on_exception, expo
 from omnitils.exceptions import log_on_exception, return_on_exception
-from omnitils.fetch import download_file
-from omnitils.files.archive import unpack_zip
-from omnitils.files import dump_data_file
+from omnitils.files import dump_data_file, load_data_file
 from omnitils.schema import Schema
 from hexproof.hexapi import schema as Hexproof
 
@@ -76,6 +76,66 @@ def wrapper(*args, **kwargs):
     return decorator
 
 
+"""
+* Conditional Requests
+"""
+
+
+def get_cache_validators() -> dict[str, dict[str, str]]:
+    """Returns the 'ETag' and 'Last-Modified' values saved for each previously downloaded resource.
+
+    Returns:
+        Dictionary of cache validators mapped to resource URL.
+    """
+    with suppress(Exception):
+        if PATH.SRC_DATA_HEXPROOF_ETAGS.is_file():
+            return load_data_file(PATH.SRC_DATA_HEXPROOF_ETAGS)
+    return {}
+
+
+def save_cache_validators(url: Any, res: Optional[requests.Response] = None) -> None:
+    """Save the cache validators returned for a resource, or clear them if no response is provided.
+
+    Args:
+        url: URL of the resource.
+        res: Response returned when the resource was downloaded.
+    """
+    validators = get_cache_validators()
+    validators.pop(str(url), None)
+    if res is not None and (res.headers.get('ETag') or res.headers.get('Last-Modified')):
+        validators[str(url)] = {
+            k: v for k, v in {
+                'etag': res.headers.get('ETag'),
+                'last_modified': res.headers.get('Last-Modified')
+            }.items() if v}
+    with suppress(Exception):
+        dump_data_file(validators, PATH.SRC_DATA_HEXPROOF_ETAGS)
+
+
+def get_conditional(url: Any, conditional: bool = True, **kwargs) -> requests.Response:
+    """Send a GET request carrying any saved cache validators, allowing the server to respond with
+        '304 Not Modified' instead of the full resource.
+
+    Args:
+        url: URL of the resource.
+        conditional: Whether to send saved cache validators, disable if the local copy is missing.
+
+    Keyword Args:
+        Passed to `requests.get`.
+
+    Returns:
+        Response object.
+    """
+    headers = hexproof_http_header.copy()
+    if conditional:
+        saved = get_cache_validators().get(str(url), {})
+        if etag := saved.get('etag'):
+            headers['If-None-Match'] = etag
+        if modified := saved.get('last_modified'):
+            headers['If-Modified-Since'] = modified
+    return requests.get(url, headers=headers, **kwargs)
+
+
 """
 * Hexproof Requests
 """
@@ -113,32 +173,72 @@ def get_metadata() -> dict[str, Hexproof.Meta]:
     Raises:
         RequestException if request was unsuccessful.
     """
-    res = requests.get(HexURL.API.Meta.All, headers=hexproof_http_header, timeout=(3, 3))
+    url = HexURL.API.Meta.All
+    res = get_conditional(url, bool(CON.metadata), timeout=(3, 3))
+    if res.status_code == 304:
+        return CON.metadata.copy()
     if res.status_code == 200:
-        return {k: Hexproof.Meta(**v) for k, v in res.json().items()}
+        meta = {k: Hexproof.Meta(**v) for k, v in res.json().items()}
+        save_cache_validators(url, res)
+        return meta
     raise RequestException(
         res.json().get('details', f"Failed to get metadata!"),
         response=res)
 
 
 @hexproof_request_wrapper()
-def get_sets() -> dict:
+def get_sets(conditional: bool = True) -> Optional[dict]:
     """Retrieve the current 'Set' data manifest from https://api.hexproof.io.
 
+    Args:
+        conditional: Whether to send saved cache validators with the request.
+
     Returns:
-        Data loaded from the 'Set' data manifest.
+        Data loaded from the 'Set' data manifest, or None if it hasn't changed since the last download.
 
     Raises:
         RequestException if request was unsuccessful.
     """
-    res = requests.get(HexURL.API.Sets.All, headers=hexproof_http_header, timeout=(10, 30))
+    url = HexURL.API.Sets.All
+    res = get_conditional(url, conditional, timeout=(10, 30))
+    if res.status_code == 304:
+        return None
     if res.status_code == 200:
-        return res.json()
+        data = res.json()
+        save_cache_validators(url, res)
+        return data
     raise RequestException(
         res.json().get('details', f'Failed to get set data!'),
         response=res)
 
 
+@hexproof_request_wrapper()
+def get_symbols_package(path: Path, conditional: bool = True) -> Optional[Path]:
+    """Download the current 'Symbols' asset package from https://api.hexproof.io.
+
+    Args:
+        path: Path to save the package to.
+        conditional: Whether to send saved cache validators with the request.
+
+    Returns:
+        Path to the downloaded package, or None if it hasn't changed since the last download.
+
+    Raises:
+        RequestException if request was unsuccessful.
+    """
+    url = HexURL.API.Symbols.All / 'package'
+    with get_conditional(url, conditional, stream=True, timeout=(3, 30)) as res:
+        if res.status_code == 304:
+            return None
+        if res.status_code != 200:
+            raise RequestException('Failed to get symbols package!', response=res)
+        with open(path, 'wb') as f:
+            for chunk in res.iter_content(chunk_size=1 << 16):
+                f.write(chunk)
+        save_cache_validators(url, res)
+    return path
+
+
 """
 * Data Post-Processing
 """
@@ -169,9 +269,52 @@ def process_data_sets(data: dict) -> dict[str, HexproofSet]:
 """
 
 
+def unpack_symbols_package(path: Path) -> int:
+    """Extract only the files in a 'Symbols' package which were added or changed since the last update,
+        and remove any files which are no longer included.
+
+    Notes:
+        Changes are detected by comparing the CRC-32 of each file in the archive against a local manifest
+            of the last extracted package, so unchanged files are never decompressed.
+
+    Args:
+        path: Path to the downloaded package.
+
+    Returns:
+        Number of files extracted or removed.
+    """
+    root, manifest = path.parent, {}
+    with suppress(Exception):
+        if PATH.SRC_IMG_SYMBOLS_MANIFEST.is_file():
+            manifest = load_data_file(PATH.SRC_IMG_SYMBOLS_MANIFEST)
+
+    # Extract new and changed files
+    with ZipFile(path) as archive:
+        current = {i.filename: i.CRC for i in archive.infolist() if not i.is_dir()}
+        changed = [
+            name for name, crc in current.items()
+            if manifest.get(name) != crc or not (root / name).is_file()]
+        for name in changed:
+            archive.extract(name, root)
+
+    # Remove files dropped from the package
+    removed = [name for name in manifest if name not in current]
+    for name in removed:
+        (root / name).unlink(missing_ok=True)
+
+    # Update the manifest and clean up
+    dump_data_file(current, PATH.SRC_IMG_SYMBOLS_MANIFEST)
+    path.unlink(missing_ok=True)
+    return len(changed) + len(removed)
+
+
 def update_hexproof_cache() -> tuple[bool, Optional[str]]:
     """Check for a hexproof.io data update.
 
+    Notes:
+        Cache validators of the metadata are cleared whenever the update fails, so the next check
+            downloads the metadata again rather than trusting the metadata saved before the failure.
+
     Returns:
         tuple: A tuple containing the boolean success state of the update, and a string message
             explaining the error if one occurred.
@@ -184,27 +327,36 @@ def update_hexproof_cache() -> tuple[bool, Optional[str]]:
     _current, _next = CON.metadata.get('sets'), meta.get('sets')
     if not _current or not _next or _current.version != _next.version:
         try:
-            # Download updated 'Set' data
-            data = get_sets()
-            data = process_data_sets(data)
-            dump_data_file(
-                obj={k: v.model_dump(exclude_none=True) for k, v in data.items()},
-                path=PATH.SRC_DATA_HEXPROOF_SET)
+            # Download 'Set' data if changed, then merge only the entries which differ
+            data = get_sets(conditional=bool(CON.set_data))
+            if data is not None:
+                if not data:
+                    raise RequestException("Empty 'Set' data received!")
+                data = process_data_sets(data)
+                CON.set_data.merge({k: v.model_dump(exclude_none=True) for k, v in data.items()})
+                get_set_data.cache_clear()
             updated = True
-        except (RequestException, ValueError, OSError):
+        except (RequestException, ValueError, OSError, sqlite3.Error):
+            save_cache_validators(HexURL.API.Sets.All)
+            save_cache_validators(HexURL.API.Meta.All)
             return False, "Unable to update 'Set' data from hexproof.io!"
 
     # Check against current symbol data
     _current, _next = CON.metadata.get('symbols'), meta.get('symbols')
     if not _current or not _next or _current.version != _next.version:
         try:
-            # Download and unpack updated 'Symbols' assets
-            download_file(
-                url=HexURL.API.Symbols.All / 'package',
-                path=PATH.SRC_IMG_SYMBOLS_PACKAGE)
-            unpack_zip(PATH.SRC_IMG_SYMBOLS_PACKAGE)
+            # Download 'Symbols' assets if changed, then extract only the files which differ
+            package = get_symbols_package(
+                path=PATH.SRC_IMG_SYMBOLS_PACKAGE,
+                conditional=PATH.SRC_IMG_SYMBOLS_MANIFEST.is_file())
+            if package is not None:
+                if not package:
+                    raise RequestException('Symbols package download failed!')
+                unpack_symbols_package(package)
             updated = True
-        except (RequestException, FileNotFoundError):
+        except (RequestException, FileNotFoundError, BadZipFile, OSError):
+            save_cache_validators(HexURL.API.Symbols.All / 'package')
+            save_cache_validators(HexURL.API.Meta.All)
             return False, 'Unable to download symbols package!'
 
     # Update metadata
@@ -216,6 +368,7 @@ def update_hexproof_cache() -> tuple[bool, Optional[str]]:
             path=PATH.SRC_DATA_HEXPROOF_META)
         return updated, None
     except (FileNotFoundError, OSError, ValueError):
+        save_cache_validators(HexURL.API.Meta.All)
         return False, 'Unable to update metadata from hexproof.io!'
 
 
@@ -0,0 +1,205 @@
+"""
+* Utils: Render Job Journal
+* Only local imports should be `enums` or `utils`.
+"""
+# Standard Library Imports
+import sqlite3
+from contextlib import suppress
+from datetime import datetime as dt
+from pathlib import Path
+from threading import Lock
+from typing import Iterable, Optional
+
+# Third Party Imports
+from omnitils.enums import StrConstant
+
+"""
+* Types
+"""
+
+# Schema for the render job table, one row per art file
+JOURNAL_TABLE_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS jobs ("
+    "file TEXT PRIMARY KEY NOT NULL, "
+    "scryfall_id TEXT, "
+    "template TEXT, "
+    "template_class TEXT, "
+    "config_hash TEXT, "
+    "status TEXT NOT NULL, "
+    "output TEXT, "
+    "time REAL, "
+    "attempts INTEGER NOT NULL DEFAULT 0, "
+    "error TEXT, "
+    "updated TEXT NOT NULL"
+    ")")
+
+
+class JobStatus(StrConstant):
+    """Status of a render job recorded in the journal."""
+    Running = 'running'
+    Success = 'success'
+    Failed = 'failed'
+
+
+"""
+* Journal Utils
+"""
+
+
+def get_job_key(file: Path) -> str:
+    """Returns the key of an art file's job, its resolved path, so a file matches its record however the
+    path was given, e.g. relative to the working directory or absolute.
+
+    Args:
+        file: Art file of the job.
+    """
+    return str(Path(file).resolve())
+
+
+"""
+* Render Journal
+"""
+
+
+class RenderJournal:
+    """Persistent record of render jobs, written as each job starts and finishes so progress survives a crash.
+
+    Notes:
+        - Every update is committed immediately to a write-ahead logged SQLite database, so the journal
+            is never left half-written if Photoshop or the app goes down mid-render.
+        - A job left 'running' was interrupted by a crash, and is treated as a failed attempt on resume.
+
+    Args:
+        path: Path to the SQLite database file.
+    """
+
+    def __init__(self, path: Path):
+        self._path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = Lock()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """sqlite3.Connection: Shared connection to the journal, created on first use."""
+        if self._conn is None:
+            self._path.parent.mkdir(mode=777, parents=True, exist_ok=True)
+            conn = sqlite3.connect(self._path, timeout=10, check_same_thread=False)
+            with suppress(sqlite3.Error):
+                conn.execute('PRAGMA journal_mode=WAL')
+                conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(JOURNAL_TABLE_SCHEMA)
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def close(self) -> None:
+        """Close the shared connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+            self._conn = None
+
+    """
+    * Queries
+    """
+
+    def get(self, file: Path) -> Optional[dict]:
+        """Returns the journal record for an art file.
+
+        Args:
+            file: Art file of the job.
+
+        Returns:
+            Dictionary of job data if the file has a record, otherwise None.
+        """
+        with self._lock:
+            cur = self.connection.execute("SELECT * FROM jobs WHERE file = ?", (get_job_key(file),))
+            row = cur.fetchone()
+            return dict(zip([c[0] for c in cur.description], row)) if row else None
+
+    def get_pending(self, files: Iterable[Path], retries: int = 0) -> tuple[list[Path], list[Path]]:
+        """Split art files into those which still need rendering and those the journal says to skip.
+
+        Args:
+            files: Art files to check.
+            retries: Number of times to retry a failed job before skipping it.
+
+        Returns:
+            A tuple containing files still to render, and files skipped because they either completed
+                or ran out of retries.
+        """
+        pending, skipped = [], []
+        for file in files:
+            job = self.get(file)
+            if job and (job['status'] == JobStatus.Success or job['attempts'] > retries):
+                skipped.append(file)
+                continue
+            pending.append(file)
+        return pending, skipped
+
+    """
+    * Updates
+    """
+
+    def reset(self) -> None:
+        """Remove every job record, starting a fresh journal."""
+        with self._lock:
+            with self.connection as conn:
+                conn.execute("DELETE FROM jobs")
+
+    def start(
+        self,
+        files: Iterable[Path],
+        scryfall_id: Optional[str] = None,
+        template: Optional[str] = None,
+        template_class: Optional[str] = None,
+        config_hash: Optional[str] = None
+    ) -> None:
+        """Record that a render job has started, counting it as an attempt.
+
+        Args:
+            files: Art files being rendered, split cards render two files in one job.
+            scryfall_id: Resolved Scryfall ID of the card.
+            template: Name of the template.
+            template_class: Name of the template class.
+            config_hash: Digest of the settings the card is rendered with.
+        """
+        now = dt.now().isoformat(timespec='seconds')
+        with self._lock:
+            with self.connection as conn:
+                conn.executemany(
+                    "INSERT INTO jobs "
+                    "(file, scryfall_id, template, template_class, config_hash, status, attempts, updated) "
+                    "VALUES (?, ?, ?, ?, ?, ?, 1, ?) "
+                    "ON CONFLICT(file) DO UPDATE SET "
+                    "scryfall_id = excluded.scryfall_id, template = excluded.template, "
+                    "template_class = excluded.template_class, config_hash = excluded.config_hash, "
+                    "status = excluded.status, output = NULL, time = NULL, error = NULL, "
+                    "attempts = attempts + 1, updated = excluded.updated",
+                    [(get_job_key(f), scryfall_id, template, template_class, config_hash, JobStatus.Running, now)
+                     for f in files])
+
+    def finish(
+        self,
+        files: Iterable[Path],
+        success: bool,
+        output: Optional[Path] = None,
+        time: Optional[float] = None,
+        error: Optional[str] = None
+    ) -> None:
+        """Record the result of a render job.
+
+        Args:
+            files: Art files which were rendered.
+            success: Whether the render succeeded.
+            output: Path to the rendered image, if successful.
+            time: Seconds the render took.
+            error: Reason the render failed, if unsuccessful.
+        """
+        now = dt.now().isoformat(timespec='seconds')
+        with self._lock:
+            with self.connection as conn:
+                conn.executemany(
+                    "UPDATE jobs SET status = ?, output = ?, time = ?, error = ?, updated = ? WHERE file = ?",
+                    [(JobStatus.Success if success else JobStatus.Failed,
+                      str(output) if output else None, time, error, now, get_job_key(f)) for f in files])
@@ -0,0 +1,216 @@
+"""
+* Utils: Layer Property Cache
+"""
+# Standard Library Imports
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Iterator
+
+# Third Party Imports
+from photoshop.api._artlayer import ArtLayer
+from photoshop.api._artlayers import ArtLayers
+from photoshop.api._document import Document
+from photoshop.api._layerSet import LayerSet
+from photoshop.api._layerSets import LayerSets
+from photoshop.api._selection import Selection
+from photoshop.api.text_item import TextItem
+
+# Local Imports
+from src import APP
+from src.utils.adobe import ReferenceLayer
+
+"""
+* Types & Definitions
+"""
+
+# Layer properties whose reads are cached
+LAYER_CACHE_PROPERTIES = {
+    ArtLayer: ['bounds', 'kind', 'name', 'textItem', 'visible'],
+    LayerSet: ['bounds', 'name', 'visible']}
+
+# Cached properties whose written value is kept, rather than read again from Photoshop
+LAYER_CACHE_WRITE_THROUGH = {'name', 'visible'}
+
+# Methods which can change a cached layer property, e.g. a layer's bounds or a group's bounds through
+# one of its children. Methods not defined by their class are passed straight through to the COM object
+LAYER_CACHE_WATCHED_METHODS = {
+    Document: ['paste'],
+    ArtLayers: ['add'],
+    LayerSets: ['add'],
+    ArtLayer: [
+        'duplicate', 'move', 'remove', 'rasterize', 'translate',
+        'resize', 'rotate', 'clear', 'cut', 'applyStyle'],
+    ReferenceLayer: ['duplicate'],
+    LayerSet: ['duplicate', 'move', 'remove', 'translate', 'resize', 'rotate'],
+    Selection: ['clear', 'fill']}
+
+# Property setters which can change a cached layer property, e.g. a text layer's bounds
+LAYER_CACHE_WATCHED_SETTERS = {
+    TextItem: [
+        'baselineShift', 'contents', 'font', 'height', 'hyphenation',
+        'justification', 'language', 'position', 'size', 'width']}
+
+"""
+* Layer Property Cache
+"""
+
+
+class LayerPropertyCache:
+    """Remembers layer property reads during a render, so repeated reads of the same layer object skip COM.
+
+    Notes:
+        - Reads of a layer's bounds, visibility, name, kind, and text item are cached per layer object.
+            Layers looked up through the layer index or held by a template are the same object each
+            time, so positioning helpers reading the same layer's bounds several times only read once.
+        - Any executed action, and any call to a watched method or property setter which can change a
+            layer, clears the whole cache. A layer's bounds can depend on other layers, e.g. a group's
+            bounds change when a child layer moves. Only the methods and setters the app uses are
+            watched, see `LAYER_CACHE_WATCHED_METHODS` and `LAYER_CACHE_WATCHED_SETTERS`.
+        - Writing a layer's visibility or name clears the cache, then keeps the written value.
+        - The cache is only active inside `cache_render`, reads outside it always go to Photoshop.
+    """
+
+    def __init__(self):
+        self._values: dict[int, tuple[Any, dict[str, Any]]] = {}
+        self._enabled: bool = False
+        self._installed: bool = False
+
+    @property
+    def enabled(self) -> bool:
+        """bool: Whether layer property reads are currently cached."""
+        return self._enabled
+
+    @contextmanager
+    def cache_render(self) -> Iterator[None]:
+        """Cache layer property reads made while inside this context."""
+        self.install()
+        self.clear()
+        self._enabled = True
+        try:
+            yield
+        finally:
+            self._enabled = False
+            self.clear()
+
+    """
+    * Reading & Writing
+    """
+
+    def get(self, layer: Any, prop: str, getter: Callable[[Any], Any]) -> Any:
+        """Returns a layer property, reading it from Photoshop only if it isn't cached.
+
+        Args:
+            layer: Layer object to read from.
+            prop: Name of the property.
+            getter: Original property getter.
+        """
+        if not self._enabled:
+            return getter(layer)
+        if (entry := self._values.get(id(layer))) and prop in entry[1]:
+            return entry[1][prop]
+        value = getter(layer)
+
+        # Keep the layer object alive, so its ID isn't reused while cached
+        self._values.setdefault(id(layer), (layer, {}))[1][prop] = value
+        return value
+
+    def put(self, layer: Any, prop: str, value: Any) -> None:
+        """Cache a value written to a layer property.
+
+        Args:
+            layer: Layer object written to.
+            prop: Name of the property.
+            value: Value written.
+        """
+        if self._enabled:
+            self._values.setdefault(id(layer), (layer, {}))[1][prop] = value
+
+    def clear(self, *_args) -> None:
+        """Drop every cached value."""
+        if self._values:
+            self._values.clear()
+
+    """
+    * Installing
+    """
+
+    def install(self) -> None:
+        """Cache layer property getters, and watch the calls which can change a cached property."""
+        if self._installed:
+            return
+        self._installed = True
+        APP.add_action_listener(self.clear)
+
+        # Cached properties
+        for cls, props in LAYER_CACHE_PROPERTIES.items():
+            for name in props:
+                setattr(cls, name, self._get_cached_property(getattr(cls, name), name))
+
+        # Watched methods and property setters
+        for cls, names in LAYER_CACHE_WATCHED_METHODS.items():
+            for name in names:
+                func = cls.__dict__.get(name) or get_forwarded_method(name)
+                setattr(cls, name, self._get_wrapper(func))
+        for cls, names in LAYER_CACHE_WATCHED_SETTERS.items():
+            for name in names:
+                prop: property = getattr(cls, name)
+                setattr(cls, name, property(prop.fget, self._get_wrapper(prop.fset), prop.fdel, prop.__doc__))
+
+    def _get_cached_property(self, prop: property, name: str) -> property:
+        """Returns a property whose reads are cached, and whose writes clear the cache.
+
+        Args:
+            prop: Original property.
+            name: Name of the property.
+        """
+        cache = self
+
+        @wraps(prop.fget)
+        def getter(layer):
+            return cache.get(layer, name, prop.fget)
+
+        if not prop.fset:
+            return property(getter, None, prop.fdel, prop.__doc__)
+
+        @wraps(prop.fset)
+        def setter(layer, value):
+            try:
+                prop.fset(layer, value)
+            finally:
+                cache.clear()
+            if name in LAYER_CACHE_WRITE_THROUGH:
+                cache.put(layer, name, value)
+
+        return property(getter, setter, prop.fdel, prop.__doc__)
+
+    def _get_wrapper(self, func: Callable) -> Callable:
+        """Returns a function which clears the cache after calling the original function."""
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.clear()
+        return wrapper
+
+
+"""
+* Cache Utils
+"""
+
+
+def get_forwarded_method(name: str) -> Callable:
+    """Returns a method which calls a method of the same name on the wrapped COM object.
+
+    Args:
+        name: Name of the COM method.
+    """
+    def method(self, *args, **kwargs):
+        return getattr(self.app, name)(*args, **kwargs)
+    method.__name__ = name
+    return method
+
+
+# Global layer property cache
+LAYER_CACHE = LayerPropertyCache()
@@ -0,0 +1,461 @@
+"""
+* Utils: Document Layer Index
+"""
+# Standard Library Imports
+from contextlib import suppress
+from functools import wraps
+from threading import RLock
+from typing import Callable, Iterable, Optional, Union
+from urllib.parse import unquote
+
+# Third Party Imports
+from photoshop.api._artlayer import ArtLayer
+from photoshop.api._artlayers import ArtLayers
+from photoshop.api._document import Document
+from photoshop.api._layerSet import LayerSet
+from photoshop.api._layerSets import LayerSets
+
+# Local Imports
+from src import APP
+from src.utils.adobe import LayerContainerTypes, LayerObjectTypes, ReferenceLayer, PS_EXCEPTIONS
+
+"""
+* Types & Definitions
+"""
+
+# Header line returned by a successful layer tree sweep
+LAYER_INDEX_HEADER = 'layer-index'
+
+# Sweeps every layer in the active document with the Action Manager in a single script call,
+# returning one line per layer: ID, URI encoded name, 1 if it's a group, and the ID of its parent group
+LAYER_INDEX_SCRIPT = """
+var s = stringIDToTypeID;
+function getDocumentProperty(key) {
+    var ref = new ActionReference();
+    ref.putProperty(s('property'), s(key));
+    ref.putEnumerated(s('document'), s('ordinal'), s('targetEnum'));
+    return executeActionGet(ref);
+}
+var count = getDocumentProperty('numberOfLayers').getInteger(s('numberOfLayers'));
+var first = getDocumentProperty('hasBackgroundLayer').getBoolean(s('hasBackgroundLayer')) ? 0 : 1;
+var lines = ['%s'], parents = [0];
+for (var i = count; i >= first; i--) {
+    var ref = new ActionReference();
+    ref.putIndex(s('layer'), i);
+    var desc = executeActionGet(ref);
+    var section = desc.hasKey(s('layerSection'))
+        ? typeIDToStringID(desc.getEnumerationValue(s('layerSection'))) : 'layerSectionContent';
+    if (section == 'layerSectionEnd') {
+        parents.pop();
+        continue;
+    }
+    var id = desc.getInteger(s('layerID'));
+    var isGroup = section == 'layerSectionStart';
+    lines.push([id, encodeURIComponent(desc.getString(s('name'))),
+        isGroup ? 1 : 0, parents[parents.length - 1]].join('\\t'));
+    if (isGroup) parents.push(id);
+}
+lines.join('\\n');
+""" % LAYER_INDEX_HEADER
+
+# Action events which add layers to a document
+LAYER_INDEX_ADD_EVENTS = {
+    'make', 'duplicate', 'paste', 'pasteInto', 'placeEvent', 'copyToLayer', 'cutToLayer'}
+
+# Action events which can remove, rename, or move layers within a document
+LAYER_INDEX_CHANGE_EVENTS = {
+    'delete', 'move', 'mergeLayersNew', 'mergeVisible', 'flattenImage',
+    'ungroupLayersEvent', 'newPlacedLayer', 'placedLayerConvertToLayers'}
+
+# Layer object methods which add layers to a document
+LAYER_INDEX_ADD_METHODS = [
+    (ArtLayer, 'duplicate'), (LayerSet, 'duplicate'), (ReferenceLayer, 'duplicate'),
+    (ArtLayers, 'add'), (LayerSets, 'add')]
+
+# Layer object methods which can remove or move layers within a document
+LAYER_INDEX_CHANGE_METHODS = [
+    (ArtLayer, 'remove'), (ArtLayer, 'move'), (ArtLayer, 'merge'),
+    (LayerSet, 'remove'), (LayerSet, 'move'), (LayerSet, 'merge'),
+    (ArtLayers, 'removeAll'), (LayerSets, 'removeAll')]
+
+
+"""
+* Document Layer Index
+"""
+
+
+class DocumentLayerIndex:
+    """Layer tree of a single document, mapping each layer's name to its ID within each group.
+
+    Notes:
+        - Layer objects are only requested from Photoshop once a lookup first returns them, and are
+            kept for the life of the index so repeated lookups don't touch COM at all.
+        - Where several layers in a group share a name, the topmost is indexed, matching the layer
+            Photoshop returns when looking up that name.
+
+    Args:
+        lines: Layer lines returned by the layer tree sweep, excluding the header.
+    """
+
+    def __init__(self, lines: list[str]):
+        self.names: dict[int, str] = {}
+        self.parents: dict[int, int] = {}
+        self.children: dict[int, dict[tuple[str, bool], int]] = {0: {}}
+        self.folded: dict[int, set[tuple[str, bool]]] = {0: set()}
+        self.objects: dict[int, LayerObjectTypes] = {}
+        self.ids: dict[int, int] = {}
+
+        # Whether layers were added, or layers were removed, renamed, or moved, since the sweep
+        self.added: bool = False
+        self.changed: bool = False
+        self.update(lines)
+
+    def update(self, lines: list[str]) -> None:
+        """Rebuild the layer tree from a fresh sweep, keeping layer objects whose layer still exists.
+
+        Args:
+            lines: Layer lines returned by the layer tree sweep, excluding the header.
+        """
+        self.names.clear()
+        self.parents.clear()
+        self.children, self.folded = {0: {}}, {0: set()}
+        for line in lines:
+            layer_id, name, is_group, parent = line.split('\t')
+            layer_id, parent, is_group, name = int(layer_id), int(parent), is_group == '1', unquote(name)
+            self.names[layer_id], self.parents[layer_id] = name, parent
+            self.children.setdefault(parent, {}).setdefault((name, is_group), layer_id)
+            self.folded.setdefault(parent, set()).add((name.casefold(), is_group))
+            if is_group:
+                self.children.setdefault(layer_id, {})
+                self.folded.setdefault(layer_id, set())
+
+        # Drop layer objects whose layer no longer exists
+        for layer_id in [n for n in self.objects if n not in self.names]:
+            self.ids.pop(id(self.objects.pop(layer_id)), None)
+        self.added = self.changed = False
+
+    def rename(self, layer_id: int, name: str) -> None:
+        """Rename an indexed layer, re-indexing the other layers in its group in their original order.
+
+        Args:
+            layer_id: ID of the layer.
+            name: New name of the layer.
+        """
+        self.names[layer_id], parent = name, self.parents[layer_id]
+        children, folded = {}, set()
+        for child, child_name in self.names.items():
+            if self.parents[child] == parent:
+                children.setdefault((child_name, child in self.children), child)
+                folded.add((child_name.casefold(), child in self.children))
+        self.children[parent], self.folded[parent] = children, folded
+
+    def get_child(self, parent: int, name: str, is_group: bool) -> Optional[int]:
+        """Returns the ID of a layer within a group.
+
+        Args:
+            parent: ID of the parent group, 0 for the document root.
+            name: Name of the layer.
+            is_group: Whether the layer is a group.
+
+        Returns:
+            ID of the layer, 0 if no layer has this name, or None if only a layer whose name differs in
+                case exists, which Photoshop may or may not match.
+        """
+        if (layer_id := self.children.get(parent, {}).get((name, is_group))) is not None:
+            return layer_id
+        return None if (name.casefold(), is_group) in self.folded.get(parent, set()) else 0
+
+    def get_object(self, layer_id: int) -> LayerObjectTypes:
+        """Returns the object of an indexed layer, requesting it and any uncached parent groups by name.
+
+        Args:
+            layer_id: ID of the layer.
+
+        Returns:
+            ArtLayer or LayerSet object.
+        """
+        if (layer := self.objects.get(layer_id)) is not None:
+            return layer
+        parent, name = self.parents[layer_id], self.names[layer_id]
+        container = self.get_object(parent) if parent else APP.activeDocument
+        layer = container.layerSets[name] if layer_id in self.children else container.artLayers[name]
+        self.objects[layer_id], self.ids[id(layer)] = layer, layer_id
+        return layer
+
+
+class LayerIndex:
+    """Indexes the layer tree of each document, so layer lookups by name skip the COM traversal.
+
+    Notes:
+        - A document is indexed on its first lookup with a single script call, which reads every layer's
+            ID, name, kind, and parent group with the Action Manager inside Photoshop.
+        - Adding layers only marks the index as incomplete, lookups for names it doesn't contain sweep
+            the document again. Removing or moving layers marks the index as outdated, so the next
+            lookup sweeps the document again before answering. Renamed layers are updated in place.
+        - Changes are picked up from layer object methods and action events, and an index is dropped
+            when its document is reset to its opening state or closed.
+        - Layers can be added without the index noticing, e.g. by pasting or running an action, so a
+            name the index doesn't contain is never trusted. Lookups the index can't answer, including
+            those for layers it doesn't contain, fall back to traversing the document.
+    """
+
+    def __init__(self):
+        self._docs: dict[str, Optional[DocumentLayerIndex]] = {}
+        self._lock = RLock()
+        self._installed: bool = False
+
+    """
+    * Lookups
+    """
+
+    def find(
+        self, name: str,
+        group: Union[str, None, list[str], LayerContainerTypes, Iterable[LayerContainerTypes]] = None,
+        is_group: bool = False
+    ) -> tuple[bool, Optional[LayerObjectTypes]]:
+        """Look up a layer in the active document's index.
+
+        Args:
+            name: Name of the layer.
+            group: Parent group (name or object), or ordered list of groups (names, or first can be an object).
+            is_group: Whether to look for a group rather than an ArtLayer.
+
+        Returns:
+            Whether the index found the layer, and the layer object if it did.
+        """
+        with self._lock:
+            try:
+                doc_name = APP.activeDocument.name
+            except PS_EXCEPTIONS:
+                return False, None
+            try:
+                if not (index := self.get_index(doc_name)):
+                    return False, None
+
+                # Find the layer, sweeping the document again if it may have been added since
+                layer_id = self.get_layer_id(index, name, group, is_group)
+                if layer_id == 0 and index.added:
+                    if not (index := self.sweep(doc_name)):
+                        return False, None
+                    layer_id = self.get_layer_id(index, name, group, is_group)
+                if not layer_id:
+                    return False, None
+                return True, index.get_object(layer_id)
+            except PS_EXCEPTIONS:
+                # Index couldn't resolve the layer, start over on the next lookup
+                self._docs.pop(doc_name, None)
+                return False, None
+
+    def get_id(self, layer: LayerObjectTypes) -> int:
+        """Returns the ID of a layer, without a COM call if the layer object was returned by an index.
+
+        Args:
+            layer: ArtLayer or LayerSet object.
+        """
+        with self._lock:
+            for index in self._docs.values():
+                if index and (layer_id := index.ids.get(id(layer))):
+                    return layer_id
+        return layer.id
+
+    @staticmethod
+    def get_layer_id(
+        index: DocumentLayerIndex,
+        name: str,
+        group: Union[str, None, list[str], LayerContainerTypes, Iterable[LayerContainerTypes]],
+        is_group: bool
+    ) -> Optional[int]:
+        """Returns the ID of a layer from a document's index.
+
+        Args:
+            index: Index of the active document.
+            name: Name of the layer.
+            group: Parent group (name or object), or ordered list of groups (names, or first can be an object).
+            is_group: Whether the layer is a group.
+
+        Returns:
+            ID of the layer, 0 if it doesn't exist, or None if the index can't answer the lookup.
+        """
+        parent = 0
+        for g in ([] if not group else group if isinstance(group, (tuple, list)) else [group]):
+            if isinstance(g, str):
+                parent = index.get_child(parent, g, True)
+            else:
+                # Only group objects returned by the index are known
+                parent = index.ids.get(id(g))
+            if not parent:
+                return parent
+        return index.get_child(parent, name, is_group)
+
+    """
+    * Indexing
+    """
+
+    def get_index(self, doc_name: str) -> Optional[DocumentLayerIndex]:
+        """Returns the up-to-date index of the active document, sweeping it if required.
+
+        Args:
+            doc_name: Name of the active document.
+
+        Returns:
+            Index of the document, or None if the document can't be indexed.
+        """
+        if doc_name not in self._docs:
+            self.install()
+            return self.sweep(doc_name)
+        if (index := self._docs[doc_name]) and index.changed:
+            return self.sweep(doc_name)
+        return index
+
+    def sweep(self, doc_name: str) -> Optional[DocumentLayerIndex]:
+        """Read the active document's layer tree and update its index.
+
+        Args:
+            doc_name: Name of the active document.
+
+        Returns:
+            Index of the document, or None if the document can't be indexed.
+        """
+        try:
+            lines = str(APP.eval_javascript(LAYER_INDEX_SCRIPT) or '').split('\n')
+        except PS_EXCEPTIONS:
+            lines = []
+        if lines[0] != LAYER_INDEX_HEADER:
+            # Backend can't run the sweep, don't try again for this document
+            self._docs[doc_name] = None
+            return None
+        if index := self._docs.get(doc_name):
+            index.update(lines[1:])
+        else:
+            index = self._docs[doc_name] = DocumentLayerIndex(lines[1:])
+        return index
+
+    """
+    * Invalidating
+    """
+
+    def invalidate(self, changed: bool = True) -> None:
+        """Mark every document index as outdated.
+
+        Args:
+            changed: Whether layers may have been removed, renamed, or moved, otherwise only added.
+        """
+        with self._lock:
+            for index in self._docs.values():
+                if index is None:
+                    continue
+                if changed:
+                    index.changed = True
+                else:
+                    index.added = True
+
+    def discard(self, doc_name: Optional[str] = None) -> None:
+        """Drop a document's index, e.g. when it's reset or closed.
+
+        Args:
+            doc_name: Name of the document, drop every index if not provided.
+        """
+        with self._lock:
+            if doc_name is None:
+                self._docs.clear()
+                return
+            self._docs.pop(doc_name, None)
+
+    def on_action(self, event_id: int) -> None:
+        """Invalidate indexes after an action event which changes the layer tree.
+
+        Args:
+            event_id: Type ID of the executed action event.
+        """
+        if not self._docs:
+            return
+        with suppress(*PS_EXCEPTIONS):
+            event = APP.typeIDToStringID(event_id)
+            if event in LAYER_INDEX_CHANGE_EVENTS:
+                self.invalidate()
+            elif event in LAYER_INDEX_ADD_EVENTS:
+                self.invalidate(changed=False)
+
+    def on_rename(self, setter: Callable, layer: LayerObjectTypes, name: str) -> None:
+        """Rename a layer, updating its entry in the active document's index in place.
+
+        Notes:
+            A layer object the index didn't return is matched by its ID and previous name, a layer
+                the index doesn't contain only marks the index as incomplete.
+
+        Args:
+            setter: Original name setter of the layer object.
+            layer: ArtLayer or LayerSet object being renamed.
+            name: New name of the layer.
+        """
+        if not self._docs:
+            return setter(layer, name)
+        with self._lock:
+            index, layer_id = None, None
+            with suppress(*PS_EXCEPTIONS):
+                if index := self._docs.get(APP.activeDocument.name):
+                    if not (layer_id := index.ids.get(id(layer))):
+                        layer_id, previous = layer.id, layer.name
+                        layer_id = layer_id if index.names.get(layer_id) == previous else None
+            setter(layer, name)
+            if index and layer_id:
+                index.rename(layer_id, name)
+            else:
+                self.invalidate(changed=False)
+
+    def on_close(self, doc: Document) -> None:
+        """Drop a document's index before the document is closed.
+
+        Args:
+            doc: Document being closed.
+        """
+        if not self._docs:
+            return
+        with suppress(*PS_EXCEPTIONS):
+            self.discard(doc.name)
+
+    """
+    * Installing
+    """
+
+    def install(self) -> None:
+        """Watch layer object methods and action events which change a document's layer tree."""
+        if self._installed:
+            return
+        self._installed = True
+        APP.add_action_listener(self.on_action)
+        for cls, attr in LAYER_INDEX_ADD_METHODS:
+            self._wrap(cls, attr, lambda *_: self.invalidate(changed=False))
+        for cls, attr in LAYER_INDEX_CHANGE_METHODS:
+            self._wrap(cls, attr, lambda *_: self.invalidate())
+        self._wrap(Document, 'close', lambda doc, *_: self.on_close(doc))
+
+        # Renamed layers are updated in place
+        for cls in (ArtLayer, LayerSet):
+            prop: property = cls.name
+            setter = wraps(prop.fset)(lambda layer, name, fset=prop.fset: self.on_rename(fset, layer, name))
+            setattr(cls, 'name', property(prop.fget, setter, prop.fdel, prop.__doc__))
+
+    def _wrap(self, cls: type, attr: str, callback: Callable) -> None:
+        """Replace a layer object method with one that notifies the index.
+
+        Args:
+            cls: Class defining the method.
+            attr: Name of the method.
+            callback: Called with the method's arguments before the method runs.
+        """
+        setattr(cls, attr, self._get_wrapper(cls.__dict__.get(attr, getattr(cls, attr)), callback))
+
+    @staticmethod
+    def _get_wrapper(func: Callable, callback: Callable) -> Callable:
+        """Returns a function which notifies the index before calling the original function."""
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            callback(*args)
+            return func(*args, **kwargs)
+        return wrapper
+
+
+# Global layer index
+LAYER_INDEX = LayerIndex()
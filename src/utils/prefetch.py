@@ -0,0 +1,224 @@
+"""
+* Utils: Layout Property Tracing and Prefetching
+"""
+# Standard Library Imports
+from concurrent.futures import Executor, Future
+from contextlib import contextmanager, suppress
+from functools import cache, cached_property
+from pathlib import Path
+from threading import Lock, local
+from typing import Any, Iterable, Iterator
+
+# Third Party Imports
+from omnitils.files import load_data_file, dump_data_file
+
+# Local Imports
+from src import CONSOLE, PATH
+
+"""
+* Layout Properties
+"""
+
+
+@cache
+def get_layout_properties(cls: type) -> frozenset[str]:
+    """Returns the public properties defined on a layout class and its parent classes.
+
+    Args:
+        cls: Layout class to inspect.
+
+    Returns:
+        Names of every public `property` or `cached_property` on the class.
+    """
+    return frozenset(
+        name for c in cls.__mro__ for name, attr in vars(c).items()
+        if not name.startswith('_') and isinstance(attr, (property, cached_property)))
+
+
+@cache
+def get_cached_layout_properties(cls: type) -> frozenset[str]:
+    """Returns the public cached properties defined on a layout class and its parent classes.
+
+    Args:
+        cls: Layout class to inspect.
+
+    Returns:
+        Names of every public `cached_property` on the class, i.e. those worth computing ahead of time.
+    """
+    return frozenset(
+        name for c in cls.__mro__ for name, attr in vars(c).items()
+        if not name.startswith('_') and isinstance(attr, cached_property))
+
+
+def get_template_key(template: type) -> str:
+    """Returns a unique key for a template class, since plugins can reuse class names.
+
+    Args:
+        template: Template class.
+
+    Returns:
+        Module qualified name of the template class.
+    """
+    return f'{template.__module__}.{template.__qualname__}'
+
+
+"""
+* Layout Profile
+"""
+
+
+class LayoutProfile:
+    """Persistent record of which layout properties each template class reads during a render.
+
+    Args:
+        path: Path to the data file the profile is stored in.
+    """
+
+    def __init__(self, path: Path):
+        self._path = path
+        self._lock = Lock()
+
+    @cached_property
+    def data(self) -> dict[str, list[str]]:
+        """dict[str, list[str]]: Sorted property names read by each template, mapped to its template key."""
+        if self._path.is_file():
+            with suppress(Exception):
+                return load_data_file(self._path)
+        return {}
+
+    def get(self, template: type) -> frozenset[str]:
+        """Returns the layout properties previously recorded for a template class.
+
+        Args:
+            template: Template class.
+
+        Returns:
+            Recorded property names, empty if the template has never been traced.
+        """
+        with self._lock:
+            return frozenset(self.data.get(get_template_key(template), []))
+
+    def record(self, template: type, reads: Iterable[str]) -> None:
+        """Merge property names read during a render into the profile for a template class.
+
+        Args:
+            template: Template class.
+            reads: Layout property names read during the render.
+        """
+        key = get_template_key(template)
+        with self._lock:
+            current = set(self.data.get(key, []))
+            if current.issuperset(reads):
+                return
+            self.data[key] = sorted(current.union(reads))
+            try:
+                dump_data_file(self.data, self._path)
+            except Exception as e:
+                CONSOLE.log_exception(e)
+
+
+# Global layout profile
+LAYOUT_PROFILE = LayoutProfile(PATH.SRC_DATA_LAYOUT_PROFILE)
+
+"""
+* Tracing
+"""
+
+# Per-thread depth of nested layout attribute lookups
+_TRACE_STATE = local()
+
+
+@contextmanager
+def trace_layout_access(layout: Any, template: type) -> Iterator[set[str]]:
+    """Record the layout properties a template reads directly while inside this context.
+
+    Notes:
+        - The layout's class is temporarily swapped for a subclass which observes attribute lookups, so
+            `isinstance` checks made by the template still behave normally.
+        - Reads made by one property while computing another are not recorded, since prefetching the
+            outer property computes them anyway.
+
+    Args:
+        layout: Layout object being rendered.
+        template: Template class rendering the layout.
+
+    Yields:
+        The set of property names read so far.
+    """
+    cls, reads = type(layout), set()
+    names = get_layout_properties(cls)
+
+    def __getattribute__(self, name: str) -> Any:
+        depth = getattr(_TRACE_STATE, 'depth', 0)
+        if depth == 0 and name in names:
+            reads.add(name)
+        _TRACE_STATE.depth = depth + 1
+        try:
+            return object.__getattribute__(self, name)
+        finally:
+            _TRACE_STATE.depth = depth
+
+    layout.__class__ = type(cls.__name__, (cls,), {
+        '__getattribute__': __getattribute__,
+        '__module__': cls.__module__,
+        '__qualname__': cls.__qualname__})
+    try:
+        yield reads
+    finally:
+        layout.__class__ = cls
+        LAYOUT_PROFILE.record(template, reads)
+
+
+"""
+* Prefetching
+"""
+
+
+def prefetch_layout(layout: Any, names: Iterable[str]) -> None:
+    """Compute a set of cached layout properties ahead of time.
+
+    Notes:
+        Properties are computed by calling their functions directly, then stored on the layout the same
+            way `cached_property` stores them. Reading a `cached_property` holds a lock shared by every
+            instance, so parallel prefetches would otherwise wait on each other, and the render thread
+            would wait on any property being prefetched for another card.
+
+    Args:
+        layout: Layout object to prefetch properties on.
+        names: Names of the properties to compute, any which aren't cached properties are skipped.
+    """
+    cls, values = type(layout), layout.__dict__
+    for name in sorted(get_cached_layout_properties(cls).intersection(names)):
+        if name in values:
+            continue
+        prop = next(vars(c)[name] for c in cls.__mro__ if name in vars(c))
+
+        # Failed properties aren't cached, the template will raise the error in context
+        with suppress(Exception):
+            values.setdefault(name, prop.func(layout))
+
+
+def prefetch_layouts(
+    pool: Executor,
+    layouts: Iterable[Any],
+    template: type,
+    names: Iterable[str] = ()
+) -> list[Future]:
+    """Schedule the layout properties a template is known to read to be computed in the background.
+
+    Notes:
+        Config and constants must already be loaded for this template, since many layout properties
+            depend on them.
+
+    Args:
+        pool: Executor to submit prefetch jobs to.
+        layouts: Layout objects which will be rendered by this template.
+        template: Template class which will render the layouts.
+        names: Additional property names to compute, regardless of the recorded profile.
+
+    Returns:
+        A future for each layout, in order. Wait on a layout's future before rendering it.
+    """
+    if not (names := LAYOUT_PROFILE.get(template).union(names)):
+        return []
+    return [pool.submit(prefetch_layout, layout, names) for layout in layouts]
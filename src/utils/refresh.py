@@ -0,0 +1,94 @@
+"""
+* Utils: Background Data Refresh
+"""
+# Standard Library Imports
+from concurrent.futures import ThreadPoolExecutor, Future
+from threading import Lock, Timer
+from typing import Any, Callable, Optional
+
+# Local Imports
+from src import CONSOLE
+
+"""
+* Refresh Service
+"""
+
+
+class BackgroundRefresh:
+    """Runs network refresh jobs in the background, publishing each result as soon as it finishes.
+
+    Notes:
+        - Only `max_workers` jobs run at once, so a burst of jobs can't saturate the connection.
+        - A job which hasn't finished within its timeout publishes None, its late result is discarded.
+        - A job which raises an exception is logged and publishes None.
+
+    Args:
+        max_workers: Maximum number of jobs to run at once.
+        timeout: Default number of seconds a job may run before it is considered failed.
+    """
+
+    def __init__(self, max_workers: int = 3, timeout: float = 15.0):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='refresh')
+        self._timeout = timeout
+        self._lock = Lock()
+        self._jobs: dict[str, Future] = {}
+        self._results: dict[str, Any] = {}
+
+    @property
+    def results(self) -> dict[str, Any]:
+        """dict[str, Any]: Results published so far, mapped to job name."""
+        with self._lock:
+            return self._results.copy()
+
+    def submit(
+        self,
+        name: str,
+        func: Callable[[], Any],
+        publish: Optional[Callable[[Any], None]] = None,
+        timeout: Optional[float] = None
+    ) -> Future:
+        """Queue a refresh job.
+
+        Args:
+            name: Unique name of the job.
+            func: Callable which performs the refresh and returns its result.
+            publish: Callable which receives the result, or None if the job failed or timed out.
+            timeout: Number of seconds the job may run once started, uses the default if not provided.
+
+        Returns:
+            Future tracking the job.
+        """
+        future = self._pool.submit(self._run, name, func, publish, timeout or self._timeout)
+        with self._lock:
+            self._jobs[name] = future
+        return future
+
+    def shutdown(self) -> None:
+        """Cancel any jobs which haven't started yet, without waiting on running jobs."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, name: str, func: Callable[[], Any], publish: Optional[Callable], timeout: float) -> None:
+        """Run a job, publishing its result or None if it exceeds the timeout."""
+        timer = Timer(timeout, self._publish, (name, publish, None))
+        timer.daemon = True
+        timer.start()
+        try:
+            result = func()
+        except Exception as e:
+            CONSOLE.log_exception(e)
+            result = None
+        finally:
+            timer.cancel()
+        self._publish(name, publish, result)
+
+    def _publish(self, name: str, publish: Optional[Callable], result: Any) -> None:
+        """Publish the first result a job produces, either its return value or a timeout."""
+        with self._lock:
+            if name in self._results:
+                return
+            self._results[name] = result
+        if publish is not None:
+            try:
+                publish(result)
+            except Exception as e:
+                CONSOLE.log_exception(e)
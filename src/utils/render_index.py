@@ -0,0 +1,164 @@
+"""
+* Utils: Rendered Output Index
+* Only local imports should be `enums` or `utils`.
+"""
+# Standard Library Imports
+import sqlite3
+from contextlib import suppress
+from datetime import datetime as dt
+from hashlib import sha1
+from pathlib import Path
+from threading import Lock
+from typing import Iterable, Optional
+
+"""
+* Types
+"""
+
+# Schema for the rendered output table, one row per render fingerprint
+RENDER_TABLE_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS renders ("
+    "fingerprint TEXT PRIMARY KEY NOT NULL, "
+    "output TEXT NOT NULL, "
+    "files TEXT, "
+    "updated TEXT NOT NULL, "
+    "size INTEGER, "
+    "mtime INTEGER"
+    ")")
+
+# Columns added to the rendered output table since it was first created
+RENDER_TABLE_COLUMNS = ("size INTEGER", "mtime INTEGER")
+
+# Schema for the art file digest table, avoids rehashing art files which haven't been modified
+DIGEST_TABLE_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS digests ("
+    "file TEXT PRIMARY KEY NOT NULL, "
+    "size INTEGER NOT NULL, "
+    "mtime INTEGER NOT NULL, "
+    "digest TEXT NOT NULL"
+    ")")
+
+"""
+* Render Index
+"""
+
+
+class RenderIndex:
+    """Sidecar index mapping render fingerprints to the output images they produced.
+
+    Notes:
+        - A fingerprint captures every input of a render, so a render can be skipped when an output
+            with the same fingerprint still exists.
+        - Art file digests are cached against each file's size and modification time.
+        - Each output's size and modification time are recorded with it, so an output overwritten by
+            a render with different inputs, e.g. after changing a setting, is never treated as unchanged.
+
+    Args:
+        path: Path to the SQLite database file.
+    """
+
+    def __init__(self, path: Path):
+        self._path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = Lock()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """sqlite3.Connection: Shared connection to the index, created on first use."""
+        if self._conn is None:
+            self._path.parent.mkdir(mode=777, parents=True, exist_ok=True)
+            conn = sqlite3.connect(self._path, timeout=10, check_same_thread=False)
+            conn.execute(RENDER_TABLE_SCHEMA)
+            conn.execute(DIGEST_TABLE_SCHEMA)
+            for column in RENDER_TABLE_COLUMNS:
+                with suppress(sqlite3.OperationalError):
+                    conn.execute(f"ALTER TABLE renders ADD COLUMN {column}")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def close(self) -> None:
+        """Close the shared connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+            self._conn = None
+
+    """
+    * Art Digests
+    """
+
+    def get_digest(self, file: Path) -> str:
+        """Returns a digest of an art file's contents, reusing the cached digest if the file is unmodified.
+
+        Args:
+            file: Art file to hash.
+
+        Returns:
+            Hexadecimal digest string.
+        """
+        stat = file.stat()
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT digest FROM digests WHERE file = ? AND size = ? AND mtime = ?",
+                (str(file), stat.st_size, stat.st_mtime_ns)).fetchone()
+        if row:
+            return row[0]
+
+        # Hash the file in chunks
+        digest = sha1()
+        with open(file, 'rb') as f:
+            while chunk := f.read(1024 * 1024):
+                digest.update(chunk)
+        with self._lock:
+            with self.connection as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO digests (file, size, mtime, digest) VALUES (?, ?, ?, ?)",
+                    (str(file), stat.st_size, stat.st_mtime_ns, digest.hexdigest()))
+        return digest.hexdigest()
+
+    """
+    * Rendered Outputs
+    """
+
+    def get_output(self, fingerprint: str) -> Optional[Path]:
+        """Returns the output image previously rendered with a fingerprint, if it still exists unmodified.
+
+        Args:
+            fingerprint: Fingerprint of the render.
+
+        Returns:
+            Path to the output image, or None if it was never rendered or has since been removed or
+                overwritten.
+        """
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT output, size, mtime FROM renders WHERE fingerprint = ?", (fingerprint,)).fetchone()
+        if not row:
+            return None
+        output, size, mtime = Path(row[0]), row[1], row[2]
+        with suppress(OSError):
+            stat = output.stat()
+            if (stat.st_size, stat.st_mtime_ns) == (size, mtime):
+                return output
+        return None
+
+    def record(self, fingerprint: str, output: Path, files: Iterable[Path] = ()) -> None:
+        """Record the output image produced by a render, once it has been written.
+
+        Args:
+            fingerprint: Fingerprint of the render.
+            output: Path to the output image.
+            files: Art files which were rendered.
+        """
+        size, mtime = None, None
+        with suppress(OSError):
+            stat = output.stat()
+            size, mtime = stat.st_size, stat.st_mtime_ns
+        with self._lock:
+            with self.connection as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO renders (fingerprint, output, files, updated, size, mtime) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (fingerprint, str(output), ', '.join(str(f) for f in files),
+                     dt.now().isoformat(timespec='seconds'), size, mtime))
@@ -0,0 +1,156 @@
+"""
+* Utils: Render Time History
+"""
+# Standard Library Imports
+from contextlib import suppress
+from functools import cached_property
+from pathlib import Path
+from threading import Lock
+from typing import Iterable, Optional
+
+# Third Party Imports
+from omnitils.files import load_data_file, dump_data_file
+
+# Local Imports
+from src import CONSOLE
+
+"""
+* Types
+"""
+
+# Weight given to each new duration when updating a running average
+RENDER_TIME_WEIGHT = 0.2
+
+"""
+* Render Time History
+"""
+
+
+class RenderTimes:
+    """Persistent record of how long cards take to render, used to estimate the cost of render jobs.
+
+    Notes:
+        - Durations are tracked per template class and card class, per template class, and per card class,
+            as running averages weighted towards recent renders.
+        - An estimate uses the most specific average recorded, falling back to the average of this run.
+
+    Args:
+        path: Path to the data file the history is stored in.
+    """
+
+    def __init__(self, path: Path):
+        self._path = path
+        self._lock = Lock()
+        self._run: list[float] = []
+
+    @cached_property
+    def data(self) -> dict[str, dict[str, float]]:
+        """dict[str, dict[str, float]]: Average durations, mapped to their key within each category."""
+        if self._path.is_file():
+            with suppress(Exception):
+                return {k: v for k, v in load_data_file(self._path).items() if isinstance(v, dict)}
+        return {}
+
+    @staticmethod
+    def get_keys(template_class: str, card_class: str) -> list[tuple[str, str]]:
+        """Returns the category and key of each average a render updates, most specific first.
+
+        Args:
+            template_class: Name of the template class.
+            card_class: Card class of the layout.
+        """
+        return [('job', f'{template_class}:{card_class}'), ('template', template_class), ('layout', card_class)]
+
+    """
+    * Estimates
+    """
+
+    def estimate(self, template_class: Optional[str] = None, card_class: Optional[str] = None) -> Optional[float]:
+        """Returns the expected number of seconds a render will take.
+
+        Args:
+            template_class: Name of the template class, if known.
+            card_class: Card class of the layout, if known.
+
+        Returns:
+            Estimated duration, or None if nothing has been recorded yet.
+        """
+        with self._lock:
+            if template_class and card_class:
+                for category, key in self.get_keys(template_class, card_class):
+                    if (t := self.data.get(category, {}).get(key)) is not None:
+                        return t
+            elif card_class and (t := self.data.get('layout', {}).get(card_class)) is not None:
+                return t
+            if self._run:
+                return sum(self._run) / len(self._run)
+            if averages := list(self.data.get('template', {}).values()):
+                return sum(averages) / len(averages)
+        return None
+
+    def get_eta(self, jobs: Iterable[tuple[Optional[str], Optional[str]]]) -> Optional[float]:
+        """Returns the expected number of seconds a series of renders will take.
+
+        Args:
+            jobs: Template class and card class of each render, either may be None if not yet known.
+
+        Returns:
+            Estimated duration, or None if nothing has been recorded yet.
+        """
+        total = 0.0
+        for template_class, card_class in jobs:
+            if (t := self.estimate(template_class, card_class)) is None:
+                return None
+            total += t
+        return total
+
+    """
+    * Updates
+    """
+
+    def record(self, template_class: str, card_class: str, seconds: float) -> None:
+        """Update the averages for a completed render.
+
+        Args:
+            template_class: Name of the template class.
+            card_class: Card class of the layout.
+            seconds: Number of seconds the render took.
+        """
+        with self._lock:
+            self._run.append(seconds)
+            for category, key in self.get_keys(template_class, card_class):
+                averages = self.data.setdefault(category, {})
+                current = averages.get(key)
+                averages[key] = round(seconds if current is None else (
+                    current + (seconds - current) * RENDER_TIME_WEIGHT), 2)
+
+    def save(self) -> None:
+        """Write the history to its data file."""
+        with self._lock:
+            try:
+                dump_data_file(self.data, self._path)
+            except Exception as e:
+                CONSOLE.log_exception(e)
+
+
+"""
+* Formatting
+"""
+
+
+def format_eta(seconds: Optional[float]) -> str:
+    """Returns an estimated duration as a short human-readable string.
+
+    Args:
+        seconds: Estimated duration in seconds, or None if unknown.
+
+    Returns:
+        Formatted duration, e.g. '1h 4m', '3m 20s', '45s', or '?' if unknown.
+    """
+    if seconds is None:
+        return '?'
+    minutes, secs = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f'{hours}h {minutes}m'
+    return f'{minutes}m {secs}s' if minutes else f'{secs}s'
@@ -4,6 +4,7 @@
 # Standard Library Imports
 from pathlib import Path
 from shutil import copyfileobj
+from threading import get_ident
 from typing import Optional, Union, Callable, Any, TypedDict, Literal, NotRequired
 
 # Third Party Imports
@@ -364,11 +365,12 @@ def get_uri_object(url: yarl.URL, **kwargs) -> dict:
 
 @scryfall_request_wrapper()
 @return_on_exception()
-def get_card_scan(img_url: str) -> Path:
+def get_card_scan(img_url: str, path: Path = PATH.LOGS_SCAN) -> Path:
     """Downloads scryfall art from URL
 
     Args:
         img_url: Scryfall URI for image.
+        path: Path to save the image to.
 
     Returns:
         Filename of the saved image, None if unsuccessful.
@@ -381,9 +383,12 @@ def get_card_scan(img_url: str) -> Path:
         raise RequestException(
             "Couldn't retrieve image from scryfall.",
             response=res)
-    with open(PATH.LOGS_SCAN, 'wb') as f:
+    # Write to a temporary file first, so a scan being downloaded is never read
+    temp = path.with_name(f'{path.name}.{get_ident()}.tmp')
+    with open(temp, 'wb') as f:
         copyfileobj(res.raw, f)
-    return PATH.LOGS_SCAN
+    temp.replace(path)
+    return path
 
 
 """
@@ -0,0 +1,267 @@
+"""
+* Utils: Hexproof 'Set' Data Store
+* Only local imports should be `enums` or `utils`.
+"""
+# Standard Library Imports
+import sqlite3
+from contextlib import closing, suppress
+from pathlib import Path
+from threading import Lock
+from typing import Any, Iterable, Iterator, Optional
+
+"""
+* Types
+"""
+
+# Columns stored for each 'Set' entry, in table order
+SET_COLUMNS: tuple[str, ...] = (
+    'code',
+    'code_symbol',
+    'code_parent',
+    'count_cards',
+    'count_tokens',
+    'count_printed')
+
+# Schema for the sorted, code-keyed 'Set' table
+SET_TABLE_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS sets ("
+    "code TEXT PRIMARY KEY NOT NULL, "
+    "code_symbol TEXT NOT NULL DEFAULT 'DEFAULT', "
+    "code_parent TEXT, "
+    "count_cards INTEGER NOT NULL DEFAULT 0, "
+    "count_tokens INTEGER NOT NULL DEFAULT 0, "
+    "count_printed INTEGER"
+    ") WITHOUT ROWID")
+
+# Bytes of the database file mapped into memory for reads
+SET_MMAP_SIZE = 1 << 24
+
+"""
+* Set Database
+"""
+
+
+class SetDatabase:
+    """Read-mostly SQLite store of processed 'Set' data from hexproof.io, queried by set code.
+
+    Notes:
+        - Rows are stored in a `WITHOUT ROWID` table clustered on the set code, so a lookup is a single
+            B-tree seek against a memory-mapped file rather than a parse of the full data file.
+        - Supports the read-only subset of the `dict` interface used by layouts (`get`, `in`, `[]`).
+
+    Args:
+        path: Path to the SQLite database file.
+    """
+
+    def __init__(self, path: Path):
+        self._path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = Lock()
+        self._rows: dict[str, Optional[dict]] = {}
+
+    """
+    * Connection
+    """
+
+    @property
+    def path(self) -> Path:
+        """Path: Path to the SQLite database file."""
+        return self._path
+
+    @property
+    def connection(self) -> Optional[sqlite3.Connection]:
+        """Optional[sqlite3.Connection]: Shared read-only connection, None if the database doesn't exist."""
+        if self._conn is None and self._path.is_file():
+            conn = sqlite3.connect(
+                f'{self._path.as_uri()}?mode=ro',
+                uri=True,
+                check_same_thread=False)
+            with suppress(sqlite3.Error):
+                conn.execute(f'PRAGMA mmap_size={SET_MMAP_SIZE}')
+            self._conn = conn
+        return self._conn
+
+    def close(self) -> None:
+        """Close the shared connection and clear any cached rows."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+            self._conn = None
+            self._rows.clear()
+
+    """
+    * Queries
+    """
+
+    def get(self, code: str, default: Any = None) -> Any:
+        """Returns the 'Set' entry for a given set code.
+
+        Args:
+            code: Set code to look for, case-insensitive.
+            default: Value to return if the set code isn't found.
+
+        Returns:
+            Dictionary of 'Set' data with empty values omitted, otherwise the default value.
+        """
+        code = code.lower()
+        with self._lock:
+            if code not in self._rows:
+                self._rows[code] = self._query(code)
+            row = self._rows[code]
+        return row.copy() if row is not None else default
+
+    def _query(self, code: str) -> Optional[dict]:
+        """Look up a single 'Set' row. Must be called while holding the lock.
+
+        Args:
+            code: Lowercase set code.
+
+        Returns:
+            Dictionary of 'Set' data with empty values omitted, or None if not found.
+        """
+        conn = self.connection
+        if conn is None:
+            return
+        try:
+            row = conn.execute(
+                f"SELECT {', '.join(SET_COLUMNS[1:])} FROM sets WHERE code = ?", (code,)
+            ).fetchone()
+        except sqlite3.Error:
+            return
+        if row is None:
+            return
+        return {k: v for k, v in zip(SET_COLUMNS[1:], row) if v is not None}
+
+    def rows(self) -> dict[str, dict]:
+        """dict[str, dict]: Every 'Set' entry in the database with empty values omitted, mapped to set code."""
+        with self._lock:
+            if (conn := self.connection) is None:
+                return {}
+            with suppress(sqlite3.Error):
+                return {
+                    r[0]: {k: v for k, v in zip(SET_COLUMNS[1:], r[1:]) if v is not None}
+                    for r in conn.execute(f"SELECT {', '.join(SET_COLUMNS)} FROM sets")}
+        return {}
+
+    def codes(self) -> list[str]:
+        """list[str]: All set codes present in the database, sorted."""
+        with self._lock:
+            if (conn := self.connection) is None:
+                return []
+            with suppress(sqlite3.Error):
+                return [r[0] for r in conn.execute("SELECT code FROM sets ORDER BY code")]
+        return []
+
+    def __contains__(self, code: str) -> bool:
+        return self.get(code) is not None
+
+    def __getitem__(self, code: str) -> dict:
+        if (row := self.get(code)) is None:
+            raise KeyError(code)
+        return row
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.codes())
+
+    def __len__(self) -> int:
+        return len(self.codes())
+
+    def __bool__(self) -> bool:
+        return self._path.is_file()
+
+    """
+    * Building
+    """
+
+    def build(self, data: dict[str, dict], replace: bool = True) -> None:
+        """Write processed 'Set' data to the database in a single transaction.
+
+        Args:
+            data: Processed 'Set' data mapped to set codes.
+            replace: Remove any existing rows before writing if True, otherwise upsert the given rows.
+        """
+        write_set_database(self._path, data.items(), replace=replace)
+        with self._lock:
+            self._rows.clear()
+
+    def merge(self, data: dict[str, dict]) -> int:
+        """Diff processed 'Set' data against the database, writing only entries which were added, changed,
+            or removed.
+
+        Args:
+            data: Complete set of processed 'Set' data mapped to set codes.
+
+        Returns:
+            Number of entries which were written or removed.
+        """
+        current = self.rows()
+        data = {code.lower(): {k: v for k, v in d.items() if v is not None} for code, d in data.items()}
+        changed = {code: d for code, d in data.items() if current.get(code) != normalize_set_row(d)}
+        removed = [code for code in current if code not in data]
+        if not changed and not removed:
+            return 0
+        write_set_database(self._path, changed.items(), replace=False, removed=removed)
+        with self._lock:
+            self._rows.clear()
+        return len(changed) + len(removed)
+
+
+"""
+* Database Utils
+"""
+
+
+def normalize_set_row(data: dict) -> dict:
+    """Returns 'Set' data as it would be read back from the database, with defaults applied.
+
+    Args:
+        data: Processed 'Set' data.
+
+    Returns:
+        Dictionary of 'Set' data with empty values omitted.
+    """
+    row = {
+        'code_symbol': data.get('code_symbol', 'DEFAULT'),
+        'code_parent': data.get('code_parent'),
+        'count_cards': data.get('count_cards', 0),
+        'count_tokens': data.get('count_tokens', 0),
+        'count_printed': data.get('count_printed')}
+    return {k: v for k, v in row.items() if v is not None}
+
+
+def write_set_database(
+    path: Path,
+    rows: Iterable[tuple[str, dict]],
+    replace: bool = True,
+    removed: Iterable[str] = ()
+) -> None:
+    """Write 'Set' rows to a SQLite database, creating it if needed.
+
+    Args:
+        path: Path to the SQLite database file.
+        rows: Iterable of set code and 'Set' data pairs.
+        replace: Remove any existing rows before writing if True, otherwise upsert the given rows.
+        removed: Set codes to remove from the database when upserting.
+    """
+    path.parent.mkdir(mode=777, parents=True, exist_ok=True)
+    with closing(sqlite3.connect(path, timeout=10)) as conn:
+        with conn:
+            conn.execute(SET_TABLE_SCHEMA)
+            if replace:
+                conn.execute("DELETE FROM sets")
+            else:
+                conn.executemany("DELETE FROM sets WHERE code = ?", [(c.lower(),) for c in removed])
+            conn.executemany(
+                f"INSERT OR REPLACE INTO sets ({', '.join(SET_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(SET_COLUMNS))})",
+                [(
+                    code.lower(),
+                    d.get('code_symbol', 'DEFAULT'),
+                    d.get('code_parent'),
+                    d.get('count_cards', 0),
+                    d.get('count_tokens', 0),
+                    d.get('count_printed')
+                ) for code, d in rows])
+        if replace:
+            with suppress(sqlite3.Error):
+                conn.execute("VACUUM")
@@ -0,0 +1,219 @@
+"""
+* Utils: Symbol and Watermark Layer Cache
+"""
+# Standard Library Imports
+from contextlib import suppress
+from enum import Enum
+from pathlib import Path
+from typing import Any, Callable, Hashable, Union
+
+# Third Party Imports
+from photoshop.api import DocumentFill, ElementPlacement, NewDocumentMode, SolidColor
+from photoshop.api._artlayer import ArtLayer
+from photoshop.api._document import Document
+from photoshop.api._layerSet import LayerSet
+from pydantic import BaseModel
+
+# Local Imports
+from src import APP, CONSOLE
+from src.helpers.document import close_document
+from src.utils.adobe import PS_EXCEPTIONS
+
+"""
+* Types & Definitions
+"""
+
+# Name given to the document holding prepared layers for a template document
+SYMBOL_CACHE_DOCUMENT = 'Proxyshop Symbols - {}'
+
+# Layer bounds tolerance in pixels, beyond which a duplicated layer is moved back into place
+SYMBOL_CACHE_TOLERANCE = 0.5
+
+"""
+* Symbol Layer Cache
+"""
+
+
+class SymbolLayerCache:
+    """Keeps prepared expansion symbol and watermark layers for each template document, so a card sharing
+    a symbol or watermark with an earlier card duplicates the prepared layer instead of importing, framing,
+    and styling the SVG again.
+
+    Notes:
+        - Template documents are reset to their opening state after every render, so prepared layers are
+            kept in a companion document the same size as the template document, which is never reset.
+        - Layers are cached by a key describing everything which went into preparing them, e.g. the SVG
+            file, its reference bounds, colors, and effects.
+        - A companion document is closed with its template document, and any Photoshop error while using
+            it drops the companion document, falling back to preparing the layer again.
+    """
+
+    def __init__(self):
+        self._docs: dict[str, Document] = {}
+        self._layers: dict[str, dict[Hashable, tuple[ArtLayer, tuple[float, ...]]]] = {}
+
+    def get_layer(
+        self,
+        key: Hashable,
+        create: Callable[[], Union[ArtLayer, LayerSet]],
+        ref: Union[ArtLayer, LayerSet],
+        placement: ElementPlacement,
+        docref: Document
+    ) -> Union[ArtLayer, LayerSet]:
+        """Returns a prepared layer, duplicated from the cache if a layer with this key was prepared before.
+
+        Args:
+            key: Hashable key describing the prepared layer.
+            create: Callable which imports and prepares the layer in the template document.
+            ref: Layer the prepared layer is placed relative to.
+            placement: Placement of the prepared layer relative to `ref`.
+            docref: Template document the layer is placed in.
+
+        Returns:
+            The prepared layer in the template document.
+        """
+        name = docref.name
+        if (cached := self._layers.get(name, {}).get(key)) is not None:
+            try:
+                return self._duplicate(*cached, ref=ref, placement=placement, docref=docref)
+            except PS_EXCEPTIONS as e:
+                CONSOLE.log_exception(e)
+                self.close(name)
+
+        # Prepare the layer, then keep a copy of it
+        layer = create()
+        try:
+            self._store(key, layer, docref)
+        except PS_EXCEPTIONS as e:
+            CONSOLE.log_exception(e)
+            self.close(name)
+        return layer
+
+    def close(self, name: str) -> None:
+        """Close the companion document of a template document, dropping its prepared layers.
+
+        Args:
+            name: Name of the template document.
+        """
+        self._layers.pop(name, None)
+        if doc := self._docs.pop(name, None):
+            with suppress(*PS_EXCEPTIONS):
+                close_document(docref=doc, purge=False)
+
+    def close_all(self) -> None:
+        """Close every companion document."""
+        for name in list(self._docs):
+            self.close(name)
+
+    """
+    * Cache Utils
+    """
+
+    def _get_document(self, docref: Document) -> Document:
+        """Returns the companion document of a template document, creating it if needed.
+
+        Args:
+            docref: Template document.
+        """
+        if doc := self._docs.get(docref.name):
+            return doc
+        doc = APP.documents.add(
+            width=docref.width,
+            height=docref.height,
+            resolution=docref.resolution,
+            name=SYMBOL_CACHE_DOCUMENT.format(Path(docref.name).stem),
+            mode=NewDocumentMode.NewRGB,
+            initialFill=DocumentFill.Transparent)
+        APP.activeDocument = docref
+        self._docs[docref.name] = doc
+        return doc
+
+    def _store(self, key: Hashable, layer: Union[ArtLayer, LayerSet], docref: Document) -> None:
+        """Keep a copy of a prepared layer in the companion document.
+
+        Args:
+            key: Hashable key describing the prepared layer.
+            layer: Prepared layer in the template document.
+            docref: Template document.
+        """
+        doc = self._get_document(docref)
+        copy = layer.duplicate(doc, ElementPlacement.PlaceAtBeginning)
+        self._layers.setdefault(docref.name, {})[key] = (copy, tuple(layer.bounds))
+
+    def _duplicate(
+        self,
+        layer: Union[ArtLayer, LayerSet],
+        bounds: tuple[float, ...],
+        ref: Union[ArtLayer, LayerSet],
+        placement: ElementPlacement,
+        docref: Document
+    ) -> Union[ArtLayer, LayerSet]:
+        """Duplicate a prepared layer from the companion document into its template document.
+
+        Args:
+            layer: Prepared layer in the companion document.
+            bounds: Bounds of the layer when it was prepared.
+            ref: Layer the duplicate is placed relative to.
+            placement: Placement of the duplicate relative to `ref`.
+            docref: Template document.
+
+        Returns:
+            The duplicated layer in the template document.
+        """
+        APP.activeDocument = self._docs[docref.name]
+        try:
+            dup = layer.duplicate(ref, placement)
+        finally:
+            APP.activeDocument = docref
+        docref.activeLayer = dup
+
+        # Move the duplicate back into place if needed
+        left, top, *_ = dup.bounds
+        dx, dy = bounds[0] - left, bounds[1] - top
+        if abs(dx) > SYMBOL_CACHE_TOLERANCE or abs(dy) > SYMBOL_CACHE_TOLERANCE:
+            dup.translate(dx, dy)
+        return dup
+
+
+"""
+* Key Utils
+"""
+
+
+def get_symbol_key(*values: Any) -> Hashable:
+    """Returns a hashable key describing a prepared layer from the values used to prepare it.
+
+    Notes:
+        - Colors are described by their hex value, since a `SolidColor` is only a Photoshop object.
+        - Layer effects and other schemas are described by their field values.
+
+    Args:
+        values: Values used to prepare the layer, e.g. its SVG path, reference bounds, and effects.
+
+    Returns:
+        Tuple describing every value.
+    """
+    return tuple(get_value_key(v) for v in values)
+
+
+def get_value_key(value: Any) -> Hashable:
+    """Returns a hashable key describing a single value, see `get_symbol_key`.
+
+    Args:
+        value: Value used to prepare a layer.
+    """
+    if isinstance(value, SolidColor):
+        return value.rgb.hexValue
+    if isinstance(value, BaseModel):
+        return type(value).__name__, *((k, get_value_key(v)) for k, v in value)
+    if isinstance(value, dict):
+        return tuple((k, get_value_key(v)) for k, v in sorted(value.items(), key=lambda x: str(x[0])))
+    if isinstance(value, (list, tuple)):
+        return tuple(get_value_key(v) for v in value)
+    if isinstance(value, (Path, Enum)):
+        return str(value)
+    return value
+
+
+# Global symbol and watermark layer cache
+SYMBOL_CACHE = SymbolLayerCache()
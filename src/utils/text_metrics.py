@@ -0,0 +1,290 @@
+"""
+* Utils: Offline Text Measurement
+"""
+# Standard Library Imports
+from contextlib import suppress
+from functools import cache, cached_property
+from pathlib import Path
+from typing import Optional, TypedDict, Union
+
+# Third Party Imports
+from fontTools.ttLib import TTFont, TTLibError
+
+# Local Imports
+from src.utils.fonts import get_font_paths
+
+"""
+* Types
+"""
+
+
+class TextLayout(TypedDict):
+    """Estimated layout of paragraph text at a given font size."""
+    size: float
+    lines: int
+    breaks: list[int]
+    height: float
+
+"""
+* Font Metrics
+"""
+
+
+class FontMetrics:
+    """Glyph advances, pair kerning, and vertical metrics of a font file.
+
+    Notes:
+        - Kerning is read from the legacy 'kern' table and from pair adjustment lookups in 'GPOS',
+            including those wrapped in extension lookups.
+        - Other OpenType features such as ligatures aren't applied, so measured widths are estimates.
+
+    Args:
+        path: Path to a TTF or OTF font file.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        with TTFont(path, lazy=True) as font:
+            self.name: str = font['name'].getDebugName(6)
+            self.units_per_em: int = font['head'].unitsPerEm
+            self.ascent: int = font['hhea'].ascent
+            self.descent: int = abs(font['hhea'].descent)
+            self.cmap: dict[int, str] = font.getBestCmap() or {}
+            self.advances: dict[str, int] = {k: v[0] for k, v in font['hmtx'].metrics.items()}
+            self.missing: int = self.advances.get('.notdef', self.units_per_em // 2)
+
+            # Kerning pairs and class based kerning subtables
+            self.pairs: dict[tuple[str, str], int] = {}
+            self.classes: list[tuple[set[str], dict[str, int], dict[str, int], list[list[int]]]] = []
+            if 'kern' in font:
+                for table in font['kern'].kernTables:
+                    for pair, value in getattr(table, 'kernTable', {}).items():
+                        self.pairs.setdefault(pair, value)
+            if 'GPOS' in font and font['GPOS'].table.LookupList:
+                for lookup in font['GPOS'].table.LookupList.Lookup:
+                    for table in lookup.SubTable:
+                        kind = lookup.LookupType
+                        if kind == 9:
+                            kind, table = table.ExtensionLookupType, table.ExtSubTable
+                        if kind == 2:
+                            self.add_pair_table(table)
+
+    def add_pair_table(self, table) -> None:
+        """Read kerning from a GPOS pair adjustment subtable.
+
+        Args:
+            table: PairPos subtable in format 1 (glyph pairs) or format 2 (class pairs).
+        """
+        if table.Format == 1:
+            for first, pair_set in zip(table.Coverage.glyphs, table.PairSet):
+                for record in pair_set.PairValueRecord:
+                    if value := getattr(record.Value1, 'XAdvance', 0):
+                        self.pairs.setdefault((first, record.SecondGlyph), value)
+        elif table.Format == 2:
+            self.classes.append((
+                set(table.Coverage.glyphs),
+                table.ClassDef1.classDefs if table.ClassDef1 else {},
+                table.ClassDef2.classDefs if table.ClassDef2 else {},
+                [[getattr(r.Value1, 'XAdvance', 0) or 0 for r in c.Class2Record] for c in table.Class1Record]))
+
+    def get_glyph(self, char: str) -> Optional[str]:
+        """Returns the name of the glyph a character maps to, if the font has one."""
+        return self.cmap.get(ord(char))
+
+    def get_kerning(self, first: Optional[str], second: Optional[str]) -> int:
+        """Returns the kerning between two glyphs in font units.
+
+        Args:
+            first: Name of the left glyph.
+            second: Name of the right glyph.
+        """
+        if first is None or second is None:
+            return 0
+        if (pair := (first, second)) in self.pairs:
+            return self.pairs[pair]
+        for coverage, class_first, class_second, matrix in self.classes:
+            if first in coverage:
+                if value := matrix[class_first.get(first, 0)][class_second.get(second, 0)]:
+                    return value
+        return 0
+
+    def get_width(self, text: str, size: float) -> float:
+        """Returns the advance width of a string set in this font.
+
+        Args:
+            text: String to measure.
+            size: Font size, the width is returned in the same unit.
+        """
+        units, last = 0, None
+        for char in text:
+            glyph = self.get_glyph(char)
+            units += self.advances.get(glyph, self.missing) + self.get_kerning(last, glyph)
+            last = glyph
+        return units * size / self.units_per_em
+
+
+"""
+* Text Layout Estimation
+"""
+
+
+class TextLayoutEstimator:
+    """Predicts line breaks and rendered height of paragraph text from font metrics, without Photoshop.
+
+    Notes:
+        - Lines are broken greedily at spaces, matching Photoshop's single-line composer with hyphenation
+            disabled. The every-line composer can occasionally break a line differently.
+        - Leading equals the font size, matching how text is sized when it's scaled to fit.
+        - Rendered height runs from the ascent of the first line to the descent of the last, so it's
+            comparable to the height of the layer bounds.
+
+    Args:
+        text: Text contents, with paragraphs separated by carriage returns.
+        fonts: PostScript name of the font each character is set in, or a single font for every character.
+        space_before: Space in points added before each paragraph, mapped to the paragraph index.
+        indents: Start indent in points of each paragraph's lines after the first, mapped to paragraph index.
+    """
+
+    def __init__(
+        self,
+        text: str,
+        fonts: Union[str, list[str]],
+        space_before: Optional[dict[int, float]] = None,
+        indents: Optional[dict[int, float]] = None
+    ):
+        self.text = text
+        self.fonts = [fonts] * len(text) if isinstance(fonts, str) else fonts
+        self.space_before = space_before or {}
+        self.indents = indents or {}
+
+    @cached_property
+    def metrics(self) -> dict[str, FontMetrics]:
+        """dict[str, FontMetrics]: Metrics of each font used, fonts which can't be found are excluded."""
+        return {f: m for f in set(self.fonts) if (m := get_font_metrics(f))}
+
+    @cached_property
+    def is_measurable(self) -> bool:
+        """bool: Whether every font used by the text could be found."""
+        return len(self.metrics) == len(set(self.fonts))
+
+    @cached_property
+    def words(self) -> list[list[tuple[int, float, float]]]:
+        """list[list[tuple[int, float, float]]]: Each paragraph's words as the index of their first
+        character, their width at 1 point, and the width of their trailing space at 1 point."""
+        paragraphs, start = [], 0
+        for paragraph in self.text.replace('\n', '\r').split('\r'):
+            words, i = [], start
+            for word in paragraph.split(' '):
+                end = i + len(word)
+                space = self.get_width(end, end + 1) if end < start + len(paragraph) else 0
+                words.append((i, self.get_width(i, end), space))
+                i = end + 1
+            paragraphs.append(words)
+            start += len(paragraph) + 1
+        return paragraphs
+
+    def get_width(self, start: int, end: int) -> float:
+        """Returns the width at 1 point of a range of the text, kerning characters set in the same font.
+
+        Args:
+            start: Index of the first character.
+            end: Index after the last character.
+        """
+        width, i = 0.0, start
+        while i < end:
+            font = self.fonts[i]
+            j = i + 1
+            while j < end and self.fonts[j] == font:
+                j += 1
+            if metrics := self.metrics.get(font):
+                width += metrics.get_width(self.text[i:j], 1)
+            i = j
+        return width
+
+    def get_layout(self, size: float, width: float, dpi: float = 72) -> TextLayout:
+        """Lay out the text at a font size within a paragraph box width.
+
+        Args:
+            size: Font size in points.
+            width: Width of the paragraph box in pixels.
+            dpi: Resolution of the document.
+
+        Returns:
+            Estimated line count, index of the first character on each wrapped line, and height in pixels.
+        """
+        scale = dpi / 72
+        breaks, height, lines = [], 0.0, 0
+        for n, words in enumerate(self.words):
+            if n:
+                height += self.space_before.get(n, 0) * scale
+            lines, used, limit = lines + 1, 0.0, width
+            for start, advance, space in words:
+                if used and used + advance * size * scale > limit:
+                    # Wrap to a new line, lines after the first are indented
+                    breaks.append(start)
+                    lines, used = lines + 1, 0.0
+                    limit = width - self.indents.get(n, 0) * scale
+                used += (advance + space) * size * scale
+
+        # Ascent of the first line, leading of each line after, descent of the last
+        metrics = list(self.metrics.values()) or [None]
+        ascent = max(m.ascent / m.units_per_em if m else 0.7 for m in metrics)
+        descent = max(m.descent / m.units_per_em if m else 0.3 for m in metrics)
+        height += ((lines - 1) + ascent + descent) * size * scale
+        return {'size': size, 'lines': lines, 'breaks': breaks, 'height': height}
+
+    def get_height(self, size: float, width: float, dpi: float = 72) -> float:
+        """Returns the estimated rendered height in pixels of the text at a font size.
+
+        Args:
+            size: Font size in points.
+            width: Width of the paragraph box in pixels.
+            dpi: Resolution of the document.
+        """
+        return self.get_layout(size, width, dpi)['height']
+
+    def get_fit_size(
+        self, size: float,
+        width: float,
+        height: float,
+        dpi: float = 72,
+        tolerance: float = 0.05
+    ) -> float:
+        """Returns the largest font size, no larger than a starting size, at which the text is estimated
+        to fit within a box. Useful to flag overflowing text before rendering.
+
+        Args:
+            size: Starting font size in points.
+            width: Width of the box in pixels.
+            height: Height of the box in pixels.
+            dpi: Resolution of the document.
+            tolerance: Precision of the returned font size.
+        """
+        if self.get_height(size, width, dpi) <= height:
+            return size
+        low, high = 0.0, size
+        while high - low > tolerance:
+            mid = (low + high) / 2
+            if self.get_height(mid, width, dpi) <= height:
+                low = mid
+            else:
+                high = mid
+        return round(low, 2)
+
+
+"""
+* Font Lookup Utils
+"""
+
+
+@cache
+def get_font_metrics(name: str) -> Optional[FontMetrics]:
+    """Returns the metrics of a font by PostScript name, or None if its font file can't be found or read.
+
+    Args:
+        name: PostScript name of the font.
+    """
+    if path := get_font_paths().get(name):
+        with suppress(TTLibError, KeyError, AttributeError, OSError):
+            return FontMetrics(path)
+    return None
+
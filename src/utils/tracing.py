@@ -0,0 +1,237 @@
+"""
+* Utils: Render Stage Tracing
+"""
+# Standard Library Imports
+import json
+from contextlib import contextmanager
+from datetime import datetime as dt
+from pathlib import Path
+from threading import Lock, local
+from time import perf_counter
+from typing import Iterator, Optional, TypedDict
+
+# Third Party Imports
+from omnitils.files import dump_data_file
+
+# Local Imports
+from src import CONSOLE, ENV, PATH
+from src.utils.prefetch import get_template_key
+
+"""
+* Types
+"""
+
+
+class TraceSpan(TypedDict):
+    """A timed span within a render trace."""
+    name: str
+    stage: Optional[str]
+    start: float
+    duration: float
+    depth: int
+
+
+class TraceStats(TypedDict):
+    """Aggregated timing of a stage or step across every traced render."""
+    count: int
+    total: float
+    mean: float
+    max: float
+
+
+"""
+* Render Trace
+"""
+
+
+class RenderTrace:
+    """Timed spans recorded while rendering a single card.
+
+    Args:
+        card: Display name of the card.
+        template: Template class rendering the card.
+    """
+
+    def __init__(self, card: str, template: type):
+        self.card = card
+        self.template = get_template_key(template)
+        self.started = dt.now()
+        self.origin = perf_counter()
+        self.spans: list[TraceSpan] = []
+        self.success: bool = False
+
+    def to_dict(self) -> dict:
+        """Returns the trace as a JSON serializable dictionary."""
+        return {
+            'card': self.card,
+            'template': self.template,
+            'started': self.started.isoformat(timespec='seconds'),
+            'duration': round(perf_counter() - self.origin, 4),
+            'success': self.success,
+            'spans': self.spans}
+
+
+"""
+* Render Tracer
+"""
+
+
+class RenderTracer:
+    """Records the time spent in each stage of a render and each step within a stage.
+
+    Notes:
+        - Each traced render is appended to a JSON lines file, and an aggregated report of every render
+            traced this session is written after each render.
+        - The stage and step currently running on a thread are tracked even when tracing is disabled,
+            so other profilers can attribute work to them.
+
+    Args:
+        path: Path to the JSON lines file traces are appended to.
+        path_report: Path to the aggregated report file.
+    """
+
+    def __init__(self, path: Path, path_report: Path):
+        self._path = path
+        self._path_report = path_report
+        self._local = local()
+        self._lock = Lock()
+        self._report: dict[str, dict] = {}
+
+    @property
+    def enabled(self) -> bool:
+        """bool: Whether renders are traced."""
+        return ENV.TRACE_RENDER
+
+    @property
+    def trace(self) -> Optional[RenderTrace]:
+        """Optional[RenderTrace]: Trace being recorded on this thread, if any."""
+        return getattr(self._local, 'trace', None)
+
+    @property
+    def stack(self) -> list[tuple[str, Optional[str]]]:
+        """list[tuple[str, Optional[str]]]: Name and stage of each span currently open on this thread."""
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    @property
+    def context(self) -> tuple[Optional[str], Optional[str]]:
+        """tuple[Optional[str], Optional[str]]: Stage and step currently running on this thread."""
+        if not self.stack:
+            return None, None
+        name, stage = self.stack[-1]
+        return stage or name, name if stage else None
+
+    """
+    * Recording
+    """
+
+    @contextmanager
+    def trace_render(self, card: str, template: type) -> Iterator[Optional[RenderTrace]]:
+        """Trace a render on this thread while inside this context, if tracing is enabled.
+
+        Args:
+            card: Display name of the card.
+            template: Template class rendering the card.
+
+        Yields:
+            The trace being recorded, or None if tracing is disabled. Set its `success` attribute once
+                the render succeeds.
+        """
+        if not self.enabled:
+            yield None
+            return
+        self._local.trace = trace = RenderTrace(card, template)
+        try:
+            yield trace
+        finally:
+            self._local.trace = None
+            self.record(trace)
+
+    @contextmanager
+    def span(self, name: str, stage: Optional[str] = None) -> Iterator[None]:
+        """Time a span of work while inside this context.
+
+        Args:
+            name: Name of the stage or step.
+            stage: Name of the stage this step belongs to, None if this span is a stage.
+        """
+        stack, trace = self.stack, self.trace
+        stack.append((name, stage))
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            stack.pop()
+            if trace is not None:
+                trace.spans.append({
+                    'name': name,
+                    'stage': stage,
+                    'start': round(start - trace.origin, 4),
+                    'duration': round(perf_counter() - start, 4),
+                    'depth': len(stack)})
+
+    def record(self, trace: RenderTrace) -> None:
+        """Append a finished trace to the trace file and update the aggregated report.
+
+        Args:
+            trace: Finished render trace.
+        """
+        data = trace.to_dict()
+        with self._lock:
+            report = self._report.setdefault(trace.template, {
+                'cards': 0, 'failed': 0, 'total': 0.0, 'stages': {}, 'steps': {}})
+            report['cards'] += 1
+            report['failed'] += 0 if trace.success else 1
+            report['total'] = round(report['total'] + data['duration'], 4)
+            for span in trace.spans:
+                group, key = ('steps', f"{span['stage']}.{span['name']}") if span['stage'] else (
+                    'stages', span['name'])
+                add_trace_stats(report[group], key, span['duration'])
+            try:
+                with open(self._path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(data) + '\n')
+                dump_data_file(get_sorted_report(self._report), self._path_report)
+            except Exception as e:
+                CONSOLE.log_exception(e)
+
+
+"""
+* Report Utils
+"""
+
+
+def add_trace_stats(stats: dict[str, TraceStats], key: str, duration: float) -> None:
+    """Add a span duration to its aggregated statistics.
+
+    Args:
+        stats: Aggregated statistics, mapped to their key.
+        key: Key of the stage or step.
+        duration: Duration of the span in seconds.
+    """
+    s = stats.setdefault(key, {'count': 0, 'total': 0.0, 'mean': 0.0, 'max': 0.0})
+    s['count'] += 1
+    s['total'] = round(s['total'] + duration, 4)
+    s['mean'] = round(s['total'] / s['count'], 4)
+    s['max'] = max(s['max'], duration)
+
+
+def get_sorted_report(report: dict[str, dict]) -> dict[str, dict]:
+    """Returns an aggregated report with each template's stages and steps sorted by total time.
+
+    Args:
+        report: Aggregated report, mapped to template key.
+
+    Returns:
+        Sorted copy of the report.
+    """
+    return {
+        template: {
+            **data,
+            'stages': dict(sorted(data['stages'].items(), key=lambda x: x[1]['total'], reverse=True)),
+            'steps': dict(sorted(data['steps'].items(), key=lambda x: x[1]['total'], reverse=True))
+        } for template, data in report.items()}
+
+
+# Global render tracer
+TRACER = RenderTracer(PATH.LOGS_TRACE, PATH.LOGS_TRACE_REPORT)
@@ -0,0 +1,74 @@
+"""
+* Tests: Fake Photoshop Backend
+* Renders the showcase tool template without Photoshop, e.g. on Linux CI.
+"""
+# Standard Library Imports
+import os
+import sys
+from pathlib import Path
+
+# Third Party Imports
+import pytest
+from PIL import Image
+
+# The fake backend must be enabled before the app is loaded
+os.environ['PROXYSHOP_PS_FAKE_BACKEND'] = '1'
+os.environ.setdefault('PROXYSHOP_HEADLESS', '1')
+pytest.importorskip('psd_tools')
+
+# Local Imports
+from src import APP, PATH  # noqa: E402
+from src.helpers.document import close_document, import_art, reset_document, save_document_jpeg  # noqa: E402
+from src.utils.fake_photoshop import FAKE_CALL_LOG  # noqa: E402
+
+"""
+* Fixtures
+"""
+
+
+@pytest.fixture
+def card_image(tmp_path: Path) -> Path:
+    """Path: A rendered card image to frame with the showcase tool."""
+    path = tmp_path / 'card.jpg'
+    Image.new('RGB', (1500, 2100), (200, 50, 50)).save(path)
+    return path
+
+
+"""
+* Tests
+"""
+
+
+@pytest.mark.skipif(sys.platform == 'win32', reason='Windows modules are only faked where missing.')
+def test_windows_shims():
+    """Windows modules the Photoshop API imports are faked."""
+    for name in ('winreg', 'comtypes', 'comtypes.client', 'win32api'):
+        assert name in sys.modules
+
+
+def test_render_showcase(card_image: Path, tmp_path: Path):
+    """Render a card with the showcase tool template, the same calls the showcase tool makes."""
+    FAKE_CALL_LOG.reset()
+    output = tmp_path / 'showcase.jpg'
+
+    # Render the card
+    APP.load(str(PATH.TEMPLATES / 'tools' / 'showcase.psd'))
+    docref = APP.activeDocument
+    import_art(layer=docref.activeLayer, path=card_image, docref=docref)
+    save_document_jpeg(path=output, docref=docref)
+    reset_document(docref=docref)
+    close_document(docref=docref)
+
+    # Output matches the template's size and every call was logged
+    with Image.open(output) as img:
+        assert img.size == (3264, 4440)
+    assert APP.documents.length == 0
+    calls = FAKE_CALL_LOG.get_report(top=100)['members']
+    for member in (
+        'Application.load',
+        'Application.executeAction(placeEvent)',
+        'Application.executeAction(select)',
+        'Document.saveAs',
+        'Document.close'
+    ):
+        assert calls.get(member) == 1